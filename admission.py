@@ -0,0 +1,143 @@
+import math
+import threading
+from collections import OrderedDict
+
+from rate_limit import TokenBucket
+
+ALL_CHANNELS_COST_COUNT = 5
+
+
+def request_cost(intent):
+    """요청 종류별 예상 비용 (스레드 < 단기 요약 < 장기 분석, 장기 분석은 기간에 비례)"""
+    if intent.kind == 'long_term':
+        return 2 + intent.days / 10
+    if intent.kind == 'short_term':
+        return 1 + intent.hours / 24
+    if intent.kind == 'multi_channel':
+        # 모든 채널 요청은 채널 수를 미리 모르므로 ALL_CHANNELS_COST_COUNT개로 계산
+        return (1 + intent.hours / 24) * (len(intent.channels) if intent.channels else ALL_CHANNELS_COST_COUNT)
+    if intent.kind in ('thread', 'text'):
+        return 1
+    return 0  # 도움말 / 인사는 제한하지 않음
+
+
+def request_key(intent, channel_id, thread_ts=None):
+    """같은 요청인지 판단하는 키 (kind, 채널, 기간). 텍스트 요약 등은 None"""
+    if intent.kind == 'long_term':
+        return ('long_term', channel_id, intent.days)
+    if intent.kind == 'short_term':
+        return ('short_term', channel_id, intent.hours)
+    if intent.kind == 'thread':
+        return ('thread', channel_id, thread_ts)
+    if intent.kind == 'multi_channel':
+        return ('multi_channel', channel_id, tuple(sorted(intent.channels)) if intent.channels else 'all', intent.hours)
+    return None
+
+
+class AdmissionController:
+    """요약 요청 입장 제어 (사용자별 / 채널별 / 전체 토큰 버킷, 요청 비용만큼 차감)
+
+    - 같은 요청(kind, 채널, 기간)이 이미 대기/실행 중이면 토큰을 쓰지 않고 'running'으로 거절
+    - 세 버킷 모두에서 비용을 차감할 수 있을 때만 통과 (하나라도 모자라면 차감한 것은 되돌림)
+    - rate는 분당 비용, burst는 한 번에 쓸 수 있는 최대 비용
+    """
+
+    def __init__(self, user_rate=10, user_burst=12, channel_rate=20, channel_burst=24,
+                 global_rate=60, global_burst=60, max_keys=5000):
+        self.limits = {
+            'user': (user_rate / 60, user_burst),
+            'channel': (channel_rate / 60, channel_burst),
+            'global': (global_rate / 60, global_burst),
+        }
+        self.max_keys = max_keys
+        self.global_bucket = TokenBucket(*self.limits['global'])
+        self._buckets = {'user': OrderedDict(), 'channel': OrderedDict()}
+        self._running = set()
+        self._lock = threading.Lock()
+
+        self.admitted = 0
+        self.admitted_cost = 0.0
+        self.rejected = {'running': 0, 'user': 0, 'channel': 0, 'global': 0}
+
+    def _bucket(self, scope, key):
+        """키별 버킷 (오래 안 쓴 키부터 정리)"""
+        buckets = self._buckets[scope]
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = TokenBucket(*self.limits[scope])
+            if len(buckets) > self.max_keys:
+                buckets.popitem(last=False)
+        else:
+            buckets.move_to_end(key)
+        return bucket
+
+    def admit(self, user_id, channel_id, cost, key=None):
+        """통과하면 None, 아니면 (거절 사유, 다시 시도할 수 있을 때까지 초) 반환
+
+        통과한 요청은 작업이 끝나면 release(key)를 호출해야 한다.
+        """
+        if cost <= 0:
+            return None
+
+        with self._lock:
+            if key is not None and key in self._running:
+                self.rejected['running'] += 1
+                return 'running', 0
+            buckets = [
+                ('user', self._bucket('user', user_id or '-')),
+                ('channel', self._bucket('channel', channel_id)),
+                ('global', self.global_bucket),
+            ]
+
+        acquired = []
+        for scope, bucket in buckets:
+            # 버킷 크기보다 비싼 요청은 가득 찬 버킷 하나를 통째로 쓰게 함
+            scope_cost = min(cost, bucket.capacity)
+            if not bucket.try_acquire(scope_cost):
+                for acquired_bucket, acquired_cost in acquired:
+                    acquired_bucket.refund(acquired_cost)
+                retry_after = math.ceil((scope_cost - bucket.level()) / bucket.rate)
+                with self._lock:
+                    self.rejected[scope] += 1
+                return scope, retry_after
+            acquired.append((bucket, scope_cost))
+
+        with self._lock:
+            if key is not None:
+                self._running.add(key)
+            self.admitted += 1
+            self.admitted_cost += cost
+        return None
+
+    def release(self, key):
+        """작업 종료 (같은 요청을 다시 받을 수 있게 함)"""
+        if key is None:
+            return
+        with self._lock:
+            self._running.discard(key)
+
+    def stats(self):
+        """제한 설정 + 현재 버킷 잔량 (사용자/채널은 ID 없이 집계만: 최저 잔량, 1 미만으로 바닥난 버킷 수)"""
+        with self._lock:
+            levels = {scope: [bucket.level() for bucket in buckets.values()] for scope, buckets in self._buckets.items()}
+            return {
+                'limits': {
+                    scope: {'rate_per_minute': round(rate * 60, 2), 'burst': burst}
+                    for scope, (rate, burst) in self.limits.items()
+                },
+                'global_level': round(self.global_bucket.level(), 2),
+                'user_levels': {
+                    'min': round(min(levels['user']), 2) if levels['user'] else None,
+                    'exhausted': sum(1 for level in levels['user'] if level < 1),
+                },
+                'channel_levels': {
+                    'min': round(min(levels['channel']), 2) if levels['channel'] else None,
+                    'exhausted': sum(1 for level in levels['channel'] if level < 1),
+                },
+                'tracked_users': len(self._buckets['user']),
+                'tracked_channels': len(self._buckets['channel']),
+                'running': len(self._running),
+                'admitted': self.admitted,
+                'admitted_cost': round(self.admitted_cost, 2),
+                'rejected': dict(self.rejected),
+            }
@@ -1,250 +1,461 @@
-from flask import Flask, request
-import requests
+from flask import Flask, Response, request, jsonify
+import asyncio
 import os
+import json
+import hashlib
+import hmac
 import time
+import atexit
 from datetime import datetime, timedelta
 import re
+from admission import AdmissionController, request_cost, request_key
+from applog import get_logger
+from async_runner import AsyncRunner
+from cache import TTLCache
+from dedup_store import DedupStore, extract_event_id
+from history_fetcher import HistoryFetcher
+from intent import DEFAULT_SHORT_TERM_HOURS, MAX_SHORT_TERM_HOURS, Intent, clamp, clamp_notice, parse_intent
+from job_queue import JobQueue
+from llm import create_backend
+from mapreduce import bucket_label
+from message_pipeline import ActivityStats, BucketSampler
+from message_store import MessageStore
+from metrics import registry, timed
+from progressive_message import AsyncProgressiveMessage, ProgressiveMessage
+import prompt_packer
+from scheduler import Scheduler, parse_times, parse_weekly
+from singleflight import AsyncSingleFlight, SingleFlight
+from slack_client import AsyncSlackClient, SlackClient, api_data, paginate
+from slack_verify import SlackVerifier
+from steps import Call, Gather, Steps, blocking, run_steps, run_steps_async
+from user_directory import UserDirectory, user_display_name
 
 app = Flask(__name__)
+log = get_logger('app')
 
 SLACK_TOKEN = os.environ.get('SLACK_TOKEN')
-SLACK_API_URL = 'https://slack.com/api/chat.postMessage'
-SLACK_CONVERSATIONS_HISTORY_URL = 'https://slack.com/api/conversations.history'
-SLACK_CONVERSATIONS_REPLIES_URL = 'https://slack.com/api/conversations.replies'
-SLACK_USERS_INFO_URL = 'https://slack.com/api/users.info'
 
-# 중복 요청 방지 캐시
-processed_messages = {}
-user_cache = {}  # 사용자 정보 캐시
-    
+# Slack 요청 서명 검증 (SLACK_SIGNING_SECRET이 없으면 모든 요청 거절, 로컬 개발에서만 SLACK_VERIFY_SIGNATURES=0으로 끔)
+slack_verifier = SlackVerifier(
+    os.environ.get('SLACK_SIGNING_SECRET'),
+    max_skew=int(os.environ.get('SLACK_SIGNATURE_MAX_SKEW', 300)),
+    required=os.environ.get('SLACK_VERIFY_SIGNATURES', '1') != '0'
+)
+
+# Slack Web API 공용 클라이언트 (커넥션 풀 + 타임아웃)
+slack = SlackClient(
+    SLACK_TOKEN,
+    base_url=os.environ.get('SLACK_API_BASE', 'https://slack.com/api'),
+    connect_timeout=float(os.environ.get('SLACK_CONNECT_TIMEOUT', 3.05)),
+    read_timeout=float(os.environ.get('SLACK_READ_TIMEOUT', 30)),
+    pool_size=int(os.environ.get('SLACK_POOL_SIZE', 10)),
+    max_retries=int(os.environ.get('SLACK_MAX_RETRIES', 3))
+)
+# asyncio 경로용 클라이언트 (tier별 rate limit / 호출 통계는 동기 클라이언트와 같이 씀)
+async_slack = AsyncSlackClient(slack, pool_size=int(os.environ.get('ASYNC_SLACK_POOL_SIZE', 100)))
+
+# 채널 히스토리 수집기 (긴 기간은 하위 구간으로 나눠 병렬 수집)
+history_fetcher = HistoryFetcher(
+    slack,
+    async_slack,
+    max_workers=int(os.environ.get('HISTORY_FETCH_WORKERS', 4)),
+    split_days=int(os.environ.get('HISTORY_SPLIT_DAYS', 7))
+)
+
+# 중복 요청 방지 캐시 (워커 로컬) + 워커 간 공유 저장소 (Slack 재시도 제거)
+processed_messages = TTLCache(max_size=10000, ttl=300, name='processed_messages')
+dedup_store = DedupStore(
+    os.environ.get('DEDUP_STORE_PATH', 'data/dedup.db'),
+    ttl=int(os.environ.get('DEDUP_TTL', 3600))
+)
+# 요약 결과 캐시 (같은 채널/기간에 새 메시지가 없으면 LLM을 다시 호출하지 않음)
+summary_cache = TTLCache(
+    max_size=int(os.environ.get('SUMMARY_CACHE_SIZE', 256)),
+    ttl=int(os.environ.get('SUMMARY_CACHE_TTL', 900)),
+    name='summary_cache'
+)
+# 장기 분석 구간별 요약 캐시 (바뀐 구간만 다시 요약)
+bucket_summary_cache = TTLCache(
+    max_size=int(os.environ.get('BUCKET_SUMMARY_CACHE_SIZE', 2048)),
+    ttl=int(os.environ.get('BUCKET_SUMMARY_TTL', 86400)),
+    name='bucket_summary_cache'
+)
+BUCKET_CONCURRENCY = int(os.environ.get('BUCKET_CONCURRENCY', 4))  # 구간 요약 동시 실행 수
+MAX_BUCKET_MESSAGES = int(os.environ.get('MAX_BUCKET_MESSAGES', 300))  # 구간당 표본 메시지 수 (이 중에서 토큰 예산만큼 사용)
+# 사용자 정보 캐시 (디렉터리에 없는 사용자용, 실패는 짧은 TTL)
+user_cache = TTLCache(
+    max_size=5000,
+    ttl=int(os.environ.get('USER_CACHE_TTL', 3600)),
+    negative_ttl=int(os.environ.get('USER_CACHE_NEGATIVE_TTL', 60)),
+    name='user_cache'
+)
+
+# 요약 작업은 백그라운드 워커에서 처리 (Slack 3초 타임아웃 방지)
+job_queue = JobQueue(
+    num_workers=int(os.environ.get('JOB_WORKERS', 4)),
+    max_size=int(os.environ.get('JOB_QUEUE_SIZE', 100)),
+    name='summary'
+)
+atexit.register(job_queue.shutdown)
+
+# asyncio 실행 경로 (ASYNC_SUMMARIES=1이면 요약 작업을 워커 스레드 대신 이벤트 루프 하나에서 동시에 처리)
+# Slack 호출은 aiohttp 클라이언트로 하고, tier별 rate limit / 호출 통계는 동기 클라이언트와 같이 씀
+ASYNC_SUMMARIES = os.environ.get('ASYNC_SUMMARIES', '0') == '1'
+async_runner = AsyncRunner(
+    max_concurrency=int(os.environ.get('ASYNC_MAX_CONCURRENCY', 200)),
+    max_pending=int(os.environ.get('ASYNC_MAX_PENDING', 1000)),
+    name='summary-async'
+)
+async_runner.on_shutdown(async_slack.close)
+atexit.register(async_runner.shutdown)
+
+# 같은 요약(kind, 채널, 기간)이 동시에 여러 번 요청되면 한 번만 실행하고 결과를 나눠 씀
+summary_flight = SingleFlight(name='summary')
+async_summary_flight = AsyncSingleFlight(name='summary-async')
+
+# 요청 입장 제어 (사용자별 / 채널별 / 전체, 분당 비용 기준: 스레드 1, 24시간 요약 2, 30일 분석 5, 60일 분석 8, 여러 채널은 채널 수만큼)
+admission = AdmissionController(
+    user_rate=float(os.environ.get('ADMISSION_USER_RATE', 10)),
+    user_burst=float(os.environ.get('ADMISSION_USER_BURST', 12)),
+    channel_rate=float(os.environ.get('ADMISSION_CHANNEL_RATE', 20)),
+    channel_burst=float(os.environ.get('ADMISSION_CHANNEL_BURST', 24)),
+    global_rate=float(os.environ.get('ADMISSION_GLOBAL_RATE', 60)),
+    global_burst=float(os.environ.get('ADMISSION_GLOBAL_BURST', 60))
+)
+
+# LLM 백엔드 (LLM_BACKEND=gemini|local, 워커당 한 번만 초기화)
+llm = create_backend()
+
+# 프롬프트 토큰 예산 (중요한 메시지부터 예산만큼 채움)
+PROMPT_TOKEN_BUDGET = prompt_packer.token_budget_for(llm.model_name, os.environ.get('PROMPT_TOKEN_BUDGET'))
+BUCKET_TOKEN_BUDGET = int(os.environ.get('BUCKET_TOKEN_BUDGET', max(1000, PROMPT_TOKEN_BUDGET // 6)))
+MAX_MESSAGE_TOKENS = int(os.environ.get('MAX_MESSAGE_TOKENS', 300))  # 메시지 하나당 최대 토큰
+
+# LLM 응답을 스트리밍으로 받아 자리표시 메시지를 점진적으로 갱신 (chat.update)
+STREAM_SUMMARIES = os.environ.get('STREAM_SUMMARIES', '1') == '1'
+STREAM_UPDATE_INTERVAL = float(os.environ.get('STREAM_UPDATE_INTERVAL', 1.2))  # chat.update 최소 간격 (초)
+
+# 워크스페이스 사용자 디렉터리 (users.list 일괄 로드, TTL마다 백그라운드 갱신)
+user_directory = UserDirectory(
+    slack,
+    os.environ.get('USER_DIRECTORY_PATH', 'data/users.json'),
+    ttl=int(os.environ.get('USER_DIRECTORY_TTL', 3600))
+)
+if SLACK_TOKEN:
+    user_directory.start()
+
+# 채널 메시지 로컬 저장소 (장기 분석 시 증분 동기화, 스레드 요약 증분 갱신)
+message_store = MessageStore(os.environ.get('MESSAGE_STORE_PATH', 'data/messages.db'))
 
-def is_duplicate_message(user_id, channel_id, message_text, timestamp):
-    """중복 메시지 확인"""
-    message_key = f"{user_id}_{channel_id}_{hash(message_text)}_{timestamp}"
-    current_time = time.time()
+# 여러 채널 한 번에 요약 (채널별 수집은 동시에, 채널 요약은 토큰 예산 안에서 한 LLM 호출로 묶음)
+MULTI_CHANNEL_MAX = int(os.environ.get('MULTI_CHANNEL_MAX', 20))  # 한 번에 요약할 최대 채널 수
+MULTI_CHANNEL_FETCH_WORKERS = int(os.environ.get('MULTI_CHANNEL_FETCH_WORKERS', 4))  # 채널 히스토리 동시 수집 수
+MULTI_CHANNEL_MIN_TOKENS = int(os.environ.get('MULTI_CHANNEL_MIN_TOKENS', 1500))  # 채널당 최소 토큰 예산 (모자라면 LLM 호출을 나눔)
+
+DIGEST_API_TOKEN = os.environ.get('DIGEST_API_TOKEN')  # /digest API 인증 토큰 (없으면 API 꺼짐)
+
+# 스레드 답글 페이지네이션 (conversations.replies)
+THREAD_PAGE_SIZE = int(os.environ.get('THREAD_PAGE_SIZE', 200))
+THREAD_MAX_PAGES = int(os.environ.get('THREAD_MAX_PAGES', 50))
+
+# 다이제스트 미리 만들기 (DIGEST_CHANNELS에 등록한 채널만, 한가한 시간에 예약 실행)
+DIGEST_CHANNELS = [channel.strip() for channel in os.environ.get('DIGEST_CHANNELS', '').split(',') if channel.strip()]
+DIGEST_MAX_AGE = int(os.environ.get('DIGEST_MAX_AGE', 6 * 3600))  # 이보다 오래된 다이제스트는 쓰지 않음 (초)
+scheduler = Scheduler(
+    os.environ.get('DIGEST_LOCK_PATH', 'data/scheduler.lock'),
+    max_concurrent=int(os.environ.get('DIGEST_CONCURRENCY', 1)),
+    jitter=int(os.environ.get('DIGEST_JITTER', 600)),
+    busy_fn=lambda: job_queue.pending() + async_runner.pending() > 0,  # 실시간 요청 처리 중이면 미룸
+    name='digest'
+)
+for digest_channel in DIGEST_CHANNELS:
+    for hour, minute in parse_times(os.environ.get('DIGEST_DAILY_AT', '06:00')):
+        scheduler.every_day(f"daily:{digest_channel}@{hour:02d}:{minute:02d}", hour, minute,
+                            lambda channel_id=digest_channel: get_channel_summary(channel_id, 24))
+    weekday, hour, minute = parse_weekly(os.environ.get('DIGEST_WEEKLY_AT', 'mon 06:30'))
+    scheduler.every_week(f"weekly:{digest_channel}", weekday, hour, minute,
+                         lambda channel_id=digest_channel: get_long_term_channel_summary(channel_id, 7))
+if SLACK_TOKEN:
+    scheduler.start()
+atexit.register(scheduler.stop)
+
+def is_duplicate_event(key):
+    """이벤트 중복 확인 (워커 로컬 캐시 → 워커 간 공유 저장소 순)"""
+    # 같은 워커로 다시 들어온 재시도는 로컬 캐시에서 바로 걸러냄
+    if not processed_messages.add(key, time.time()):
+        return True
     
-    # 5분 이상 된 캐시 정리
-    expired_keys = [key for key, cached_time in processed_messages.items() 
-                   if current_time - cached_time > 300]
-    for key in expired_keys:
-        del processed_messages[key]
+    # 다른 워커가 이미 처리한 이벤트인지 공유 저장소에서 확인
+    return not dedup_store.first_seen(key)
+
+def forget_event(key):
+    """중복 기록 삭제 (처리하지 못한 요청을 Slack 재시도로 다시 받기 위해)"""
+    processed_messages.discard(key)
+    dedup_store.forget(key)
+
+def message_dedup_key(channel_id, timestamp):
+    """메시지 중복 확인 키 (채널 + ts)"""
+    return f"msg:{channel_id}:{timestamp}"
+
+def is_duplicate_message(channel_id, timestamp):
+    """같은 메시지(채널 + ts)가 다른 이벤트로 다시 들어왔는지 확인"""
+    message_key = message_dedup_key(channel_id, timestamp)
     
-    if message_key in processed_messages:
-        print(f"중복 메시지 감지: {message_key}")
+    if is_duplicate_event(message_key):
+        log.info("중복 메시지 감지", key=message_key)
         return True
     
-    processed_messages[message_key] = current_time
     return False
 
-def get_user_name(user_id):
-    """사용자 ID로 이름 가져오기 (캐시 사용)"""
-    if user_id in user_cache:
-        return user_cache[user_id]
+def fingerprint_key(kind, channel_id, window, latest_ts, count):
+    """요약 캐시 키: 요청 종류 + 채널 + 기간 + 메시지 지문 (최신 ts, 개수)"""
+    return (kind, channel_id, window, latest_ts, count)
+
+def summary_cache_key(kind, channel_id, window, messages):
+    """메시지 목록으로 요약 캐시 키 만들기"""
+    latest_ts = max((float(msg.get('ts', 0)) for msg in messages), default=0.0)
+    return fingerprint_key(kind, channel_id, window, latest_ts, len(messages))
+
+def find_summary(cache_key):
+    """요약 캐시 → 미리 만든 다이제스트 순으로 조회
+
+    다이제스트는 그 이후로 새 메시지가 없고(최신 ts 일치) DIGEST_MAX_AGE 안에 만든 것만 쓴다.
+    """
+    cached = summary_cache.get(cache_key)
+    if cached:
+        log.info("요약 캐시 사용", key=cache_key)
+        return cached
+    
+    kind, channel_id, window, latest_ts, _ = cache_key
+    if channel_id not in DIGEST_CHANNELS:
+        return None
+    
+    digest = message_store.get_digest(channel_id, kind, window)
+    if not digest:
+        return None
+    
+    digest_latest_ts, _, summary, created_at = digest
+    if digest_latest_ts != latest_ts or time.time() - created_at > DIGEST_MAX_AGE:
+        return None
+    
+    log.info("미리 만든 다이제스트 사용", key=cache_key)
+    result = f"{summary}\n🕒 {datetime.fromtimestamp(created_at).strftime('%m/%d %H:%M')}에 미리 만든 요약입니다"
+    summary_cache.set(cache_key, result)
+    return result
+
+def store_summary(cache_key, result):
+    """요약 캐시에 저장 (다이제스트 채널이면 워커 간 공유 저장소에도 저장)"""
+    summary_cache.set(cache_key, result)
+    kind, channel_id, window, latest_ts, count = cache_key
+    if channel_id in DIGEST_CHANNELS:
+        message_store.save_digest(channel_id, kind, window, latest_ts, count, result, time.time())
+
+# ── 동기 / asyncio 공용 단계 ──
+# 요약 로직은 I/O마다 아래 단계(Call)를 yield하는 생성기로 한 번만 쓰고,
+# 동기 경로는 run_steps(스레드), asyncio 경로는 run_steps_async(await, SQLite만 to_thread)로 실행한다.
+
+def slack_get(method, params):
+    """Slack Web API GET 단계"""
+    return Call(slack.get, async_slack.get, method, params)
+
+def slack_post(method, payload, wait=True):
+    """Slack Web API POST 단계 (wait=False면 rate limit 토큰이 없을 때 None)"""
+    return Call(slack.post, async_slack.post, method, payload, wait=wait)
+
+def generate(prompt, progress=None, header=None):
+    """LLM 호출 단계 (progress가 있으면 header 아래에 생성 중인 내용을 계속 보여줌)"""
+    return Call(lambda: llm.generate(prompt, progress_writer(progress, header)),
+                lambda: llm.agenerate(prompt, progress_writer_async(progress, header)))
+
+def show_progress(progress, text):
+    """진행 메시지 갱신 단계 (progress는 경로에 맞는 콜백: 동기 함수 또는 코루틴 함수)"""
+    return Call(progress, progress, text)
+
+def user_names(user_ids):
+    """작성자 이름 조회 단계 ({사용자 ID: 이름}, asyncio 경로는 동시에 조회)"""
+    user_ids = list(user_ids)
     
+    async def lookup_async():
+        return dict(zip(user_ids, await asyncio.gather(*(get_user_name_async(user_id) for user_id in user_ids))))
+    return Call(lambda: {user_id: get_user_name(user_id) for user_id in user_ids}, lookup_async)
+
+def shared(key, steps, *args):
+    """같은 key의 요약이 실행 중이면 그 결과를 같이 받는 단계 (singleflight, steps(*args)는 한 번만 실행)"""
+    flight = Steps(steps, *args)
+    return Call(lambda: summary_flight.do(key, flight.run), lambda: async_summary_flight.do(key, flight.arun))
+
+def format_steps(messages, include_time=True, token_budget=None):
+    """작성자 이름을 한꺼번에 조회한 뒤 format_messages_for_summary로 포맷팅하는 단계"""
+    names = yield user_names({message['user'] for message in messages if message.get('user')})
+    return format_messages_for_summary(messages, include_time, token_budget, name_of=names.get)
+
+def user_name_steps(user_id):
+    """사용자 ID로 이름 가져오기 (사용자 디렉터리 → 캐시 → users.info 순)"""
+    name = user_directory.get(user_id)
+    if name:
+        return name
+    
+    # 첫 일괄 로드가 진행 중이면 잠시 기다렸다가 다시 확인 (asyncio 경로는 스레드에서 기다림)
+    if user_directory.wait_loaded(timeout=0) or (yield blocking(user_directory.wait_loaded, 15)):
+        name = user_directory.get(user_id)
+        if name:
+            return name
+    
+    name = user_cache.get(user_id)
+    if name:
+        return name
+    
+    # 디렉터리 갱신 이후 새로 들어온 사용자만 개별 조회
     try:
-        headers = {
-            'Authorization': f'Bearer {SLACK_TOKEN}',
-            'Content-Type': 'application/json'
-        }
-        
-        params = {'user': user_id}
-        response = requests.get(SLACK_USERS_INFO_URL, headers=headers, params=params)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('ok'):
-                user = data.get('user', {})
-                name = user.get('real_name') or user.get('display_name') or user.get('name', 'Unknown')
-                user_cache[user_id] = name
-                return name
-        
-        user_cache[user_id] = 'Unknown'
-        return 'Unknown'
+        data = api_data((yield slack_get('users.info', {'user': user_id})))
+        name = user_display_name(data.get('user', {}))
+        user_cache.set(user_id, name)
+        return name
         
     except Exception as e:
-        print(f"사용자 정보 가져오기 오류: {e}")
-        user_cache[user_id] = 'Unknown'
+        # 실패는 짧게만 캐시해서 일시적 오류가 영구히 남지 않도록 함
+        log.warning("사용자 정보 가져오기 오류", user=user_id, error=e)
+        user_cache.set_negative(user_id, 'Unknown')
         return 'Unknown'
 
-def get_channel_messages_with_pagination(channel_id, days_back=30):
-    """페이지네이션을 사용해서 더 많은 메시지 가져오기"""
+@timed('get_user_name')
+def get_user_name(user_id):
+    """사용자 ID로 이름 가져오기"""
+    return run_steps(user_name_steps(user_id))
+
+@timed('get_user_name')
+async def get_user_name_async(user_id):
+    """get_user_name의 asyncio 버전"""
+    return await run_steps_async(user_name_steps(user_id))
+
+def sync_history_steps(channel_id, days_back=30):
+    """로컬 저장소를 최근 days_back일까지 증분 동기화하고, 읽기 시작할 ts 반환 (단계 생성기)
+
+    이미 동기화된 채널은 마지막 동기화 이후의 새 메시지만 Slack에서 가져오고
+    나머지는 로컬 저장소에서 읽는다. 저장소 읽기/쓰기는 blocking 단계로 yield한다.
+    """
     try:
         since_time = datetime.now() - timedelta(days=days_back)
         oldest_timestamp = since_time.timestamp()
         
-        headers = {
-            'Authorization': f'Bearer {SLACK_TOKEN}',
-            'Content-Type': 'application/json'
-        }
-        
-        all_messages = []
-        cursor = None
-        page_count = 0
-        max_pages = 50  # 최대 50페이지 (약 10,000개 메시지)
+        log.info("메시지 수집 시작", channel=channel_id, days=days_back)
         
-        print(f"📊 {days_back}일간 메시지 수집 시작...")
+        state = yield blocking(message_store.get_sync_state, channel_id)
         
-        while page_count < max_pages:
-            params = {
-                'channel': channel_id,
-                'oldest': oldest_timestamp,
-                'limit': 200  # 페이지당 200개
-            }
+        if state:
+            synced_oldest, synced_latest = state
             
-            if cursor:
-                params['cursor'] = cursor
+            # 마지막 동기화 이후의 새 메시지
+            new_messages, complete = yield from history_fetcher.fetch_steps(channel_id, synced_latest)
+            yield blocking(message_store.save_messages, channel_id, new_messages)
+            latest = max([float(m['ts']) for m in new_messages] + [synced_latest])
+            if not complete:
+                # 중간 구간이 비어버리므로 새로 가져온 부분부터 다시 시작
+                synced_oldest = min(float(m['ts']) for m in new_messages)
             
-            response = requests.get(SLACK_CONVERSATIONS_HISTORY_URL, headers=headers, params=params)
+            # 요청 기간이 저장된 구간보다 길면 이전 구간만 추가로 가져옴
+            if oldest_timestamp < synced_oldest:
+                old_messages, complete = yield from history_fetcher.fetch_steps(channel_id, oldest_timestamp, synced_oldest)
+                yield blocking(message_store.save_messages, channel_id, old_messages)
+                if complete:
+                    synced_oldest = oldest_timestamp
+                elif old_messages:
+                    synced_oldest = min(float(m['ts']) for m in old_messages)
             
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('ok'):
-                    messages = data.get('messages', [])
-                    if not messages:
-                        break
-                    
-                    all_messages.extend(messages)
-                    page_count += 1
-                    
-                    print(f"📄 페이지 {page_count}: {len(messages)}개 메시지 수집 (총 {len(all_messages)}개)")
-                    
-                    # 다음 페이지 확인
-                    if data.get('has_more') and data.get('response_metadata', {}).get('next_cursor'):
-                        cursor = data['response_metadata']['next_cursor']
-                        time.sleep(0.5)  # API 호출 간격 조절
-                    else:
-                        break
-                else:
-                    print(f"API 오류: {data.get('error')}")
-                    break
+            log.info("증분 동기화", channel=channel_id, new_messages=len(new_messages))
+        else:
+            new_messages, complete = yield from history_fetcher.fetch_steps(channel_id, oldest_timestamp)
+            yield blocking(message_store.save_messages, channel_id, new_messages)
+            latest = max([float(m['ts']) for m in new_messages] + [oldest_timestamp])
+            if complete or not new_messages:
+                synced_oldest = oldest_timestamp
             else:
-                print(f"HTTP 오류: {response.status_code}")
-                break
+                synced_oldest = min(float(m['ts']) for m in new_messages)
         
-        print(f"✅ 총 {len(all_messages)}개 메시지 수집 완료")
-        return all_messages
+        yield blocking(message_store.update_sync_state, channel_id, synced_oldest, latest, time.time())
+        return max(oldest_timestamp, synced_oldest)
         
     except Exception as e:
-        print(f"메시지 수집 오류: {e}")
-        return []
+        # 동기화 구간은 갱신하지 않고, 저장돼 있는 메시지라도 사용
+        log.error("메시지 수집 오류", channel=channel_id, error=e)
+        return oldest_timestamp
 
-def get_channel_messages(channel_id, hours_back=24):
-    """단기간 메시지 가져오기 (기존 함수)"""
-    try:
-        since_time = datetime.now() - timedelta(hours=hours_back)
-        oldest_timestamp = since_time.timestamp()
-        
-        headers = {
-            'Authorization': f'Bearer {SLACK_TOKEN}',
-            'Content-Type': 'application/json'
-        }
-        
-        params = {
-            'channel': channel_id,
-            'oldest': oldest_timestamp,
-            'limit': 200
-        }
-        
-        response = requests.get(SLACK_CONVERSATIONS_HISTORY_URL, headers=headers, params=params)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('ok'):
-                return data.get('messages', [])
-            else:
-                print(f"채널 메시지 API 오류: {data.get('error')}")
-                return []
-        else:
-            print(f"채널 메시지 HTTP 오류: {response.status_code}")
-            return []
-            
-    except Exception as e:
-        print(f"채널 메시지 가져오기 오류: {e}")
-        return []
+@timed('get_channel_messages_with_pagination')
+def sync_channel_history(channel_id, days_back=30):
+    """로컬 저장소를 최근 days_back일까지 증분 동기화하고, 읽기 시작할 ts 반환"""
+    return run_steps(sync_history_steps(channel_id, days_back))
+
+def iter_channel_messages(channel_id, days_back=30):
+    """최근 days_back일 메시지를 저장소에서 하나씩 읽기 (최신순)"""
+    return message_store.iter_messages(channel_id, sync_channel_history(channel_id, days_back))
 
-def get_thread_messages(channel_id, thread_ts):
-    """스레드의 모든 메시지들을 가져오기"""
+def get_channel_messages_with_pagination(channel_id, days_back=30):
+    """최근 days_back일 메시지 목록 (저장소 + 증분 동기화)"""
+    return list(iter_channel_messages(channel_id, days_back))
+
+def scan_channel_messages(channel_id, start_ts, bucket_days):
+    """저장소에서 메시지를 하나씩 읽으면서 필터링 + 통계 + 구간별 표본을 한 번에 처리
+
+    (ActivityStats, BucketSampler) 반환
+    """
+    activity = ActivityStats()
+    sampler = BucketSampler(bucket_days, MAX_BUCKET_MESSAGES)
+    for message in message_store.iter_messages(channel_id, start_ts):
+        if activity.add(message):
+            sampler.add(message)
+    return activity, sampler
+
+def channel_messages_steps(channel_id, hours_back=24):
+    """단기간 메시지 가져오기 ((최신순 메시지, 기간 끝까지 가져왔는지) 반환, 단계 생성기)
+
+    여러 날 구간도 잘리지 않도록 history_fetcher로 페이지네이션한다.
+    """
     try:
-        headers = {
-            'Authorization': f'Bearer {SLACK_TOKEN}',
-            'Content-Type': 'application/json'
-        }
-        
-        params = {
-            'channel': channel_id,
-            'ts': thread_ts,
-            'limit': 100
-        }
-        
-        response = requests.get(SLACK_CONVERSATIONS_REPLIES_URL, headers=headers, params=params)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('ok'):
-                return data.get('messages', [])
-            else:
-                print(f"스레드 API 오류: {data.get('error')}")
-                return []
-        else:
-            print(f"스레드 HTTP 오류: {response.status_code}")
-            return []
+        oldest_timestamp = (datetime.now() - timedelta(hours=hours_back)).timestamp()
+        messages, complete = yield from history_fetcher.fetch_steps(channel_id, oldest_timestamp)
+        if not complete:
+            log.warning("채널 메시지 일부만 수집", channel=channel_id, hours=hours_back, messages=len(messages))
+        return messages, complete
             
     except Exception as e:
-        print(f"스레드 메시지 가져오기 오류: {e}")
-        return []
-
-def analyze_messages_by_period(messages, days_back):
-    """메시지를 기간별로 분석"""
-    now = datetime.now()
-    
-    # 시간대별 분류
-    periods = {
-        'recent': [],    # 최근 7일
-        'weekly': [],    # 1주-2주 전
-        'monthly': []    # 2주-30일 전
+        log.error("채널 메시지 가져오기 오류", channel=channel_id, error=e)
+        return [], True
+
+def thread_messages_steps(channel_id, thread_ts, oldest=None):
+    """스레드 메시지를 cursor로 끝까지 가져오기 (Slack history API와 같은 최신순)
+
+    oldest가 있으면 그 이후의 답글만 가져온다.
+    (메시지 목록, 끝까지 다 가져왔는지 여부) 반환
+    """
+    params = {
+        'channel': channel_id,
+        'ts': thread_ts,
+        'limit': THREAD_PAGE_SIZE
     }
+    if oldest:
+        params['oldest'] = oldest
     
-    user_activity = {}
-    daily_counts = {}
-    
-    for message in messages:
-        if message.get('bot_id') or message.get('subtype') in ['channel_join', 'channel_leave']:
-            continue
-            
-        try:
-            msg_time = datetime.fromtimestamp(float(message.get('ts', 0)))
-            days_ago = (now - msg_time).days
-            user_id = message.get('user')
-            
-            # 기간별 분류
-            if days_ago <= 7:
-                periods['recent'].append(message)
-            elif days_ago <= 14:
-                periods['weekly'].append(message)
-            else:
-                periods['monthly'].append(message)
-            
-            # 사용자 활동 추적
-            if user_id:
-                user_name = get_user_name(user_id)
-                if user_name not in user_activity:
-                    user_activity[user_name] = 0
-                user_activity[user_name] += 1
-            
-            # 일별 카운트
-            date_key = msg_time.strftime('%Y-%m-%d')
-            if date_key not in daily_counts:
-                daily_counts[date_key] = 0
-            daily_counts[date_key] += 1
+    messages, complete = [], False
+    try:
+        messages, _, complete, _ = yield from paginate(lambda page_params: slack_get('conversations.replies', page_params),
+                                                       params, THREAD_MAX_PAGES)
+        if not complete:
+            log.warning("스레드 답글 일부만 수집", channel=channel_id, thread_ts=thread_ts, max_pages=THREAD_MAX_PAGES)
             
-        except:
-            continue
+    except Exception as e:
+        log.error("스레드 메시지 가져오기 오류", channel=channel_id, thread_ts=thread_ts, error=e)
     
-    return periods, user_activity, daily_counts
+    return sorted(messages, key=lambda msg: float(msg['ts']), reverse=True), complete
 
-def format_messages_for_summary(messages, include_time=True):
-    """메시지들을 요약하기 좋은 형태로 포맷팅"""
-    formatted_messages = []
+@timed('format_messages_for_summary')
+def format_messages_for_summary(messages, include_time=True, token_budget=None, name_of=None):
+    """메시지들을 요약하기 좋은 형태로 포맷팅하고 토큰 예산에 맞게 채우기
+
+    name_of: 사용자 ID → 이름 (기본은 get_user_name, format_steps는 한꺼번에 미리 조회한 이름 사용)
+    (포맷팅된 텍스트, 프롬프트 반영 정보) 반환
+    """
+    name_of = name_of or get_user_name
+    entries = []
     
     for message in reversed(messages):  # 시간순으로 정렬
         # 봇 메시지나 시스템 메시지 제외
@@ -256,7 +467,7 @@ def format_messages_for_summary(messages, include_time=True):
         timestamp = message.get('ts', '')
         
         if user_id and text:
-            user_name = get_user_name(user_id)
+            user_name = name_of(user_id)
             
             # 시간 포맷팅
             time_str = ''
@@ -267,57 +478,131 @@ def format_messages_for_summary(messages, include_time=True):
                 except:
                     time_str = ''
             
-            # 멘션 정리 및 텍스트 길이 제한
+            # 멘션 정리 (길이는 토큰 예산 안에서 packer가 조절)
             clean_text = re.sub(r'<@[A-Z0-9]+>', '@사용자', text)
-            if len(clean_text) > 100:
-                clean_text = clean_text[:100] + "..."
             
             formatted_msg = f"{time_str}{user_name}: {clean_text}"
-            formatted_messages.append(formatted_msg)
+            entries.append((message, formatted_msg))
     
-    return '\n'.join(formatted_messages)
+    lines, packed = prompt_packer.pack(entries, token_budget or PROMPT_TOKEN_BUDGET, MAX_MESSAGE_TOKENS)
+    return '\n'.join(lines), packed
+
+def progress_writer(progress, header):
+    """스트리밍 중간 결과를 헤더와 함께 진행 메시지로 보내는 콜백"""
+    if not progress:
+        return None
+    return lambda text: progress(f"{header}\n\n{text.strip()} ✍️")
 
-def get_long_term_channel_summary(channel_id, days_back=30):
-    """장기간 채널 대화를 요약 (30일 등)"""
+def bucket_summary(channel_id, start, bucket_days, bucket):
+    """한 구간 요약 단계 (같은 요청이 실행 중이면 그 결과를 같이 받음)"""
+    key = ('bucket', channel_id, start.isoformat(), bucket_days, bucket.latest_ts, bucket.count)
+    return shared(key, bucket_summary_steps, channel_id, start, bucket_days, bucket)
+
+def bucket_summary_steps(channel_id, start, bucket_days, bucket):
+    """한 구간(하루/한 주)의 대화 요약 (map 단계, 구간별 캐시)
+
+    (요약, 프롬프트에 반영된 메시지 수) 반환, 실패하면 None (다른 구간 요약은 계속)
+    """
     try:
-        print(f"🔍 {days_back}일간 채널 분석 시작...")
+        cache_key = fingerprint_key('bucket', channel_id, (start.isoformat(), bucket_days), bucket.latest_ts, bucket.count)
+        cached = bucket_summary_cache.get(cache_key)
+        if cached:
+            return cached
+        
+        # format_messages_for_summary는 최신순 입력을 받으므로 뒤집어서 전달
+        sampled = bucket.sample()
+        formatted_text, packed = yield from format_steps(list(reversed(sampled)), token_budget=BUCKET_TOKEN_BUDGET)
+        if not formatted_text:
+            return None
+        
+        prompt = f"""다음은 Slack 채널의 {bucket_label(start, bucket_days)} 대화 내용입니다 (총 {bucket.count}개 메시지 중 {packed.included}개). 이 구간의 핵심을 한국어로 요약해주세요:
+
+{formatted_text}
+
+요약 형식:
+- 주요 논의 주제와 결정사항
+- 눈에 띄는 이슈나 질문
+- 주로 참여한 사람
+- 3-5줄로 간결하게 정리"""
         
-        # 메시지 수집 (페이지네이션 사용)
-        all_messages = get_channel_messages_with_pagination(channel_id, days_back)
+        response_text = yield generate(prompt)
+        if not response_text:
+            return None
         
-        if not all_messages:
-            return f"📊 **{days_back}일간 채널 분석**\n\n해당 기간 동안 메시지가 없습니다."
+        result = (response_text.strip(), packed.included)
+        bucket_summary_cache.set(cache_key, result)
+        return result
         
-        # 실제 대화 메시지만 필터링
-        real_messages = [msg for msg in all_messages if not msg.get('bot_id') and not msg.get('subtype')]
+    except Exception as e:
+        log.warning("구간 요약 오류", bucket=start, error=e)
+        return None
+
+def long_term_summary(channel_id, days_back=30, progress=None):
+    """장기 채널 분석 단계 (같은 요청이 실행 중이면 그 결과를 같이 받음)"""
+    return shared(('long_term', channel_id, days_back), long_term_summary_steps, channel_id, days_back, progress)
+
+def get_long_term_channel_summary(channel_id, days_back=30, progress=None):
+    """장기 채널 분석"""
+    return long_term_summary(channel_id, days_back, progress).run()
+
+def long_term_summary_steps(channel_id, days_back=30, progress=None):
+    """장기간 채널 대화를 요약 (30일 등, 구간별 map-reduce)"""
+    try:
+        log.info("장기 채널 분석 시작", channel=channel_id, days=days_back)
         
-        if len(real_messages) < 5:
-            return f"📊 **{days_back}일간 채널 분석**\n\n해당 기간의 대화가 너무 적어서 분석하기 어렵습니다."
+        # 기간을 일/주 단위 구간으로 나눔 (구간별 요약 map → 종합 reduce)
+        bucket_days = 1 if days_back <= 14 else 7
+        unit_name = '일' if bucket_days == 1 else '주'
         
-        # 메시지 분석
-        periods, user_activity, daily_counts = analyze_messages_by_period(real_messages, days_back)
+        start_ts = yield from sync_history_steps(channel_id, days_back)
+        activity, sampler = yield blocking(scan_channel_messages, channel_id, start_ts, bucket_days)
         
-        # 상위 활성 사용자
-        top_users = sorted(user_activity.items(), key=lambda x: x[1], reverse=True)[:5]
+        if not activity.scanned:
+            return f"📊 **{days_back}일간 채널 분석**\n\n해당 기간 동안 메시지가 없습니다."
         
-        # 최근 중요 메시지들만 샘플링 (너무 길면 API 한계)
-        sample_messages = real_messages[:50] + real_messages[-50:] if len(real_messages) > 100 else real_messages
-        formatted_text = format_messages_for_summary(sample_messages[:100])  # 최대 100개만
+        if activity.total < 5:
+            return f"📊 **{days_back}일간 채널 분석**\n\n해당 기간의 대화가 너무 적어서 분석하기 어렵습니다."
         
-        # Gemini로 요약
-        import google.generativeai as genai
+        # 같은 기간에 새 메시지가 없으면 이전 분석 결과 재사용
+        cache_key = fingerprint_key('long_term', channel_id, days_back, activity.latest_ts, activity.total)
+        cached = yield blocking(find_summary, cache_key)
+        if cached:
+            return cached
+        
+        # 활동 통계 (열 단위 배열로 한 번에 계산, 이름 조회는 상위 사용자만)
+        report = activity.analyze(top_n=5)
+        names = yield user_names(user_id for user_id, _ in report['top_users'])
+        top_users = [(names[user_id], count) for user_id, count in report['top_users']]
+        threads = report['threads']
+        response = report['response_minutes']
+        buckets = sampler.buckets()
+        
+        # 구간별 요약은 BUCKET_CONCURRENCY개씩 동시에 (map 단계)
+        summaries = yield Gather([bucket_summary(channel_id, start, bucket_days, bucket) for start, bucket in buckets], BUCKET_CONCURRENCY)
+        partials = [(start, bucket, summary) for (start, bucket), summary in zip(buckets, summaries)]
+        partial_text = '\n\n'.join(
+            f"[{bucket_label(start, bucket_days)}] ({bucket.count}개 메시지)\n{summary[0]}"
+            for start, bucket, summary in partials if summary
+        )
+        included = sum(summary[1] for _, _, summary in partials if summary)
+        
+        if not partial_text:
+            return f"📊 {days_back}일간 채널 분석 생성에 실패했습니다."
         
-        genai.configure(api_key=os.environ.get('GOOGLE_API_KEY'))
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        log.info("구간 요약 완료, 종합 분석 중", channel=channel_id, buckets=len(partials))
+        if progress:
+            yield show_progress(progress, f"📊 **{days_back}일간 채널 종합 분석**\n\n🧩 {len(partials)}개 구간 요약 완료, 종합 분석 중...")
         
-        prompt = f"""다음은 Slack 채널에서 최근 {days_back}일 동안의 대화 샘플입니다. 장기적 관점에서 주요 내용을 한국어로 요약해주세요:
+        prompt = f"""다음은 Slack 채널의 최근 {days_back}일 대화를 {unit_name} 단위 구간별로 나눠 요약한 내용입니다. 이를 종합해서 장기적 관점에서 주요 내용을 한국어로 요약해주세요:
 
-{formatted_text}
+{partial_text}
 
 분석 정보:
-- 총 메시지 수: {len(real_messages)}개
-- 활성 사용자: {len(user_activity)}명
-- 분석 기간: {days_back}일
+- 총 메시지 수: {activity.total}개
+- 활성 사용자: {report['active_users']}명
+- 분석 기간: {days_back}일 ({len(partials)}개 구간)
+- 가장 활발한 시간대 / 요일: {report['peak_hour']}시 / {report['busiest_weekday']}요일
+- 스레드: {threads['count']}개 (평균 답글 {threads['avg_replies']}개, 최대 {threads['max_replies']}개)
 
 요약 형식:
 - 🗓️ 기간별 주요 활동 및 트렌드
@@ -328,59 +613,101 @@ def get_long_term_channel_summary(channel_id, days_back=30):
 - 💡 향후 주목할 점이나 액션 아이템
 - 8-12줄로 포괄적으로 정리"""
         
-        response = model.generate_content(prompt)
+        response_text = yield generate(prompt, progress, f"📊 **{days_back}일간 채널 종합 분석**")
         
-        if response.text:
+        if response_text:
             # 통계 정보 추가
             stats_info = f"""📊 **상세 통계:**
 👥 **활성 사용자 TOP 5:**
 {chr(10).join([f"• {name}: {count}개 메시지" for name, count in top_users])}
 
 📅 **기간별 메시지 분포:**
-• 최근 7일: {len(periods['recent'])}개
-• 1-2주 전: {len(periods['weekly'])}개  
-• 2주-{days_back}일 전: {len(periods['monthly'])}개"""
+• 최근 7일: {report['periods']['recent']}개
+• 1-2주 전: {report['periods']['weekly']}개  
+• 2주-{days_back}일 전: {report['periods']['monthly']}개
+
+⏰ **활동 패턴:**
+• 가장 활발한 날: {report['busiest_day'][0]} ({report['busiest_day'][1]}개)
+• 가장 활발한 시간대: {report['peak_hour']}시 ({report['hourly'][report['peak_hour']]}개) / 요일: {report['busiest_weekday']}요일
+• 응답 간격: {f"중앙값 {response['p50']}분, 90% {response['p90']}분" if response['samples'] else '데이터 없음'}
+• 스레드: {threads['count']}개 (메시지의 {threads['share']}%, 평균 답글 {threads['avg_replies']}개, 최대 {threads['max_replies']}개)"""
             
-            return f"""📊 **{days_back}일간 채널 종합 분석**
+            result = f"""📊 **{days_back}일간 채널 종합 분석**
 
-{response.text.strip()}
+{response_text.strip()}
 
 ───────────────────
 {stats_info}
 
-🔍 **총 분석 데이터**: {len(real_messages)}개 메시지, {len(user_activity)}명 참여"""
+🔍 **총 분석 데이터**: {activity.total}개 메시지, {report['active_users']}명 참여 (구간 요약에 {included}개 반영, {included / activity.total * 100:.0f}%)"""
+            yield blocking(store_summary, cache_key, result)
+            return result
         else:
             return f"📊 {days_back}일간 채널 분석 생성에 실패했습니다."
             
     except Exception as e:
-        print(f"장기 채널 분석 오류: {e}")
+        log.error("장기 채널 분석 오류", channel=channel_id, days=days_back, error=e)
         return f"📊 {days_back}일간 채널 분석 중 오류가 발생했습니다: {str(e)}"
 
-def get_channel_summary(channel_id, hours_back=24):
+def channel_summary(channel_id, hours_back=24, progress=None):
+    """단기 채널 대화 요약 단계 (같은 요청이 실행 중이면 그 결과를 같이 받음)"""
+    return shared(('short_term', channel_id, hours_back), channel_summary_steps, channel_id, hours_back, progress)
+
+def get_channel_summary(channel_id, hours_back=24, progress=None):
+    """단기 채널 대화 요약"""
+    return channel_summary(channel_id, hours_back, progress).run()
+
+def channel_summary_steps(channel_id, hours_back=24, progress=None):
     """단기간 채널 대화를 요약 (기존 함수)"""
     try:
-        print(f"채널 {channel_id}의 최근 {hours_back}시간 메시지 수집 중...")
-        
-        messages = get_channel_messages(channel_id, hours_back)
-        
-        if not messages:
-            return f"📅 **채널 대화 요약**\n\n최근 {hours_back}시간 동안 이 채널에 메시지가 없습니다."
+        log.info("단기 채널 메시지 수집", channel=channel_id, hours=hours_back)
         
-        # 봇 메시지 제외하고 실제 대화만 필터링
-        real_messages = [msg for msg in messages if not msg.get('bot_id') and not msg.get('subtype')]
+        messages, complete = yield from channel_messages_steps(channel_id, hours_back)
         
-        if len(real_messages) < 2:
-            return f"📅 **채널 대화 요약**\n\n최근 {hours_back}시간 동안의 대화가 너무 적어서 요약하기 어렵습니다."
+        real_messages, reply = filter_channel_messages(messages, hours_back)
+        if reply:
+            return reply
         
-        formatted_text = format_messages_for_summary(real_messages)
+        cache_key = summary_cache_key('short_term', channel_id, hours_back, real_messages)
+        cached = yield blocking(find_summary, cache_key)
+        if cached:
+            return cached
         
-        # Gemini로 요약
-        import google.generativeai as genai
+        formatted_text, packed = yield from format_steps(real_messages)
         
-        genai.configure(api_key=os.environ.get('GOOGLE_API_KEY'))
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        response_text = yield generate(channel_summary_prompt(hours_back, formatted_text, len(real_messages)),
+                                       progress, f"📅 **채널 대화 요약** (최근 {hours_back}시간)")
         
-        prompt = f"""다음은 Slack 채널에서 최근 {hours_back}시간 동안의 대화 내용입니다. 주요 내용을 한국어로 요약해주세요:
+        if response_text:
+            result = channel_summary_result(hours_back, response_text, len(real_messages), packed, complete)
+            yield blocking(store_summary, cache_key, result)
+            return result
+        else:
+            return "📅 채널 요약 생성에 실패했습니다."
+            
+    except Exception as e:
+        log.error("채널 요약 오류", channel=channel_id, hours=hours_back, error=e)
+        return f"📅 채널 요약 중 오류가 발생했습니다: {str(e)}"
+
+def filter_channel_messages(messages, hours_back):
+    """봇 메시지를 제외한 실제 대화만 남기기
+
+    (실제 대화 목록, None) 또는 요약할 대화가 없으면 (None, 안내 메시지) 반환
+    """
+    if not messages:
+        return None, f"📅 **채널 대화 요약**\n\n최근 {hours_back}시간 동안 이 채널에 메시지가 없습니다."
+    
+    # 봇 메시지 제외하고 실제 대화만 필터링
+    real_messages = [msg for msg in messages if not msg.get('bot_id') and not msg.get('subtype')]
+    
+    if len(real_messages) < 2:
+        return None, f"📅 **채널 대화 요약**\n\n최근 {hours_back}시간 동안의 대화가 너무 적어서 요약하기 어렵습니다."
+    
+    return real_messages, None
+
+def channel_summary_prompt(hours_back, formatted_text, count):
+    """단기 채널 요약 프롬프트"""
+    return f"""다음은 Slack 채널에서 최근 {hours_back}시간 동안의 대화 내용입니다. 주요 내용을 한국어로 요약해주세요:
 
 {formatted_text}
 
@@ -392,30 +719,210 @@ def get_channel_summary(channel_id, hours_back=24):
 - 💡 기타 특이사항
 - 5-10줄로 구조화해서 정리
 
-총 메시지 수: {len(real_messages)}개"""
-        
-        response = model.generate_content(prompt)
-        
-        if response.text:
-            return f"""📅 **채널 대화 요약** (최근 {hours_back}시간)
+총 메시지 수: {count}개"""
+
+def channel_summary_result(hours_back, response_text, count, packed, complete=True):
+    """단기 채널 요약 응답 메시지 (complete=False면 기간 중 최근 메시지만 가져왔다고 알림)"""
+    truncated = "" if complete else "\n⚠️ 메시지가 많아서 기간 중 최근 메시지까지만 가져왔습니다"
+    return f"""📅 **채널 대화 요약** (최근 {hours_back}시간)
 
-{response.text.strip()}
+{response_text.strip()}
 
 ───────────────────
-📊 **수집 정보**: {len(real_messages)}개 메시지 분석 완료"""
+📊 **수집 정보**: {count}개 메시지 분석 완료 (프롬프트: {packed.describe()}){truncated}"""
+
+def member_channels_steps(user_id=None):
+    """채널 목록 [(채널 ID, 비공개 여부)] (users.conversations 페이지네이션, 보관된 채널 제외)
+
+    user_id가 없으면 봇이 들어가 있는 채널, 있으면 그 사용자가 들어가 있는 채널
+    """
+    params = {
+        'types': 'public_channel,private_channel',
+        'exclude_archived': 'true',
+        'limit': 200
+    }
+    if user_id:
+        params['user'] = user_id
+    
+    channels, _, _, _ = yield from paginate(lambda page_params: slack_get('users.conversations', page_params), params, None, key='channels')
+    return [(channel['id'], channel.get('is_private', False)) for channel in channels]
+
+def readable_channels_steps(requester=None, destination=None):
+    """봇이 들어가 있고, 요약을 destination 채널에 올려도 되는 채널 ID 목록
+
+    공개 채널은 모두 포함한다. 비공개 채널은 결과를 보는 사람이 모두 그 채널 멤버일 때만 포함한다:
+    - destination이 그 비공개 채널 자신이면 포함 (요청한 사람도 그 채널에서 요청했으므로 멤버)
+    - destination이 요청한 사람과 봇의 DM이면 요청한 사람이 멤버인 비공개 채널 모두 포함
+    요청한 사람이 없으면(API 요청) 공개 채널만.
+    """
+    bot_channels = yield from member_channels_steps()
+    private_channels = {channel_id for channel_id, is_private in bot_channels if is_private}
+    allowed_private = set()
+    if requester and private_channels:
+        if destination and destination.startswith('D'):
+            allowed_private = {channel_id for channel_id, _ in (yield from member_channels_steps(requester))}
+        elif destination in private_channels:
+            allowed_private = {destination}
+    return [channel_id for channel_id, is_private in bot_channels if not is_private or channel_id in allowed_private]
+
+def channel_window_steps(channel_id, oldest_timestamp):
+    """한 채널의 oldest 이후 메시지 (최신순). 실패하면 (None, 오류 내용)"""
+    try:
+        messages, _ = yield from history_fetcher.fetch_steps(channel_id, oldest_timestamp)
+        return messages, None
+    except Exception as e:
+        log.warning("채널 메시지 가져오기 오류", channel=channel_id, error=e)
+        return None, str(e)
+
+def multi_channel_summary(channel_ids=None, hours_back=24, requester=None, destination=None, progress=None):
+    """여러 채널 요약 단계 (같은 요청이 실행 중이면 그 결과를 같이 받음)
+
+    channel_ids가 없으면 destination에 올려도 되는 모든 채널 (readable_channels_steps)
+    """
+    key = ('multi_channel', requester, destination, tuple(channel_ids) if channel_ids else 'all', hours_back)
+    return shared(key, multi_channel_summary_steps, channel_ids, hours_back, requester, destination, progress)
+
+def multi_channel_summary_steps(channel_ids=None, hours_back=24, requester=None, destination=None, progress=None):
+    """여러 채널의 최근 대화를 한 번에 요약해서 destination 채널에 올릴 결과 만들기
+
+    destination에 올리면 안 되는 채널(다른 비공개 채널, 봇이 없는 채널)은 빼고 알려준다.
+    채널별 히스토리는 동시에 가져오고(호출 간격은 SlackClient의 tier별 토큰 버킷이 공유),
+    작성자 이름은 전체 채널에서 한 번씩만 조회하고, 채널별 대화는 토큰 예산이 허용하는 만큼
+    한 프롬프트에 묶어서 LLM 호출 수를 최소로 한다.
+    """
+    try:
+        allowed = yield from readable_channels_steps(requester, destination)
+        denied = []
+        if channel_ids:
+            allowed_set = set(allowed)
+            channel_ids = list(dict.fromkeys(channel_ids))
+            denied = [channel_id for channel_id in channel_ids if channel_id not in allowed_set]
+            channel_ids = [channel_id for channel_id in channel_ids if channel_id in allowed_set]
         else:
-            return "📅 채널 요약 생성에 실패했습니다."
-            
+            channel_ids = allowed
+        skipped = channel_ids[MULTI_CHANNEL_MAX:]
+        channel_ids = channel_ids[:MULTI_CHANNEL_MAX]
+        
+        if not channel_ids:
+            if denied:
+                return format_multi_channel_summary(hours_back, channel_ids, [], 0, 0, [], [], skipped, denied)
+            return "🗂️ **여러 채널 요약**\n\n요약할 채널이 없습니다. 봇을 채널에 초대하거나 `#채널`을 함께 적어주세요."
+        
+        log.info("여러 채널 메시지 수집", channels=len(channel_ids), hours=hours_back)
+        oldest_timestamp = (datetime.now() - timedelta(hours=hours_back)).timestamp()
+        fetched = yield Gather([Steps(channel_window_steps, channel_id, oldest_timestamp) for channel_id in channel_ids],
+                               MULTI_CHANNEL_FETCH_WORKERS)
+        
+        active, quiet, failed = [], [], []
+        for channel_id, (messages, error) in zip(channel_ids, fetched):
+            if error:
+                failed.append((channel_id, error))
+                continue
+            real_messages, _ = filter_channel_messages(messages, hours_back)
+            if real_messages:
+                active.append((channel_id, real_messages))
+            else:
+                quiet.append(channel_id)
+        
+        if not active:
+            return format_multi_channel_summary(hours_back, channel_ids, [], 0, 0, quiet, failed, skipped, denied)
+        
+        total = sum(len(messages) for _, messages in active)
+        latest_ts = max(float(msg.get('ts', 0)) for _, messages in active for msg in messages)
+        cache_key = fingerprint_key('multi_channel', (tuple(channel_ids), tuple(denied)), hours_back, latest_ts, total)
+        cached = yield blocking(find_summary, cache_key)
+        if cached:
+            return cached
+        
+        # 작성자 이름은 모든 채널을 합쳐 사용자마다 한 번만 조회
+        names = yield user_names({msg['user'] for _, messages in active for msg in messages if msg.get('user')})
+        
+        # 채널마다 공평한 몫(최소 MULTI_CHANNEL_MIN_TOKENS)으로 포맷팅한 뒤, 예산 안에 들어가는 만큼 한 묶음으로
+        channel_budget = min(PROMPT_TOKEN_BUDGET, max(MULTI_CHANNEL_MIN_TOKENS, PROMPT_TOKEN_BUDGET // len(active)))
+        groups = []
+        group_tokens = 0
+        for channel_id, messages in active:
+            formatted_text, packed = format_messages_for_summary(messages, token_budget=channel_budget, name_of=names.get)
+            section = (channel_id, formatted_text, len(messages))
+            if groups and group_tokens + packed.tokens <= PROMPT_TOKEN_BUDGET:
+                groups[-1].append(section)
+                group_tokens += packed.tokens
+            else:
+                groups.append([section])
+                group_tokens = packed.tokens
+        
+        header = f"🗂️ **여러 채널 요약** (최근 {hours_back}시간, {len(channel_ids)}개 채널)"
+        if len(groups) == 1:
+            responses = [(yield generate(multi_channel_prompt(hours_back, groups[0]), progress, header))]
+        else:
+            log.info("여러 채널 요약을 나눠서 실행", channels=len(active), calls=len(groups))
+            if progress:
+                yield show_progress(progress, f"{header}\n\n🧩 {len(active)}개 채널을 {len(groups)}번에 나눠 요약 중...")
+            responses = yield Gather([generate(multi_channel_prompt(hours_back, group)) for group in groups], BUCKET_CONCURRENCY)
+        
+        if not all(responses):
+            return "🗂️ 여러 채널 요약 생성에 실패했습니다."
+        
+        result = format_multi_channel_summary(hours_back, channel_ids, [text.strip() for text in responses],
+                                              total, len(groups), quiet, failed, skipped, denied)
+        yield blocking(store_summary, cache_key, result)
+        return result
+        
     except Exception as e:
-        print(f"채널 요약 오류: {e}")
-        return f"📅 채널 요약 중 오류가 발생했습니다: {str(e)}"
+        log.error("여러 채널 요약 오류", channels=channel_ids, hours=hours_back, error=e)
+        return f"🗂️ 여러 채널 요약 중 오류가 발생했습니다: {str(e)}"
 
-def get_thread_summary(channel_id, thread_ts):
-    """스레드 대화를 요약"""
+def multi_channel_prompt(hours_back, sections):
+    """채널 여러 개를 한 번에 요약하는 프롬프트 (sections: [(채널 ID, 포맷팅된 대화, 메시지 수)])"""
+    channel_text = '\n\n'.join(
+        f"### <#{channel_id}> (메시지 {count}개)\n{formatted_text}"
+        for channel_id, formatted_text, count in sections
+    )
+    return f"""다음은 Slack 채널 {len(sections)}개의 최근 {hours_back}시간 동안의 대화 내용입니다. 채널마다 주요 내용을 한국어로 요약해주세요:
+
+{channel_text}
+
+요약 형식:
+- 채널마다 위와 같은 `### <#채널ID>` 제목을 그대로 쓰고 그 아래에 정리
+- 📋 핵심 대화 내용과 🔍 결정사항, ✅ 액션 아이템을 채널당 2-4줄로
+- 채널 순서는 위와 같게
+- 여러 채널에 걸친 공통 주제가 있으면 마지막에 `### 🔗 공통 주제` 아래 1-3줄"""
+
+def format_multi_channel_summary(hours_back, channel_ids, responses, total, calls, quiet, failed, skipped, denied=()):
+    """여러 채널 요약 응답 메시지"""
+    body = '\n\n'.join(responses) if responses else "요약할 만한 대화가 있는 채널이 없습니다."
+    lines = [f"📊 **수집 정보**: {len(channel_ids)}개 채널, {total}개 메시지 분석 (LLM 호출 {calls}번)"]
+    if quiet:
+        lines.append(f"💤 대화가 적은 채널: {', '.join(f'<#{channel_id}>' for channel_id in quiet)}")
+    if failed:
+        lines.append(f"⚠️ 가져오지 못한 채널: {', '.join(f'<#{channel_id}> ({error})' for channel_id, error in failed)}")
+    if denied:
+        lines.append(f"🔒 봇이 없거나 이 채널에 올릴 수 없는 채널이라 뺐습니다: {', '.join(f'<#{channel_id}>' for channel_id in denied)} "
+                     "(다른 비공개 채널은 봇과의 DM에서 요청해주세요)")
+    if skipped:
+        lines.append(f"⚠️ 한 번에 최대 {MULTI_CHANNEL_MAX}개 채널까지 요약해서 {len(skipped)}개 채널은 빠졌습니다")
+    info = '\n'.join(lines)
+    return f"""🗂️ **여러 채널 요약** (최근 {hours_back}시간)
+
+{body}
+
+───────────────────
+{info}"""
+
+def thread_summary(channel_id, thread_ts, progress=None):
+    """스레드 요약 단계 (같은 요청이 실행 중이면 그 결과를 같이 받음)"""
+    return shared(('thread', channel_id, thread_ts), thread_summary_steps, channel_id, thread_ts, progress)
+
+def thread_summary_steps(channel_id, thread_ts, progress=None):
+    """스레드 대화를 요약 (이전 요약이 있으면 새 답글만 반영해서 갱신)"""
     try:
-        print(f"스레드 {thread_ts} 메시지 수집 중...")
+        previous = yield blocking(message_store.get_thread_summary, channel_id, thread_ts)
+        if previous:
+            return (yield from thread_update_steps(channel_id, thread_ts, previous, progress))
         
-        messages = get_thread_messages(channel_id, thread_ts)
+        log.info("스레드 메시지 수집", channel=channel_id, thread_ts=thread_ts)
+        
+        messages, complete = yield from thread_messages_steps(channel_id, thread_ts)
         
         if not messages:
             return "🧵 **스레드 요약**\n\n스레드 메시지를 가져올 수 없습니다."
@@ -423,15 +930,50 @@ def get_thread_summary(channel_id, thread_ts):
         if len(messages) < 2:
             return "🧵 **스레드 요약**\n\n스레드에 메시지가 너무 적어서 요약하기 어렵습니다."
         
-        formatted_text = format_messages_for_summary(messages, include_time=False)
-        
-        # Gemini로 요약
-        import google.generativeai as genai
+        formatted_text, packed = yield from format_steps(messages, include_time=False)
         
-        genai.configure(api_key=os.environ.get('GOOGLE_API_KEY'))
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        response_text = yield generate(thread_summary_prompt(formatted_text, len(messages)), progress, "🧵 **스레드 요약**")
         
-        prompt = f"""다음은 Slack 스레드의 대화 내용입니다. 주요 내용을 한국어로 요약해주세요:
+        if response_text:
+            summary = response_text.strip()
+            yield blocking(message_store.save_thread_summary, channel_id, thread_ts, messages[0]['ts'], len(messages), summary, time.time())
+            return format_thread_summary(summary, f"{len(messages)}개 메시지 분석 완료 (프롬프트: {packed.describe()})", complete)
+        else:
+            return "🧵 스레드 요약 생성에 실패했습니다."
+            
+    except Exception as e:
+        log.error("스레드 요약 오류", channel=channel_id, thread_ts=thread_ts, error=e)
+        return f"🧵 스레드 요약 중 오류가 발생했습니다: {str(e)}"
+
+def thread_update_steps(channel_id, thread_ts, previous, progress=None):
+    """이전 요약 + 그 이후 새 답글만으로 스레드 요약 갱신"""
+    last_reply_ts, message_count, previous_summary = previous
+    log.info("스레드 새 답글 수집", channel=channel_id, thread_ts=thread_ts, since=last_reply_ts)
+    
+    messages, complete = yield from thread_messages_steps(channel_id, thread_ts, oldest=last_reply_ts)
+    # 스레드 시작 메시지는 항상 같이 오므로 이미 반영한 메시지는 제외
+    new_messages = [msg for msg in messages if float(msg['ts']) > float(last_reply_ts)]
+    
+    if not new_messages:
+        log.info("새 답글 없음, 이전 스레드 요약 사용", channel=channel_id, thread_ts=thread_ts)
+        return format_thread_summary(previous_summary, f"{message_count}개 메시지 분석 완료 (새 답글 없음)", complete)
+    
+    formatted_text, packed = yield from format_steps(new_messages, include_time=False)
+    
+    response_text = yield generate(thread_update_prompt(previous_summary, formatted_text, message_count, len(new_messages)),
+                                   progress, "🧵 **스레드 요약**")
+    
+    if not response_text:
+        return "🧵 스레드 요약 생성에 실패했습니다."
+    
+    summary = response_text.strip()
+    total = message_count + len(new_messages)
+    yield blocking(message_store.save_thread_summary, channel_id, thread_ts, new_messages[0]['ts'], total, summary, time.time())
+    return format_thread_summary(summary, f"{total}개 메시지 분석 완료 (새 답글 {len(new_messages)}개 반영, 프롬프트: {packed.describe()})", complete)
+
+def thread_summary_prompt(formatted_text, count):
+    """스레드 요약 프롬프트"""
+    return f"""다음은 Slack 스레드의 대화 내용입니다. 주요 내용을 한국어로 요약해주세요:
 
 {formatted_text}
 
@@ -442,39 +984,71 @@ def get_thread_summary(channel_id, thread_ts):
 - ❓ 미해결 질문이나 이슈
 - 3-7줄로 간결하게 정리
 
-총 메시지 수: {len(messages)}개"""
-        
-        response = model.generate_content(prompt)
-        
-        if response.text:
-            return f"""🧵 **스레드 요약**
+총 메시지 수: {count}개"""
+
+def thread_update_prompt(previous_summary, formatted_text, message_count, new_count):
+    """이전 요약 + 새 답글로 스레드 요약을 갱신하는 프롬프트"""
+    return f"""다음은 Slack 스레드의 기존 요약과, 그 이후에 추가된 새 답글입니다.
+새 답글 내용을 반영해서 스레드 요약을 한국어로 갱신해주세요:
+
+[기존 요약]
+{previous_summary}
+
+[새 답글]
+{formatted_text}
+
+요약 형식:
+- 🧵 스레드의 핵심 주제와 논의 내용
+- 👥 주요 참여자별 의견이나 기여
+- 🎯 결론이나 합의된 사항 (새 답글로 바뀐 내용이 있으면 반영)
+- ❓ 미해결 질문이나 이슈
+- 3-7줄로 간결하게 정리
+
+총 메시지 수: {message_count + new_count}개 (새 답글 {new_count}개)"""
 
-{response.text.strip()}
+def format_thread_summary(summary, info, complete):
+    """스레드 요약 응답 메시지"""
+    result = f"""🧵 **스레드 요약**
+
+{summary}
 
 ───────────────────
-📊 **스레드 정보**: {len(messages)}개 메시지 분석 완료"""
-        else:
-            return "🧵 스레드 요약 생성에 실패했습니다."
-            
-    except Exception as e:
-        print(f"스레드 요약 오류: {e}")
-        return f"🧵 스레드 요약 중 오류가 발생했습니다: {str(e)}"
+📊 **스레드 정보**: {info}"""
+    if not complete:
+        result += "\n⚠️ 답글을 끝까지 가져오지 못해 일부만 반영했습니다 (다음 요약 때 이어서 반영)"
+    return result
 
-def get_gemini_summary(text):
+def gemini_summary_steps(text, progress=None):
     """기존 텍스트 요약 기능"""
     try:
-        import google.generativeai as genai
+        clean_text = clean_summary_text(text)
         
-        genai.configure(api_key=os.environ.get('GOOGLE_API_KEY'))
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        if len(clean_text) < 10:
+            return TEXT_SUMMARY_USAGE
         
-        clean_text = text.replace('<@U092S5G2P7V>', '').strip()
+        cache_key = text_cache_key(clean_text)
+        cached = summary_cache.get(cache_key)
+        if cached:
+            log.info("요약 캐시 사용", key='text')
+            return cached
         
-        if '요약해줘' in clean_text:
-            clean_text = clean_text.replace('요약해줘', '').strip()
+        prompt, summary_type = text_summary_prompt(clean_text)
+        response_text = yield generate(prompt, progress, "📝 **AI 요약**")
         
-        if len(clean_text) < 10:
-            return """📝 **사용법 안내**
+        if response_text:
+            result = text_summary_result(summary_type, response_text, clean_text)
+            summary_cache.set(cache_key, result)
+            return result
+        else:
+            return "📝 요약 생성에 실패했습니다."
+            
+    except ImportError:
+        return "📝 Gemini 패키지가 설치되지 않았습니다."
+    except Exception as e:
+        log.error("텍스트 요약 오류", error=e)
+        return f"📝 요약 중 오류가 발생했습니다: {str(e)}"
+
+TEXT_SUMMARY_USAGE = """📝 **사용법 안내**
 
 **기본 요약:**
 • `@GPT Online [메시지 내용] 요약해줘`
@@ -490,14 +1064,28 @@ def get_gemini_summary(text):
 
 **스레드 요약:**
 • 스레드에서 `@GPT Online 이 스레드 요약해줘`"""
-        
-        # 메시지 형태 감지
-        is_conversation = '[' in clean_text and ']' in clean_text
-        is_long_message = len(clean_text) > 500
-        has_multiple_lines = '\n' in clean_text or len(clean_text.split('.')) > 5
-        
-        if is_conversation:
-            prompt = f"""다음은 대화 내용입니다. 주요 내용을 한국어로 요약해주세요:
+
+def clean_summary_text(text):
+    """멘션과 '요약해줘'를 뺀 요약할 본문"""
+    clean_text = text.replace('<@U092S5G2P7V>', '').strip()
+    
+    if '요약해줘' in clean_text:
+        clean_text = clean_text.replace('요약해줘', '').strip()
+    return clean_text
+
+def text_cache_key(clean_text):
+    """텍스트 요약 캐시 키 (본문 해시)"""
+    return ('text', None, None, hashlib.sha1(clean_text.encode('utf-8')).hexdigest())
+
+def text_summary_prompt(clean_text):
+    """메시지 형태(대화 / 긴 글 / 여러 줄)에 맞는 (프롬프트, 요약 종류) 반환"""
+    # 메시지 형태 감지
+    is_conversation = '[' in clean_text and ']' in clean_text
+    is_long_message = len(clean_text) > 500
+    has_multiple_lines = '\n' in clean_text or len(clean_text.split('.')) > 5
+    
+    if is_conversation:
+        prompt = f"""다음은 대화 내용입니다. 주요 내용을 한국어로 요약해주세요:
 
 {clean_text}
 
@@ -506,9 +1094,9 @@ def get_gemini_summary(text):
 - 🔍 핵심 결정사항이나 논의점
 - ✅ 액션 아이템이 있다면 포함
 - 3-7줄로 간결하게 정리"""
-        
-        elif is_long_message or has_multiple_lines:
-            prompt = f"""다음 내용의 핵심을 한국어로 요약해주세요:
+    
+    elif is_long_message or has_multiple_lines:
+        prompt = f"""다음 내용의 핵심을 한국어로 요약해주세요:
 
 {clean_text}
 
@@ -517,9 +1105,9 @@ def get_gemini_summary(text):
 - 🎯 중요한 날짜, 숫자, 결정사항 포함
 - 📊 순서나 우선순위가 있다면 반영
 - 5-8줄로 구조화해서 정리"""
-        
-        else:
-            prompt = f"""다음 내용을 한국어로 간단히 요약해주세요:
+    
+    else:
+        prompt = f"""다음 내용을 한국어로 간단히 요약해주세요:
 
 {clean_text}
 
@@ -527,33 +1115,26 @@ def get_gemini_summary(text):
 - 📝 3-5줄로 핵심 내용 정리
 - 🔑 주요 키워드와 핵심 메시지 포함
 - 💡 명확하고 이해하기 쉽게 작성"""
-        
-        response = model.generate_content(prompt)
-        
-        if response.text:
-            if is_conversation:
-                summary_type = "💬 대화 요약"
-            elif is_long_message:
-                summary_type = "📄 긴 메시지 요약"
-            elif has_multiple_lines:
-                summary_type = "📋 구조화된 요약"
-            else:
-                summary_type = "📝 AI 요약"
-            
-            return f"""{summary_type} **결과**
+    
+    if is_conversation:
+        summary_type = "💬 대화 요약"
+    elif is_long_message:
+        summary_type = "📄 긴 메시지 요약"
+    elif has_multiple_lines:
+        summary_type = "📋 구조화된 요약"
+    else:
+        summary_type = "📝 AI 요약"
+    
+    return prompt, summary_type
+
+def text_summary_result(summary_type, response_text, clean_text):
+    """텍스트 요약 응답 메시지"""
+    return f"""{summary_type} **결과**
 
-{response.text.strip()}
+{response_text.strip()}
 
 ───────────────────
 📊 **원본 길이**: {len(clean_text)}자 → 요약 완료"""
-        else:
-            return "📝 요약 생성에 실패했습니다."
-            
-    except ImportError:
-        return "📝 Gemini 패키지가 설치되지 않았습니다."
-    except Exception as e:
-        print(f"Gemini API 오류: {e}")
-        return f"📝 요약 중 오류가 발생했습니다: {str(e)}"
 
 @app.route('/')
 def home():
@@ -581,6 +1162,12 @@ def home():
     <h2>🧵 스레드 요약</h2>
     <p>스레드에서: <strong>@GPT Online 이 스레드 요약해줘</strong></p>
     
+    <h2>🗂️ 여러 채널 한 번에 요약</h2>
+    <ul>
+        <li>@GPT Online #채널1 #채널2 채널 대화 요약해줘</li>
+        <li>@GPT Online 모든 채널 대화 요약해줘</li>
+    </ul>
+    
     <h2>✨ 지원하는 요약 타입</h2>
     <ul>
         <li>💬 대화 요약: [이름] 형태의 대화 내용</li>
@@ -594,13 +1181,311 @@ def home():
     </ul>
     """
 
+HELP_MESSAGE = """📚 **GPT Online 고급 요약 봇 사용법**
+
+**📝 기본 텍스트 요약:**
+`@GPT Online [요약할 내용] 요약해줘`
+
+**📅 단기 채널 대화 요약:**
+• `@GPT Online 오늘 채널 대화 요약해줘`
+• `@GPT Online 최근 12시간 채널 메시지 요약해줘`
+• `@GPT Online 어제부터 채널 대화 요약해줘`
+
+**📊 장기 채널 분석 (NEW!):**
+• `@GPT Online 최근 7일간 채널 분석해줘`
+• `@GPT Online 최근 30일간 채널 분석해줘`
+• `@GPT Online 한달간 채널 분석해줘`
+• `@GPT Online 2주간 채널 분석해줘`
+• 기간은 `N시간` / `N일` / `N주` / `N달`로 자유롭게 지정할 수 있어요
+
+**🧵 스레드 요약:**
+• 스레드에서: `@GPT Online 이 스레드 요약해줘`
+
+**🗂️ 여러 채널 한 번에 요약:**
+• `@GPT Online #채널1 #채널2 채널 대화 요약해줘`
+• `@GPT Online 모든 채널 대화 요약해줘` (봇이 들어가 있는 공개 채널 + 요청한 비공개 채널 자신)
+• 내가 멤버인 다른 비공개 채널까지 요약하려면 봇과의 DM에서 요청해주세요
+
+**✨ 특별 기능:**
+• 📊 사용자 활동 통계 포함
+• 📈 기간별 트렌드 분석
+• 🏆 활성 사용자 TOP 5
+• 📅 일별/주별 메시지 분포
+• 🔍 핵심 키워드 및 이슈 추출"""
+
+GREETING_MESSAGE = """안녕하세요! 🤖 **고급 요약 봇**입니다!
+
+**📝 주요 기능:**
+• 텍스트 요약: `@GPT Online [내용] 요약해줘`
+• 단기 채널 요약: `@GPT Online 오늘 채널 대화 요약해줘`
+• **장기 채널 분석**: `@GPT Online 최근 30일간 채널 분석해줘` 🆕
+• 스레드 요약: `@GPT Online 이 스레드 요약해줘`
+
+**💬 더 자세한 사용법:**
+`@GPT Online 도움말`"""
+
+def with_notice(summary, notice):
+    """요약 앞에 안내 문구 붙이기 (기간을 줄였을 때 등)"""
+    return f"{notice}\n\n{summary}" if notice else summary
+
+def run_summary(channel_id, summarize, notice=None):
+    """요약 실행 후 결과 전송
+
+    스트리밍 모드에서는 자리표시 메시지를 바로 올리고 생성 중인 내용으로 계속 갱신한다.
+    summarize(progress) -> 최종 요약 텍스트, notice는 최종 요약 앞에 붙일 안내 문구
+    """
+    if not STREAM_SUMMARIES:
+        send_message_to_slack(channel_id, with_notice(summarize(None), notice))
+        return
+    
+    message = ProgressiveMessage(
+        channel_id,
+        post_message_to_slack,
+        update_slack_message,
+        min_interval=STREAM_UPDATE_INTERVAL
+    )
+    message.start("⏳ 요약을 준비하고 있어요...")
+    summary = summarize(message.update)
+    message.finish(with_notice(summary, notice))
+
+@timed('handle_mention')
+def handle_mention(channel_id, user_message, thread_ts=None, intent=None, key=None, user_id=None):
+    """봇 멘션 요청 처리 (백그라운드 워커에서 실행, 끝나면 입장 제어 키 해제)"""
+    try:
+        route_mention(channel_id, user_message, thread_ts, intent or parse_intent(user_message, in_thread=bool(thread_ts)), user_id)
+    finally:
+        admission.release(key)
+
+def route_mention(channel_id, user_message, thread_ts, intent, user_id=None):
+    """파싱한 명령에 맞는 요약 실행 (user_id: 요청한 사람, 여러 채널 요약에서 읽을 수 있는 채널만 고를 때 사용)"""
+    summarize = mention_summary(channel_id, user_message, thread_ts, intent, user_id)
+    if summarize:
+        run_summary(channel_id, lambda progress: summarize(progress).run(), clamp_notice(intent))
+    else:
+        send_message_to_slack(channel_id, mention_reply(intent))
+
+def mention_summary(channel_id, user_message, thread_ts, intent, user_id=None, mode='sync'):
+    """명령에 맞는 요약 단계를 만드는 함수 (progress → Call, 동기 / asyncio 경로 공용). 요약 요청이 아니면 None"""
+    # 스레드 요약
+    if intent.kind == 'thread':
+        log.info("요약 요청", kind=intent.kind, channel=channel_id, thread_ts=thread_ts, mode=mode)
+        return lambda progress: thread_summary(channel_id, thread_ts, progress)
+
+    # 장기 채널 분석 (N일 / N주 / N달, 기본 30일)
+    if intent.kind == 'long_term':
+        log.info("요약 요청", kind=intent.kind, channel=channel_id, days=intent.days, mode=mode)
+        return lambda progress: long_term_summary(channel_id, intent.days, progress)
+
+    # 단기 채널 대화 요약 (N시간 / 오늘 / 어제, 기본 24시간)
+    if intent.kind == 'short_term':
+        log.info("요약 요청", kind=intent.kind, channel=channel_id, hours=intent.hours, mode=mode)
+        return lambda progress: channel_summary(channel_id, intent.hours, progress)
+
+    # 여러 채널 요약 (링크한 채널들 또는 요청한 채널에 올려도 되는 모든 채널, 결과는 요청한 채널에)
+    if intent.kind == 'multi_channel':
+        log.info("요약 요청", kind=intent.kind, channel=channel_id, channels=intent.channels or 'all', hours=intent.hours, mode=mode)
+        return lambda progress: multi_channel_summary(intent.channels, intent.hours, user_id, channel_id, progress)
+
+    # 기존 텍스트 요약
+    if intent.kind == 'text':
+        log.info("요약 요청", kind=intent.kind, channel=channel_id, length=len(user_message), mode=mode)
+        return lambda progress: Steps(gemini_summary_steps, user_message, progress)
+    
+    return None
+
+def mention_reply(intent):
+    """요약이 아닌 멘션에 보낼 안내 (도움말 / 인사)"""
+    return HELP_MESSAGE if intent.kind == 'help' else GREETING_MESSAGE
+
+def submit_mention(channel_id, user_message, thread_ts, intent, key, user_id=None):
+    """멘션 처리 작업 등록 (ASYNC_SUMMARIES면 이벤트 루프, 아니면 워커 스레드). 가득 찼으면 False"""
+    if ASYNC_SUMMARIES:
+        return async_runner.submit(handle_mention_async, channel_id, user_message, thread_ts, intent, key, user_id)
+    return job_queue.submit(handle_mention, channel_id, user_message, thread_ts, intent, key, user_id)
+
+def submit_notice(channel_id, text):
+    """안내 메시지 전송을 백그라운드 작업으로 등록 (이벤트 응답 경로에서는 Slack을 호출하지 않음)
+
+    작업 큐가 가득 찼으면 안내 메시지는 보내지 않고 버린다.
+    """
+    if ASYNC_SUMMARIES:
+        submitted = async_runner.submit(send_message_to_slack_async, channel_id, text)
+    else:
+        submitted = job_queue.submit(send_message_to_slack, channel_id, text)
+    if not submitted:
+        log.warning("안내 메시지 전송 생략 (작업 큐 가득 참)", channel=channel_id)
+    return submitted
+
+# ── asyncio 실행 경로 ──
+# 요약 / 메시지 전송은 동기 경로와 같은 단계 생성기를 run_steps_async로 실행한다.
+
+@timed('handle_mention')
+async def handle_mention_async(channel_id, user_message, thread_ts=None, intent=None, key=None, user_id=None):
+    """봇 멘션 요청 처리 (이벤트 루프에서 실행, 끝나면 입장 제어 키 해제)"""
+    try:
+        await route_mention_async(channel_id, user_message, thread_ts, intent or parse_intent(user_message, in_thread=bool(thread_ts)), user_id)
+    finally:
+        admission.release(key)
+
+async def route_mention_async(channel_id, user_message, thread_ts, intent, user_id=None):
+    """route_mention의 asyncio 버전"""
+    summarize = mention_summary(channel_id, user_message, thread_ts, intent, user_id, mode='async')
+    if summarize:
+        await run_summary_async(channel_id, lambda progress: summarize(progress).arun(), clamp_notice(intent))
+    else:
+        await send_message_to_slack_async(channel_id, mention_reply(intent))
+
+async def run_summary_async(channel_id, summarize, notice=None):
+    """run_summary의 asyncio 버전 (summarize(progress)는 코루틴)"""
+    if not STREAM_SUMMARIES:
+        await send_message_to_slack_async(channel_id, with_notice(await summarize(None), notice))
+        return
+    
+    message = AsyncProgressiveMessage(
+        channel_id,
+        post_message_to_slack_async,
+        update_slack_message_async,
+        min_interval=STREAM_UPDATE_INTERVAL
+    )
+    await message.start("⏳ 요약을 준비하고 있어요...")
+    summary = await summarize(message.update)
+    await message.finish(with_notice(summary, notice))
+
+def progress_writer_async(progress, header):
+    """progress_writer의 asyncio 버전"""
+    if not progress:
+        return None
+    
+    async def write(text):
+        await progress(f"{header}\n\n{text.strip()} ✍️")
+    return write
+
+def admission_message(reason, retry_after):
+    """입장 제한으로 거절한 요청에 보낼 안내 메시지"""
+    if reason == 'running':
+        return "⏳ 같은 요청을 이미 처리하고 있어요. 결과가 나오면 이 채널에 올려드릴게요!"
+    if reason == 'user':
+        return f"🙏 요청이 조금 많아요. {retry_after}초 뒤에 다시 요청해주세요."
+    if reason == 'channel':
+        return f"🙏 이 채널에서 요청이 많아요. {retry_after}초 뒤에 다시 요청해주세요."
+    return f"⏳ 지금은 요청이 몰려 있어요. {retry_after}초 뒤에 다시 요청해주세요."
+
+@app.route('/stats')
+def stats():
+    return jsonify({
+        'job_queue': job_queue.stats(),
+        'async_runner': async_runner.stats(),
+        'async_singleflight': async_summary_flight.stats(),
+        'admission': admission.stats(),
+        'singleflight': summary_flight.stats(),
+        'message_store': message_store.stats(),
+        'slack_api': slack.stats(),
+        'history_fetcher': history_fetcher.stats(),
+        'llm': llm.stats(),
+        'user_directory': user_directory.stats(),
+        'dedup_store': dedup_store.stats(),
+        'slack_verify': slack_verifier.stats(),
+        'scheduler': scheduler.stats(),
+        'caches': {
+            'user_cache': user_cache.stats(),
+            'processed_messages': processed_messages.stats(),
+            'summary_cache': summary_cache.stats(),
+            'bucket_summary_cache': bucket_summary_cache.stats()
+        }
+    })
+
+# 기존 stats()를 Prometheus 지표로도 노출 (수집 시점에 읽음)
+registry.callback('flask_bot_job_queue_depth', '대기 중인 요약 작업 수', lambda: job_queue.stats()['depth'])
+registry.callback('flask_bot_job_queue_in_flight', '처리 중인 요약 작업 수', lambda: job_queue.stats()['in_flight'])
+registry.callback('flask_bot_async_in_flight', '이벤트 루프에서 처리 중인 요약 작업 수', lambda: async_runner.stats()['in_flight'])
+registry.callback('flask_bot_admission_global_level', '전체 입장 버킷 잔량', lambda: admission.stats()['global_level'])
+registry.callback(
+    'flask_bot_admission_rejected_total', '입장 제한으로 거절한 요청 수',
+    lambda: [({'reason': reason}, count) for reason, count in admission.stats()['rejected'].items()], kind='counter'
+)
+registry.callback(
+    'flask_bot_signature_rejected_total', '서명 검증에 실패한 요청 수',
+    lambda: [({'reason': reason}, count) for reason, count in slack_verifier.stats()['rejected'].items()], kind='counter'
+)
+registry.callback(
+    'flask_bot_singleflight_total', '같은 요청 합치기 결과 (executed: 실제 실행, coalesced: 합류)',
+    lambda: [({'result': result}, summary_flight.stats()[result]) for result in ('executed', 'coalesced')], kind='counter'
+)
+registry.callback(
+    'flask_bot_cache_hit_ratio', '캐시 적중률',
+    lambda: [({'cache': cache.name}, cache.stats()['hit_rate']) for cache in (summary_cache, bucket_summary_cache, user_cache)]
+)
+
+@app.route('/digest', methods=['POST'])
+@timed('digest')
+def digest():
+    """여러 채널 요약 API (Authorization: Bearer DIGEST_API_TOKEN, 토큰이 없으면 꺼져 있음)
+
+    {"channels": ["C1", "C2"] 또는 "all", "hours": 24, "post_to": "C3"}
+    요청한 Slack 사용자가 없으므로 봇이 들어가 있는 공개 채널만 요약한다.
+    요약은 멘션과 같이 입장 제어를 거쳐 백그라운드에서 실행하고 post_to 채널에 올린다 (바로 202).
+    """
+    if not DIGEST_API_TOKEN:
+        return jsonify({'ok': False, 'error': 'disabled'}), 404
+    
+    token = request.headers.get('Authorization', '').removeprefix('Bearer ')
+    if not hmac.compare_digest(token.encode(), DIGEST_API_TOKEN.encode()):
+        return jsonify({'ok': False, 'error': 'invalid_token'}), 401
+    
+    data = request.get_json(silent=True) or {}
+    channels = data.get('channels', 'all')
+    if channels == 'all':
+        channels = None
+    elif not (isinstance(channels, list) and channels and all(isinstance(channel, str) for channel in channels)):
+        return jsonify({'ok': False, 'error': 'invalid_channels'}), 400
+    try:
+        hours_back, requested = clamp(int(data.get('hours', DEFAULT_SHORT_TERM_HOURS)), MAX_SHORT_TERM_HOURS)
+    except (TypeError, ValueError):
+        return jsonify({'ok': False, 'error': 'invalid_hours'}), 400
+    
+    post_to = data.get('post_to')
+    if not isinstance(post_to, str) or not post_to:
+        return jsonify({'ok': False, 'error': 'post_to_required'}), 400
+    
+    intent = Intent('multi_channel', hours=hours_back, channels=channels, requested=requested)
+    key = request_key(intent, post_to)
+    rejected = admission.admit('api', post_to, request_cost(intent), key)
+    if rejected:
+        reason, retry_after = rejected
+        return jsonify({'ok': False, 'error': f'rate_limited:{reason}', 'retry_after': retry_after}), 429
+    if not submit_mention(post_to, '', None, intent, key):
+        admission.release(key)
+        return jsonify({'ok': False, 'error': 'queue_full'}), 503
+    return jsonify({'ok': True, 'queued': True, 'hours': hours_back}), 202
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus 수집용 지표 (단계별 소요 시간 히스토그램 + 주요 상태)"""
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/slack/events', methods=['GET', 'POST'])
+@timed('slack_events')
 def slack_events():
     if request.method == 'GET':
         return "Slack Events endpoint is working!"
     
     try:
-        data = request.get_json(force=True)
+        raw_body = request.get_data()
+        
+        # 서명이 맞지 않는 요청은 파싱/중복 확인 전에 바로 거절
+        rejected = slack_verifier.verify(request.headers, raw_body)
+        if rejected:
+            log.warning("서명 검증 실패", reason=rejected)
+            return 'invalid signature', 401
+        
+        # Slack 재시도는 JSON 파싱 전에 event_id로 바로 걸러냄
+        event_id = extract_event_id(raw_body)
+        retry_num = request.headers.get('X-Slack-Retry-Num')
+        if event_id and is_duplicate_event(f"event:{event_id}"):
+            log.info("중복 이벤트 무시", event_id=event_id, retry=retry_num or 0, retry_reason=request.headers.get('X-Slack-Retry-Reason', '-'))
+            return 'ok'
+        
+        data = json.loads(raw_body)
         
         # Challenge 처리
         if data and 'challenge' in data:
@@ -611,173 +1496,129 @@ def slack_events():
             event = data['event']
             event_type = event.get('type')
             
-            print(f"받은 이벤트 타입: {event_type}")
+            log.info("이벤트 수신", sample=True, type=event_type)
             
             # message 타입만 처리
             if event_type == 'message':
                 user_message = event.get('text', '')
                 channel_id = event.get('channel')
-                user_id = event.get('user')
                 timestamp = event.get('ts', '')
                 thread_ts = event.get('thread_ts')  # 스레드 정보
                 
-                print(f"메시지 처리: {user_message[:100]}..." if len(user_message) > 100 else f"메시지 처리: {user_message}")
+                log.info("메시지 처리", sample=True, channel=channel_id, length=len(user_message))
                 
                 # 봇 자신의 메시지 무시
                 if event.get('bot_id') or event.get('subtype') == 'bot_message':
-                    print("봇 메시지 무시")
+                    log.debug("봇 메시지 무시", channel=channel_id)
                     return 'ok'
                 
                 # 중복 메시지 확인
-                if is_duplicate_message(user_id, channel_id, user_message, timestamp):
-                    print("중복 메시지로 인한 무시")
+                if is_duplicate_message(channel_id, timestamp):
+                    log.info("중복 메시지 무시", sample=True, channel=channel_id, ts=timestamp)
                     return 'ok'
                 
                 # 봇 멘션 확인
                 if '<@U092S5G2P7V>' in user_message:
-                    print("봇 멘션 감지")
-                    
-                    if '요약해줘' in user_message or '분석해줘' in user_message:
-                        # 스레드 요약 확인
-                        if ('스레드' in user_message or '쓰레드' in user_message) and thread_ts:
-                            print("스레드 요약 요청")
-                            summary = get_thread_summary(channel_id, thread_ts)
-                            send_message_to_slack(channel_id, summary)
-                        
-                        # 장기 채널 분석 확인 (30일, 7일 등)
-                        elif '분석' in user_message or ('일간' in user_message) or ('한달' in user_message) or ('30일' in user_message):
-                            days_back = 30  # 기본값
-                            
-                            if '7일' in user_message or '일주일' in user_message:
-                                days_back = 7
-                            elif '14일' in user_message or '2주' in user_message:
-                                days_back = 14
-                            elif '21일' in user_message or '3주' in user_message:
-                                days_back = 21
-                            elif '30일' in user_message or '한달' in user_message:
-                                days_back = 30
-                            elif '60일' in user_message or '두달' in user_message:
-                                days_back = 60
-                            
-                            print(f"장기 채널 분석 요청: 최근 {days_back}일")
-                            summary = get_long_term_channel_summary(channel_id, days_back)
-                            send_message_to_slack(channel_id, summary)
-                        
-                        # 단기 채널 대화 요약 확인 (시간 단위)
-                        elif '채널' in user_message and ('대화' in user_message or '메시지' in user_message):
-                            # 시간 파싱
-                            hours_back = 24  # 기본값
-                            if '1시간' in user_message:
-                                hours_back = 1
-                            elif '3시간' in user_message:
-                                hours_back = 3
-                            elif '6시간' in user_message:
-                                hours_back = 6
-                            elif '12시간' in user_message:
-                                hours_back = 12
-                            elif '오늘' in user_message:
-                                hours_back = 24
-                            elif '어제' in user_message or '48시간' in user_message:
-                                hours_back = 48
-                            elif '3일' in user_message:
-                                hours_back = 72
-                            
-                            print(f"단기 채널 대화 요약 요청: 최근 {hours_back}시간")
-                            summary = get_channel_summary(channel_id, hours_back)
-                            send_message_to_slack(channel_id, summary)
-                        
-                        # 기존 텍스트 요약
-                        else:
-                            print("일반 텍스트 요약 요청")
-                            summary = get_gemini_summary(user_message)
-                            send_message_to_slack(channel_id, summary)
-                    
-                    # 도움말
-                    elif '도움말' in user_message or '사용법' in user_message:
-                        help_message = """📚 **GPT Online 고급 요약 봇 사용법**
-
-**📝 기본 텍스트 요약:**
-`@GPT Online [요약할 내용] 요약해줘`
-
-**📅 단기 채널 대화 요약:**
-• `@GPT Online 오늘 채널 대화 요약해줘`
-• `@GPT Online 최근 12시간 채널 메시지 요약해줘`
-• `@GPT Online 어제부터 채널 대화 요약해줘`
-
-**📊 장기 채널 분석 (NEW!):**
-• `@GPT Online 최근 7일간 채널 분석해줘`
-• `@GPT Online 최근 30일간 채널 분석해줘`
-• `@GPT Online 한달간 채널 분석해줘`
-• `@GPT Online 2주간 채널 분석해줘`
-
-**🧵 스레드 요약:**
-• 스레드에서: `@GPT Online 이 스레드 요약해줘`
-
-**✨ 특별 기능:**
-• 📊 사용자 활동 통계 포함
-• 📈 기간별 트렌드 분석
-• 🏆 활성 사용자 TOP 5
-• 📅 일별/주별 메시지 분포
-• 🔍 핵심 키워드 및 이슈 추출"""
-                        send_message_to_slack(channel_id, help_message)
+                    log.info("봇 멘션 감지", channel=channel_id, user=event.get('user'))
                     
-                    else:
-                        help_message = """안녕하세요! 🤖 **고급 요약 봇**입니다!
-
-**📝 주요 기능:**
-• 텍스트 요약: `@GPT Online [내용] 요약해줘`
-• 단기 채널 요약: `@GPT Online 오늘 채널 대화 요약해줘`
-• **장기 채널 분석**: `@GPT Online 최근 30일간 채널 분석해줘` 🆕
-• 스레드 요약: `@GPT Online 이 스레드 요약해줘`
-
-**💬 더 자세한 사용법:**
-`@GPT Online 도움말`"""
-                        send_message_to_slack(channel_id, help_message)
+                    # 요청 비용만큼 사용자/채널/전체 버킷에서 차감 (같은 요청이 진행 중이면 거절)
+                    intent = parse_intent(user_message, in_thread=bool(thread_ts))
+                    key = request_key(intent, channel_id, thread_ts)
+                    rejected = admission.admit(event.get('user'), channel_id, request_cost(intent), key)
+                    if rejected:
+                        reason, retry_after = rejected
+                        log.info("입장 제한", reason=reason, kind=intent.kind, channel=channel_id, retry_after=retry_after)
+                        submit_notice(channel_id, admission_message(reason, retry_after))
+                    elif not submit_mention(channel_id, user_message, thread_ts, intent, key, event.get('user')):
+                        admission.release(key)
+                        # 이벤트 응답 경로에서 Slack을 호출하지 않고, 중복 기록을 지운 뒤 503으로 응답해서
+                        # Slack이 나중에 다시 보내도록 함 (재시도가 중복으로 버려지지 않게)
+                        log.warning("작업 큐가 가득 차 요청 거절", kind=intent.kind, channel=channel_id, event_id=event_id)
+                        if event_id:
+                            forget_event(f"event:{event_id}")
+                        forget_event(message_dedup_key(channel_id, timestamp))
+                        return 'busy', 503
                 else:
-                    print("봇 멘션 없음")
+                    log.debug("봇 멘션 없음", channel=channel_id)
             
             elif event_type == 'app_mention':
-                print("app_mention 이벤트 무시 (중복 방지)")
+                log.debug("app_mention 이벤트 무시 (중복 방지)")
             
             else:
-                print(f"처리하지 않는 이벤트 타입: {event_type}")
+                log.debug("처리하지 않는 이벤트 타입", type=event_type)
         
         return 'ok'
         
     except Exception as e:
-        print(f"에러 발생: {e}")
+        log.error("이벤트 처리 오류", error=e)
         return 'error'
 
-def send_message_to_slack(channel, text):
+def post_message_steps(channel, text):
+    """메시지 전송 후 메시지 ts 반환 (실패 시 None)"""
     if not SLACK_TOKEN:
-        print("❌ SLACK_TOKEN이 설정되지 않았습니다!")
-        return False
+        log.error("SLACK_TOKEN이 설정되지 않았습니다")
+        return None
         
-    headers = {
-        'Authorization': f'Bearer {SLACK_TOKEN}',
-        'Content-Type': 'application/json'
-    }
     payload = {
         'channel': channel,
         'text': text
     }
     
     try:
-        response = requests.post(SLACK_API_URL, headers=headers, json=payload)
-        if response.status_code == 200:
-            result = response.json()
-            success = result.get('ok', False)
-            if success:
-                print("✅ 메시지 전송 성공")
-            else:
-                print(f"❌ 메시지 전송 실패: {result.get('error')}")
-            return success
-        else:
-            print(f"❌ HTTP 에러: {response.status_code}")
+        data = api_data((yield slack_post('chat.postMessage', payload)))
+        log.info("메시지 전송 성공", sample=True, channel=channel)
+        return data.get('ts')
     except Exception as e:
-        print(f"❌ 메시지 전송 에러: {e}")
+        log.warning("메시지 전송 실패", channel=channel, error=e)
+        return None
+
+def update_message_steps(channel, ts, text, wait=True):
+    """이미 보낸 메시지 내용 수정 (chat.update)
+
+    wait=False면 chat.update rate limit 토큰이 없을 때 기다리지 않고 건너뜀 (스트리밍 중간 갱신)
+    """
+    payload = {
+        'channel': channel,
+        'ts': ts,
+        'text': text
+    }
     
-    return False
+    try:
+        response = yield slack_post('chat.update', payload, wait=wait)
+        if response is None:
+            return False
+        api_data(response)
+        return True
+    except Exception as e:
+        log.warning("메시지 수정 실패", channel=channel, error=e)
+        return False
+
+@timed('post_message_to_slack')
+def post_message_to_slack(channel, text):
+    """메시지 전송 후 메시지 ts 반환 (실패 시 None)"""
+    return run_steps(post_message_steps(channel, text))
+
+@timed('post_message_to_slack')
+async def post_message_to_slack_async(channel, text):
+    """post_message_to_slack의 asyncio 버전"""
+    return await run_steps_async(post_message_steps(channel, text))
+
+@timed('send_message_to_slack')
+def send_message_to_slack(channel, text):
+    return post_message_to_slack(channel, text) is not None
+
+async def send_message_to_slack_async(channel, text):
+    return await post_message_to_slack_async(channel, text) is not None
+
+@timed('update_slack_message')
+def update_slack_message(channel, ts, text, wait=True):
+    """이미 보낸 메시지 내용 수정 (wait=False면 rate limit 토큰이 없을 때 건너뜀)"""
+    return run_steps(update_message_steps(channel, ts, text, wait))
+
+@timed('update_slack_message')
+async def update_slack_message_async(channel, ts, text, wait=True):
+    """update_slack_message의 asyncio 버전"""
+    return await run_steps_async(update_message_steps(channel, ts, text, wait))
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
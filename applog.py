@@ -0,0 +1,94 @@
+import json
+import logging
+import os
+import random
+import sys
+import threading
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')  # text | json
+LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', 0.1))  # sample=True인 debug/info 로그를 남길 비율
+
+_configure_lock = threading.Lock()
+_configured = False
+
+
+class KeyValueFormatter(logging.Formatter):
+    """시각 레벨 로거 메시지 key=value ... 한 줄 형식"""
+
+    def format(self, record):
+        line = f"{self.formatTime(record, '%Y-%m-%d %H:%M:%S')} {record.levelname:<7} {record.name} {record.getMessage()}"
+        fields = getattr(record, 'fields', None)
+        if fields:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            line += '\n' + self.formatException(record.exc_info)
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 수집기용 JSON 한 줄 형식"""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'event': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _configure():
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(JsonFormatter() if LOG_FORMAT == 'json' else KeyValueFormatter())
+        root = logging.getLogger('flask_bot')
+        root.addHandler(handler)
+        root.setLevel(LOG_LEVEL)
+        root.propagate = False
+        _configured = True
+
+
+class StructuredLogger:
+    """레벨 + 구조화 필드 + 샘플링을 지원하는 로거
+
+    log.info("메시지 처리", channel=channel_id, length=123)
+    요청마다 찍히는 잦은 로그는 sample=True로 LOG_SAMPLE_RATE 비율만 남긴다 (warning 이상은 항상 남김).
+    """
+
+    def __init__(self, name, sample_rate=LOG_SAMPLE_RATE):
+        _configure()
+        self._logger = logging.getLogger(f"flask_bot.{name}")
+        self.sample_rate = sample_rate
+        self.dropped = 0
+
+    def _log(self, level, event, sample, exc_info, fields):
+        if not self._logger.isEnabledFor(level):
+            return
+        if sample and level < logging.WARNING and random.random() >= self.sample_rate:
+            self.dropped += 1
+            return
+        self._logger.log(level, event, exc_info=exc_info, extra={'fields': fields})
+
+    def debug(self, event, sample=False, **fields):
+        self._log(logging.DEBUG, event, sample, None, fields)
+
+    def info(self, event, sample=False, **fields):
+        self._log(logging.INFO, event, sample, None, fields)
+
+    def warning(self, event, **fields):
+        self._log(logging.WARNING, event, False, None, fields)
+
+    def error(self, event, exc_info=None, **fields):
+        self._log(logging.ERROR, event, False, exc_info, fields)
+
+
+def get_logger(name):
+    return StructuredLogger(name)
@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import time
+
+from applog import get_logger
+
+log = get_logger('async_runner')
+
+
+class AsyncRunner:
+    """백그라운드 스레드 하나에서 도는 이벤트 루프 (I/O 위주 작업을 코루틴으로 동시 실행)
+
+    JobQueue와 같은 submit / pending / stats / shutdown 인터페이스를 제공한다.
+    워커 스레드 수만큼만 동시에 처리하는 JobQueue와 달리, 한 프로세스에서
+    max_concurrency개까지 동시에 실행하고 max_pending개까지 대기시킨다.
+    """
+
+    def __init__(self, max_concurrency=200, max_pending=1000, name='async'):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.loop = None
+        self._thread = None
+        self._semaphore = None
+        self._tasks = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._on_shutdown = []
+
+        # 통계
+        self.queued = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait_time = 0.0
+        self.total_run_time = 0.0
+        self.max_run_time = 0.0
+
+    def start(self):
+        """이벤트 루프 스레드 시작 (이미 시작했으면 무시)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run_loop, args=(ready,), name=f"{self.name}-loop", daemon=True)
+            self._thread.start()
+        ready.wait()
+
+    def _run_loop(self, ready):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.loop.call_soon(ready.set)
+        self.loop.run_forever()
+
+    def on_shutdown(self, func):
+        """종료 시 루프 안에서 실행할 정리 코루틴 함수 등록 (세션 닫기 등)"""
+        self._on_shutdown.append(func)
+
+    def submit(self, func, *args, **kwargs):
+        """코루틴 함수 등록. 대기 중인 작업이 가득 찼거나 종료 중이면 False 반환"""
+        with self._lock:
+            if self._closed or self.queued + self.in_flight >= self.max_pending:
+                self.rejected += 1
+                log.warning("비동기 작업이 가득 참", runner=self.name, pending=self.queued + self.in_flight)
+                return False
+            self.queued += 1
+            self.submitted += 1
+
+        self.start()
+        self.loop.call_soon_threadsafe(self._spawn, func, args, kwargs, time.time())
+        return True
+
+    def run(self, coro, timeout=None):
+        """다른 스레드에서 코루틴을 루프에 넘기고 결과를 기다림"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def _spawn(self, func, args, kwargs, enqueued_at):
+        task = self.loop.create_task(self._run_job(func, args, kwargs, enqueued_at))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_job(self, func, args, kwargs, enqueued_at):
+        async with self._semaphore:
+            started_at = time.time()
+            with self._lock:
+                self.queued -= 1
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                self.total_wait_time += started_at - enqueued_at
+
+            try:
+                await func(*args, **kwargs)
+                success = True
+            except Exception as e:
+                log.error("비동기 작업 오류", runner=self.name, job=getattr(func, '__name__', func), error=e)
+                success = False
+            finally:
+                run_time = time.time() - started_at
+                with self._lock:
+                    self.in_flight -= 1
+                    self.total_run_time += run_time
+                    self.max_run_time = max(self.max_run_time, run_time)
+                    if success:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+
+    async def _drain(self, timeout):
+        if self._tasks:
+            await asyncio.wait(list(self._tasks), timeout=timeout)
+        for func in self._on_shutdown:
+            try:
+                await func()
+            except Exception as e:
+                log.warning("비동기 종료 정리 오류", runner=self.name, error=e)
+
+    def shutdown(self, wait=True, timeout=None):
+        """새 작업을 막고, 실행 중인 작업이 끝나기를 기다린 뒤 루프 종료"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            started = self._thread is not None
+
+        if not started:
+            return
+
+        if self.pending():
+            log.info("비동기 작업 종료 중", runner=self.name, queued=self.queued, in_flight=self.in_flight)
+
+        if wait:
+            try:
+                asyncio.run_coroutine_threadsafe(self._drain(timeout), self.loop).result()
+            except Exception as e:
+                log.warning("비동기 작업 종료 오류", runner=self.name, error=e)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+
+    def pending(self):
+        """대기 중 + 처리 중인 작업 수"""
+        with self._lock:
+            return self.queued + self.in_flight
+
+    def stats(self):
+        """동시 실행 상태 및 작업 지연시간 통계"""
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                'max_concurrency': self.max_concurrency,
+                'queued': self.queued,
+                'in_flight': self.in_flight,
+                'max_in_flight': self.max_in_flight,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'avg_wait_seconds': round(self.total_wait_time / finished, 3) if finished else 0.0,
+                'avg_run_seconds': round(self.total_run_time / finished, 3) if finished else 0.0,
+                'max_run_seconds': round(self.max_run_time, 3),
+            }
@@ -0,0 +1,183 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeSlack:
+    """로컬 가짜 Slack Web API (벤치마크용)
+
+    conversations.history / conversations.replies / users.info / users.list /
+    users.conversations / chat.postMessage / chat.update 를 흉내 낸다.
+    - latency: 호출마다 기다리는 시간 (초)
+    - rate_limit_ratio: 이 비율만큼 429 + Retry-After 응답
+    - private_members: {비공개 채널 ID: 멤버 사용자 ID 목록} (users.conversations?user= 응답에 사용)
+    - 호출 수는 메서드별로, 전송/수정된 메시지는 시각과 함께 기록한다.
+    """
+
+    def __init__(self, channels, messages_per_channel=300, days=8, users=200, replies_per_thread=40,
+                 latency=0.02, rate_limit_ratio=0.0, retry_after=1, seed=0, private_members=None):
+        self.latency = latency
+        self.private_members = private_members or {}
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = {}
+        self.rate_limited = 0
+        self.posts = []  # (시각, 메서드, 채널, 텍스트)
+
+        self.users = [{'id': f"U{i:04d}", 'name': f"user{i}", 'profile': {'display_name': f"사용자{i}"}} for i in range(users)]
+        self.history = {}
+        self.replies = {}
+        now = time.time()
+        for channel in channels:
+            messages = []
+            for i in range(messages_per_channel):
+                ts = now - days * 86400 * (i + 1) / messages_per_channel
+                message = {
+                    'type': 'message',
+                    'ts': f"{ts:.6f}",
+                    'user': self.users[self._random.randrange(users)]['id'],
+                    'text': f"{channel} 채널 메시지 {i}: 배포 일정과 장애 대응 논의 " * self._random.randint(1, 4),
+                }
+                if i % 25 == 0:
+                    thread = [dict(message)]
+                    for j in range(replies_per_thread):
+                        thread.append({
+                            'type': 'message',
+                            'ts': f"{ts + 60 * (j + 1):.6f}",
+                            'thread_ts': message['ts'],
+                            'user': self.users[self._random.randrange(users)]['id'],
+                            'text': f"답글 {j}: 확인했습니다",
+                        })
+                    message['reply_count'] = replies_per_thread
+                    message['latest_reply'] = thread[-1]['ts']
+                    self.replies[(channel, message['ts'])] = thread
+                messages.append(message)
+            self.history[channel] = messages  # 최신순
+
+    def thread_ts(self, channel):
+        """채널에서 답글이 달린 스레드 하나의 ts"""
+        return next(ts for (thread_channel, ts) in self.replies if thread_channel == channel)
+
+    # HTTP 서버
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                self._handle(url.path, {key: values[0] for key, values in parse_qs(url.query).items()})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                try:
+                    params = json.loads(body) if body else {}
+                except ValueError:
+                    params = {key: values[0] for key, values in parse_qs(body.decode()).items()}
+                self._handle(urlparse(self.path).path, params)
+
+            def _handle(self, path, params):
+                method = path.rsplit('/', 1)[-1]
+                status, headers, data = fake.handle(method, params)
+                payload = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return f"http://127.0.0.1:{self._server.server_address[1]}/api"
+
+    def stop(self):
+        self._server.shutdown()
+
+    # API 흉내
+
+    def handle(self, method, params):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            if self.rate_limit_ratio and self._random.random() < self.rate_limit_ratio:
+                self.rate_limited += 1
+                return 429, {'Retry-After': str(self.retry_after)}, {'ok': False, 'error': 'ratelimited'}
+
+        handler = getattr(self, 'api_' + method.replace('.', '_'), None)
+        if handler is None:
+            return 200, {}, {'ok': False, 'error': 'unknown_method'}
+        return 200, {}, handler(params)
+
+    @staticmethod
+    def _page(items, params, default_limit=100):
+        start = int(params.get('cursor') or 0)
+        limit = int(params.get('limit') or default_limit)
+        page = items[start:start + limit]
+        has_more = start + limit < len(items)
+        return page, has_more, {'next_cursor': str(start + limit) if has_more else ''}
+
+    def api_conversations_history(self, params):
+        oldest = float(params.get('oldest') or 0)
+        latest = float(params.get('latest') or time.time() + 86400)
+        inclusive = str(params.get('inclusive', '')).lower() in ('1', 'true')
+        items = [
+            message for message in self.history.get(params.get('channel'), [])
+            if (oldest <= float(message['ts']) if inclusive else oldest < float(message['ts']))
+            and float(message['ts']) <= latest
+        ]
+        page, has_more, metadata = self._page(items, params)
+        return {'ok': True, 'messages': page, 'has_more': has_more, 'response_metadata': metadata}
+
+    def api_conversations_replies(self, params):
+        thread = self.replies.get((params.get('channel'), params.get('ts')))
+        if thread is None:
+            return {'ok': False, 'error': 'thread_not_found'}
+        oldest = float(params.get('oldest') or 0)
+        items = [thread[0]] + [reply for reply in thread[1:] if float(reply['ts']) > oldest]
+        page, has_more, metadata = self._page(items, params)
+        return {'ok': True, 'messages': page, 'has_more': has_more, 'response_metadata': metadata}
+
+    def api_users_info(self, params):
+        user = next((user for user in self.users if user['id'] == params.get('user')), None)
+        if user is None:
+            return {'ok': False, 'error': 'user_not_found'}
+        return {'ok': True, 'user': user}
+
+    def api_users_list(self, params):
+        page, _, metadata = self._page(self.users, params, default_limit=200)
+        return {'ok': True, 'members': page, 'response_metadata': metadata}
+
+    def api_users_conversations(self, params):
+        user = params.get('user')
+        channels = [
+            {'id': channel, 'name': channel.lower(), 'is_private': channel in self.private_members}
+            for channel in self.history
+            if not user or channel not in self.private_members or user in self.private_members[channel]
+        ]
+        page, _, metadata = self._page(channels, params, default_limit=100)
+        return {'ok': True, 'channels': page, 'response_metadata': metadata}
+
+    def api_chat_postMessage(self, params):
+        ts = f"{time.time():.6f}"
+        with self._lock:
+            self.posts.append((time.time(), 'chat.postMessage', params.get('channel'), params.get('text', '')))
+        return {'ok': True, 'channel': params.get('channel'), 'ts': ts}
+
+    def api_chat_update(self, params):
+        with self._lock:
+            self.posts.append((time.time(), 'chat.update', params.get('channel'), params.get('text', '')))
+        return {'ok': True, 'channel': params.get('channel'), 'ts': params.get('ts')}
@@ -0,0 +1,41 @@
+"""parse_intent 마이크로 벤치마크
+
+    python bench/parse_intent.py --rounds 20000
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intent import BOT_MENTION, parse_intent  # noqa: E402
+
+# 멘션으로 자주 들어오는 요청 모양 (짧은 명령 + 긴 텍스트 요약)
+MESSAGES = [
+    f'{BOT_MENTION} 오늘 채널 대화 요약해줘',
+    f'{BOT_MENTION} 최근 12시간 채널 메시지 요약해줘',
+    f'{BOT_MENTION} 최근 30일간 채널 분석해줘',
+    f'{BOT_MENTION} 두달간 채널 분석해줘',
+    f'{BOT_MENTION} 이 스레드 요약해줘',
+    f'{BOT_MENTION} <#C01ABCDEF|general> <#C02XYZ> 채널 대화 요약해줘',
+    f'{BOT_MENTION} 모든 채널 대화 요약해줘',
+    f'{BOT_MENTION} 도움말',
+    f'{BOT_MENTION} 안녕',
+    f'{BOT_MENTION} ' + '오늘 회의에서 배포 일정을 다음 주로 미루기로 했습니다. ' * 40 + '요약해줘',
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='parse_intent 마이크로 벤치마크')
+    parser.add_argument('--rounds', type=int, default=20000, help='parse_intent 호출 수')
+    args = parser.parse_args()
+
+    number = max(1, args.rounds // len(MESSAGES))
+    seconds = timeit.timeit(lambda: [parse_intent(text) for text in MESSAGES], number=number)
+    calls = number * len(MESSAGES)
+    print(f"parse_intent: {seconds / calls * 1e6:.2f}µs/건 ({calls}건)")
+
+
+if __name__ == '__main__':
+    main()
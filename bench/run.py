@@ -0,0 +1,315 @@
+"""오프라인 부하 테스트 / 벤치마크
+
+가짜 Slack Web API(bench/fake_slack.py)와 로컬 LLM 백엔드로 app을 띄우고,
+/slack/events 에 이벤트 묶음(재시도 포함)을 보내서 다음을 측정한다.
+
+- ack 지연시간 p50 / p99 (이벤트 POST 응답까지)
+- 요약 완료까지 걸린 시간 p50 / p99 (이벤트 전송 → 최종 메시지 전송/수정)
+- 요청당 Slack API 호출 수 (메서드별)
+- 메모리 (최대 RSS)
+
+결과는 bench/results/ 에 JSON으로 저장하고, 직전 결과와 비교해서 출력한다.
+
+    python bench/run.py --events 40 --concurrency 8 --retry-ratio 0.3
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'bench', 'results')
+sys.path.insert(0, ROOT)
+
+from bench.fake_slack import FakeSlack  # noqa: E402
+
+SIGNING_SECRET = 'bench-signing-secret'
+BOT_MENTION = '<@U092S5G2P7V>'
+
+# (이벤트 비율, 메시지)
+SCENARIOS = [
+    (0.4, '오늘 채널 대화 요약해줘'),
+    (0.2, '최근 12시간 채널 메시지 요약해줘'),
+    (0.2, '최근 7일간 채널 분석해줘'),
+    (0.15, '이 스레드 요약해줘'),
+    (0.05, '도움말'),
+]
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return round(values[lower] + (values[upper] - values[lower]) * (position - lower), 4)
+
+
+def is_final_text(text):
+    """자리표시(⏳) / 스트리밍 중간 내용(✍️) / 구간 요약 진행(🧩)이 아닌 최종 메시지인지"""
+    return not text.startswith('⏳') and not text.endswith('✍️') and '🧩' not in text
+
+
+def max_rss_mb():
+    # 리눅스는 KB, macOS는 바이트 단위
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / 1024 / (1024 if sys.platform == 'darwin' else 1), 1)
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def build_events(args, fake, channels):
+    """시나리오 비율대로 이벤트 생성 (채널은 돌아가며, 같은 채널 같은 요청도 섞이도록)"""
+    generator = random.Random(args.seed)
+    events = []
+    for i in range(args.events):
+        roll = generator.random()
+        for ratio, text in SCENARIOS:
+            roll -= ratio
+            if roll <= 0:
+                break
+        channel = channels[i % len(channels)]
+        event = {
+            'type': 'message',
+            'text': f"{BOT_MENTION} {text}",
+            'channel': channel,
+            'user': f"U{generator.randrange(200):04d}",
+            'ts': f"{time.time() + i / 1000:.6f}",
+        }
+        if '스레드' in text:
+            event['thread_ts'] = fake.thread_ts(channel)
+        events.append({'token': 'bench', 'type': 'event_callback', 'event_id': f"Ev{i:06d}", 'event': event})
+    return events
+
+
+def signed_headers(body, retry_num=None):
+    timestamp = str(int(time.time()))
+    signature = 'v0=' + hmac.new(SIGNING_SECRET.encode(), f"v0:{timestamp}:".encode() + body, hashlib.sha256).hexdigest()
+    headers = {
+        'Content-Type': 'application/json',
+        'X-Slack-Request-Timestamp': timestamp,
+        'X-Slack-Signature': signature,
+    }
+    if retry_num:
+        headers['X-Slack-Retry-Num'] = str(retry_num)
+        headers['X-Slack-Retry-Reason'] = 'http_timeout'
+    return headers
+
+
+def run(args):
+    channels = [f"CBENCH{i:03d}" for i in range(args.channels)]
+    fake = FakeSlack(
+        channels,
+        messages_per_channel=args.messages,
+        latency=args.api_latency,
+        rate_limit_ratio=args.rate_limit_ratio,
+        seed=args.seed
+    )
+    base_url = fake.start()
+    workdir = tempfile.mkdtemp(prefix='flask-bot-bench-')
+
+    # app은 import 시점에 환경 변수를 읽으므로 먼저 설정
+    os.environ.update({
+        'SLACK_TOKEN': 'xoxb-bench',
+        'SLACK_API_BASE': base_url,
+        'SLACK_SIGNING_SECRET': SIGNING_SECRET,
+        'LLM_BACKEND': 'local',
+        'LOCAL_LLM_LATENCY': str(args.llm_latency),
+        'LOCAL_LLM_TOKENS_PER_SEC': str(args.llm_tps),
+        'JOB_WORKERS': str(args.workers),
+        'MESSAGE_STORE_PATH': os.path.join(workdir, 'messages.db'),
+        'DEDUP_STORE_PATH': os.path.join(workdir, 'dedup.db'),
+        'USER_DIRECTORY_PATH': os.path.join(workdir, 'users.json'),
+        'DIGEST_LOCK_PATH': os.path.join(workdir, 'scheduler.lock'),
+        'LOG_LEVEL': os.environ.get('LOG_LEVEL', 'WARNING'),
+        'ASYNC_SUMMARIES': '1' if args.async_summaries else '0',
+    })
+    if not args.admission:
+        for scope in ('USER', 'CHANNEL', 'GLOBAL'):
+            os.environ[f'ADMISSION_{scope}_RATE'] = '100000'
+            os.environ[f'ADMISSION_{scope}_BURST'] = '100000'
+
+    import app as bot
+
+    client = bot.app.test_client()
+    bot.user_directory.wait_loaded(timeout=30)
+    fake.calls.clear()
+    rss_before = max_rss_mb()
+
+    events = build_events(args, fake, channels)
+    sent_at = {}
+    ack_latencies = []
+    retry_latencies = []
+    lock = threading.Lock()
+    generator = random.Random(args.seed + 1)
+
+    def send(payload, retry_num=None):
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        started_at = time.perf_counter()
+        if retry_num is None:
+            with lock:
+                sent_at[payload['event_id']] = (time.time(), payload['event']['channel'])
+        response = client.post('/slack/events', data=body, headers=signed_headers(body, retry_num))
+        elapsed = time.perf_counter() - started_at
+        with lock:
+            (retry_latencies if retry_num else ack_latencies).append(elapsed)
+        return response.status_code
+
+    started_at = time.time()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = []
+        for payload in events:
+            futures.append(executor.submit(send, payload))
+            # Slack은 3초 안에 응답을 못 받으면 같은 이벤트를 다시 보냄 → 일부 이벤트를 재전송
+            if generator.random() < args.retry_ratio:
+                futures.append(executor.submit(send, payload, 1))
+            time.sleep(args.interval)
+        statuses = [future.result() for future in futures]
+
+    # 모든 요약 작업이 끝날 때까지 대기
+    deadline = time.time() + args.timeout
+    while (bot.job_queue.pending() or bot.async_runner.pending()) and time.time() < deadline:
+        time.sleep(0.05)
+    finished_at = time.time()
+
+    # 채널별로 이벤트를 보낸 순서대로 그 뒤의 최종 메시지(요약/안내)를 하나씩 짝지어 요약 완료까지 걸린 시간 계산
+    final_posts = {}
+    for posted_at, _, channel, text in fake.posts:
+        if is_final_text(text):
+            final_posts.setdefault(channel, []).append(posted_at)
+    events_by_channel = {}
+    for event_sent_at, channel in sent_at.values():
+        events_by_channel.setdefault(channel, []).append(event_sent_at)
+    end_to_end = []
+    for channel, sent_times in events_by_channel.items():
+        posts = sorted(final_posts.get(channel, []))
+        index = 0
+        for event_sent_at in sorted(sent_times):
+            while index < len(posts) and posts[index] < event_sent_at:
+                index += 1
+            if index == len(posts):
+                break
+            end_to_end.append(posts[index] - event_sent_at)
+            index += 1
+
+    api_calls = dict(sorted(fake.calls.items()))
+    unique_events = len(events)
+    result = {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': vars(args),
+        'events': unique_events,
+        'retries_sent': len(retry_latencies),
+        'non_200': sum(1 for status in statuses if status != 200),
+        'duration_seconds': round(finished_at - started_at, 3),
+        'ack_seconds': {
+            'p50': percentile(ack_latencies, 50),
+            'p99': percentile(ack_latencies, 99),
+            'max': round(max(ack_latencies), 4) if ack_latencies else None,
+        },
+        'retry_ack_seconds': {'p50': percentile(retry_latencies, 50), 'p99': percentile(retry_latencies, 99)},
+        'end_to_end_seconds': {
+            'completed': len(end_to_end),
+            'p50': percentile(end_to_end, 50),
+            'p99': percentile(end_to_end, 99),
+        },
+        'api_calls': api_calls,
+        'api_calls_per_request': round(sum(api_calls.values()) / unique_events, 2) if unique_events else None,
+        'rate_limited_responses': fake.rate_limited,
+        'memory_mb': {'max_rss_before': rss_before, 'max_rss_after': max_rss_mb()},
+        'job_queue': bot.async_runner.stats() if args.async_summaries else bot.job_queue.stats(),
+        'singleflight': (bot.async_summary_flight if args.async_summaries else bot.summary_flight).stats(),
+        'admission_rejected': bot.admission.stats()['rejected'],
+        'llm': bot.llm.stats(),
+    }
+    fake.stop()
+    return result
+
+
+def previous_result(async_summaries=False):
+    """같은 실행 모드(동기 / asyncio)로 저장한 가장 최근 결과"""
+    if not os.path.isdir(RESULTS_DIR):
+        return None
+    for name in sorted((name for name in os.listdir(RESULTS_DIR) if name.endswith('.json')), reverse=True):
+        with open(os.path.join(RESULTS_DIR, name), encoding='utf-8') as f:
+            result = json.load(f)
+        if result['config'].get('async_summaries', False) == async_summaries:
+            return result
+    return None
+
+
+def compare(previous, current):
+    """직전 결과 대비 주요 지표 변화 출력"""
+    rows = [
+        ('ack p50', ('ack_seconds', 'p50')),
+        ('ack p99', ('ack_seconds', 'p99')),
+        ('end-to-end p50', ('end_to_end_seconds', 'p50')),
+        ('end-to-end p99', ('end_to_end_seconds', 'p99')),
+        ('API calls/request', ('api_calls_per_request',)),
+        ('max RSS MB', ('memory_mb', 'max_rss_after')),
+    ]
+    print(f"\n직전 결과({previous['revision']}, {previous['timestamp']})와 비교:")
+    for label, path in rows:
+        old, new = previous, current
+        for key in path:
+            old = old.get(key) if isinstance(old, dict) else None
+            new = new.get(key) if isinstance(new, dict) else None
+        if old is None or new is None:
+            continue
+        change = (new - old) / old * 100 if old else 0.0
+        marker = ' ⚠️' if change > 20 else ''
+        print(f"  {label:<18} {old:>10} → {new:<10} ({change:+.1f}%){marker}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='flask-bot 오프라인 벤치마크')
+    parser.add_argument('--events', type=int, default=40)
+    parser.add_argument('--channels', type=int, default=8)
+    parser.add_argument('--messages', type=int, default=300, help='채널당 메시지 수')
+    parser.add_argument('--concurrency', type=int, default=8, help='동시에 이벤트를 보내는 수')
+    parser.add_argument('--interval', type=float, default=0.01, help='이벤트 사이 간격 (초)')
+    parser.add_argument('--retry-ratio', type=float, default=0.3, help='Slack 재시도로 다시 보내는 이벤트 비율')
+    parser.add_argument('--workers', type=int, default=4, help='JOB_WORKERS')
+    parser.add_argument('--api-latency', type=float, default=0.02, help='가짜 Slack API 응답 지연 (초)')
+    parser.add_argument('--rate-limit-ratio', type=float, default=0.02, help='429 응답 비율')
+    parser.add_argument('--llm-latency', type=float, default=0.2)
+    parser.add_argument('--llm-tps', type=float, default=400)
+    parser.add_argument('--async', dest='async_summaries', action='store_true', help='ASYNC_SUMMARIES=1 (이벤트 루프에서 요약 처리)')
+    parser.add_argument('--admission', action='store_true', help='입장 제한을 기본값 그대로 적용')
+    parser.add_argument('--timeout', type=float, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-save', action='store_true', help='결과를 저장하지 않음')
+    args = parser.parse_args()
+
+    previous = previous_result(args.async_summaries)
+    result = run(args)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if previous:
+        compare(previous, result)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{result['revision']}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {os.path.relpath(path, ROOT)}")
+
+
+if __name__ == '__main__':
+    main()
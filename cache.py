@@ -0,0 +1,120 @@
+import heapq
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """크기 제한(LRU) + TTL 만료 캐시
+
+    만료 시각 순서의 힙으로 만료된 항목만 앞에서부터 꺼내므로
+    요청마다 전체를 훑지 않는다 (상각 O(log n)).
+    항목별 TTL을 줄 수 있어서 실패 결과는 짧게만 캐시할 수 있다 (negative caching).
+    """
+
+    def __init__(self, max_size=1024, ttl=300, negative_ttl=30, name='cache'):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._data = OrderedDict()  # key -> (value, expires_at)
+        self._expiry = []  # (expires_at, seq, key)
+        self._seq = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expire(self, now):
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= now:
+            expires_at, _, key = heapq.heappop(expiry)
+            entry = self._data.get(key)
+            # 덮어쓴 항목의 예전 만료 기록은 무시
+            if entry is not None and entry[1] == expires_at:
+                del self._data[key]
+                self.expirations += 1
+
+        # 덮어쓰기로 쌓인 오래된 만료 기록 정리
+        if len(expiry) > 2 * len(self._data) + 64:
+            self._expiry = [(entry[1], i, key) for i, (key, entry) in enumerate(self._data.items())]
+            heapq.heapify(self._expiry)
+            self._seq = len(self._expiry)
+
+    def _store(self, key, value, ttl, now):
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        self._seq += 1
+        heapq.heappush(self._expiry, (expires_at, self._seq, key))
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        """값 저장 (ttl을 주지 않으면 기본 TTL)"""
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            self._store(key, value, ttl, now)
+
+    def set_negative(self, key, value):
+        """실패 결과를 짧은 TTL로 저장"""
+        self.set(key, value, ttl=self.negative_ttl)
+
+    def add(self, key, value, ttl=None):
+        """키가 없을 때만 저장. 새로 저장했으면 True"""
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return False
+            self.misses += 1
+            self._store(key, value, ttl, now)
+            return True
+
+    def discard(self, key):
+        """키가 있으면 삭제 (만료 기록은 _expire에서 무시됨)"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __contains__(self, key):
+        with self._lock:
+            self._expire(time.time())
+            return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            self._expire(time.time())
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
@@ -0,0 +1,113 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from applog import get_logger
+
+log = get_logger('dedup_store')
+
+# 본문 전체를 파싱하지 않고 event_id만 빠르게 꺼내기 위한 패턴
+EVENT_ID_PATTERN = re.compile(rb'"event_id"\s*:\s*"([^"]+)"')
+
+
+def extract_event_id(raw_body):
+    """요청 바디(bytes)에서 event_id 추출 (없으면 None)"""
+    match = EVENT_ID_PATTERN.search(raw_body or b'')
+    return match.group(1).decode('utf-8', 'replace') if match else None
+
+
+class DedupStore:
+    """gunicorn 워커 프로세스 간에 공유되는 이벤트 중복 제거 저장소 (SQLite WAL)
+
+    INSERT OR IGNORE 한 번으로 "처음 본 키인지"를 원자적으로 판단한다.
+    """
+
+    def __init__(self, path, ttl=3600, prune_every=500):
+        self.path = path
+        self.ttl = ttl
+        self.prune_every = prune_every
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._inserts = 0
+
+        self.checked = 0
+        self.duplicates = 0
+        self.errors = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_events (
+                key TEXT PRIMARY KEY,
+                seen_at REAL NOT NULL
+            )
+        """)
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_seen_events_seen_at ON seen_events (seen_at)')
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def first_seen(self, key):
+        """처음 보는 키면 기록하고 True, 이미 본 키면 False
+
+        저장소 오류 시에는 요청을 버리지 않도록 True를 반환한다.
+        """
+        now = time.time()
+        try:
+            conn = self._conn()
+            cursor = conn.execute('INSERT OR IGNORE INTO seen_events (key, seen_at) VALUES (?, ?)', (key, now))
+            is_new = cursor.rowcount == 1
+        except sqlite3.Error as e:
+            log.error("중복 제거 저장소 오류", error=e)
+            with self._lock:
+                self.errors += 1
+            return True
+
+        with self._lock:
+            self.checked += 1
+            if not is_new:
+                self.duplicates += 1
+            self._inserts += 1
+            should_prune = self._inserts % self.prune_every == 0
+
+        if should_prune:
+            self.prune(now)
+        return is_new
+
+    def forget(self, key):
+        """기록 삭제 (처리하지 못한 이벤트를 Slack 재시도로 다시 받을 수 있게)"""
+        try:
+            self._conn().execute('DELETE FROM seen_events WHERE key = ?', (key,))
+        except sqlite3.Error as e:
+            log.error("중복 제거 저장소 삭제 오류", error=e)
+            with self._lock:
+                self.errors += 1
+
+    def prune(self, now=None):
+        """TTL 지난 기록 삭제"""
+        cutoff = (now or time.time()) - self.ttl
+        try:
+            self._conn().execute('DELETE FROM seen_events WHERE seen_at < ?', (cutoff,))
+        except sqlite3.Error as e:
+            log.error("중복 제거 저장소 정리 오류", error=e)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'path': self.path,
+                'checked': self.checked,
+                'duplicates': self.duplicates,
+                'errors': self.errors,
+            }
@@ -0,0 +1,17 @@
+# gunicorn 설정 (Procfile의 `gunicorn app:app`이 자동으로 읽음)
+import os
+
+graceful_timeout = int(os.environ.get('GRACEFUL_TIMEOUT', 60))
+
+
+def post_worker_init(worker):
+    """워커가 앱을 불러온 직후 LLM 클라이언트를 미리 초기화 (첫 요청의 SDK 로딩 비용 제거)"""
+    from app import llm
+    llm.warm_up()
+
+
+def worker_exit(server, worker):
+    """워커 종료 시 대기 중인 요약 작업을 모두 처리하고 종료"""
+    from app import async_runner, job_queue
+    job_queue.shutdown(wait=True, timeout=graceful_timeout)
+    async_runner.shutdown(wait=True, timeout=graceful_timeout)
@@ -0,0 +1,144 @@
+import math
+import threading
+import time
+
+from applog import get_logger
+from slack_client import paginate
+from steps import Call, Gather, Steps, run_steps, run_steps_async
+
+log = get_logger('history_fetcher')
+
+
+class HistoryFetcher:
+    """conversations.history 수집기
+
+    호출 간격은 SlackClient의 tier별 토큰 버킷이 맞추고(고정 sleep 없음),
+    긴 기간은 oldest/latest 하위 구간으로 나눠 병렬로 받은 뒤 ts 기준으로 합친다.
+    페이지 예산(max_pages)은 처음엔 구간들이 나눠 쓰고, 덜 받은 구간은 남은 예산으로 이어 받는다.
+    수집 순서는 단계 생성기(fetch_steps) 하나로 두고, fetch는 스레드로, fetch_async는
+    async_client(AsyncSlackClient)와 asyncio.gather로 실행한다.
+    """
+
+    def __init__(self, client, async_client=None, max_workers=4, split_days=7, page_size=200):
+        self.client = client
+        self.async_client = async_client
+        self.max_workers = max_workers
+        self.split_seconds = split_days * 86400
+        self.page_size = page_size
+        self._lock = threading.Lock()
+
+        self.fetches = 0
+        self.pages = 0
+        self.messages = 0
+        self.seconds = 0.0
+
+    def fetch(self, channel_id, oldest_timestamp, latest_timestamp=None, max_pages=50):
+        """oldest~latest 구간 메시지 수집 (최신순)
+
+        (메시지 목록, 구간 끝까지 다 가져왔는지 여부) 반환.
+        일부만 가져온 경우에도 메시지 목록은 최신 쪽부터 빈틈없이 이어진 부분만 담는다.
+        """
+        return run_steps(self.fetch_steps(channel_id, oldest_timestamp, latest_timestamp, max_pages))
+
+    async def fetch_async(self, channel_id, oldest_timestamp, latest_timestamp=None, max_pages=50):
+        """fetch의 asyncio 버전 (AsyncSlackClient로 하위 구간을 동시에 받음)"""
+        return await run_steps_async(self.fetch_steps(channel_id, oldest_timestamp, latest_timestamp, max_pages))
+
+    def fetch_steps(self, channel_id, oldest_timestamp, latest_timestamp=None, max_pages=50):
+        """fetch의 단계 생성기 (다른 단계 생성기 안에서 yield from으로 이어 쓸 수 있음)"""
+        started_at = time.time()
+        latest = latest_timestamp or started_at
+        windows = self._split(oldest_timestamp, latest)
+
+        if len(windows) == 1:
+            messages, pages, complete, _ = yield from self._window_steps(channel_id, oldest_timestamp, latest_timestamp, max_pages)
+        else:
+            messages, pages, complete = yield from self._windows_steps(channel_id, windows, max_pages)
+
+        elapsed = time.time() - started_at
+        with self._lock:
+            self.fetches += 1
+            self.pages += pages
+            self.messages += len(messages)
+            self.seconds += elapsed
+
+        log.info("히스토리 수집 완료", channel=channel_id, pages=pages, messages=len(messages), seconds=round(elapsed, 3), complete=complete)
+        return messages, complete
+
+    def _windows_steps(self, channel_id, windows, max_pages):
+        """하위 구간들을 동시에 받고, 덜 받은 구간은 남은 페이지 예산으로 이어 받기"""
+        log.info("구간을 나눠 병렬 수집", channel=channel_id, windows=len(windows))
+        pages_per_window = max(1, math.ceil(max_pages / len(windows)))
+        results = yield Gather(
+            [Steps(self._window_steps, channel_id, window_oldest, window_latest, pages_per_window)
+             for window_oldest, window_latest in windows],
+            self.max_workers
+        )
+        results = [list(result) for result in results]
+
+        # 최신 구간부터 차례로 보면서, 덜 받은 구간은 이어 붙일 몫(max_pages - 지금까지 쓴 페이지)만큼 cursor로 이어 받음
+        # (한가한 구간이 남긴 예산을 바쁜 구간이 쓰고, 먼저 받아 둔 이전 구간 페이지도 버리지 않고 이어서 씀)
+        kept = 0
+        for (window_oldest, window_latest), result in zip(windows, results):
+            kept += result[1]
+            if result[2]:
+                continue
+            if kept < max_pages:
+                more, more_pages, result[2], result[3] = yield from self._window_steps(
+                    channel_id, window_oldest, window_latest, max_pages - kept, cursor=result[3]
+                )
+                result[0].extend(more)
+                result[1] += more_pages
+                kept += more_pages
+            if not result[2]:
+                break
+
+        # 최신 구간부터 이어 붙이다가 덜 받은 구간이 나오면 거기서 멈춤 (중간에 빈틈이 생기지 않도록)
+        merged = {}
+        complete = True
+        for index, (window_messages, _, window_complete, _) in enumerate(results):
+            for message in window_messages:
+                merged[message['ts']] = message
+            if not window_complete:
+                complete = False
+                dropped = sum(len(result[0]) for result in results[index + 1:])
+                if dropped:
+                    log.info("빈틈 뒤의 이전 구간은 버림", channel=channel_id, windows=len(results) - index - 1, messages=dropped)
+                break
+        pages = sum(result[1] for result in results)
+        return sorted(merged.values(), key=lambda msg: float(msg['ts']), reverse=True), pages, complete
+
+    def _split(self, oldest, latest):
+        """긴 구간을 split_days 단위 하위 구간으로 나누기 (최신 구간부터)"""
+        span = latest - oldest
+        count = min(self.max_workers, max(1, math.ceil(span / self.split_seconds)))
+        step = span / count
+        return [(latest - step * (i + 1) if i < count - 1 else oldest, latest - step * i) for i in range(count)]
+
+    def _window_steps(self, channel_id, oldest_timestamp, latest_timestamp, max_pages, cursor=None):
+        """한 구간을 cursor로 끝까지 페이지네이션
+
+        (메시지, 페이지 수, 다 받았는지, 이어 받을 cursor) 반환
+        """
+        params = {
+            'channel': channel_id,
+            'oldest': oldest_timestamp,
+            'limit': self.page_size,
+            'inclusive': 'true'  # 하위 구간 경계에 걸친 메시지도 빠지지 않도록 (중복은 ts로 제거, requests는 bool을 "True"로 보내므로 문자열로)
+        }
+        if latest_timestamp:
+            params['latest'] = latest_timestamp
+        return (yield from paginate(self._request, params, max_pages, cursor=cursor))
+
+    def _request(self, params):
+        """conversations.history 호출 단계 (비동기 클라이언트가 없으면 비동기 경로에서도 동기 클라이언트를 스레드에서)"""
+        return Call(self.client.get, self.async_client.get if self.async_client else None, 'conversations.history', params)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'fetches': self.fetches,
+                'pages': self.pages,
+                'messages': self.messages,
+                'pages_per_second': round(self.pages / self.seconds, 2) if self.seconds else 0.0,
+            }
@@ -0,0 +1,123 @@
+import math
+import re
+
+BOT_MENTION = '<@U092S5G2P7V>'
+
+DEFAULT_SHORT_TERM_HOURS = 24
+DEFAULT_LONG_TERM_DAYS = 30
+MAX_SHORT_TERM_HOURS = 7 * 24
+MAX_LONG_TERM_DAYS = 90
+
+UNIT_HOURS = {'시간': 1, '일': 24, '주': 24 * 7, '달': 24 * 30, '개월': 24 * 30}
+
+# 기간 단어 → 시간
+WORD_HOURS = {'오늘': 24, '어제': 48, '일주일': 24 * 7, '한달': 24 * 30, '두달': 24 * 60}
+
+# 한 번의 스캔으로 멘션 / 채널 링크 / "N 시간·일·주·달" / 키워드를 모두 찾는 패턴
+TOKEN_PATTERN = re.compile(
+    r'(?P<mention>' + re.escape(BOT_MENTION) + r')'
+    r'|<#(?P<channel>[CG][A-Z0-9]+)(?:\|[^>]*)?>'
+    r'|(?P<num>\d{1,4})\s*(?P<unit>시간|개월|일|주|달)(?P<suffix>간)?'
+    r'|(?P<word>요약해줘|분석해줘|스레드|쓰레드|분석|일주일|한\s?달|두\s?달|오늘|어제|모든\s?채널|전체\s?채널|채널|대화|메시지|도움말|사용법|일간)'
+)
+
+
+class Intent:
+    """멘션 메시지에서 뽑아낸 명령
+
+    kind: thread / long_term / short_term / multi_channel / text / help / greeting
+    hours / days: 요청한 기간 (short_term / multi_channel은 hours, long_term은 days 사용)
+    channels: multi_channel에서 요약할 채널 ID 목록 (None이면 봇이 들어가 있는 모든 채널)
+    requested: 요청한 기간이 최대치를 넘어서 줄였으면 원래 요청한 값 (hours/days와 같은 단위), 아니면 None
+    """
+
+    def __init__(self, kind, hours=None, days=None, flags=None, channels=None, requested=None):
+        self.kind = kind
+        self.hours = hours
+        self.days = days
+        self.flags = flags or set()
+        self.channels = channels
+        self.requested = requested
+
+    def __repr__(self):
+        return f"Intent({self.kind!r}, hours={self.hours}, days={self.days}, channels={self.channels})"
+
+
+def scan(text):
+    """메시지를 한 번 훑어서 (키워드 집합, 처음 나온 기간(시간 단위), 링크된 채널 ID 목록) 반환"""
+    flags = set()
+    duration_hours = None
+    word_hours = None
+    channels = []
+
+    for match in TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == 'mention':
+            flags.add('mention')
+        elif kind == 'channel':
+            if match.group('channel') not in channels:
+                channels.append(match.group('channel'))
+        elif kind == 'word':
+            word = match.group('word').replace(' ', '')
+            flags.add(word)
+            if word_hours is None and word in WORD_HOURS:
+                word_hours = WORD_HOURS[word]
+        else:
+            unit = match.group('unit')
+            if unit == '일' and match.group('suffix'):
+                flags.add('일간')
+            flags.add(unit)
+            if duration_hours is None:
+                duration_hours = int(match.group('num')) * UNIT_HOURS[unit]
+
+    # 숫자로 적은 기간이 단어(오늘, 한달 등)보다 우선
+    return flags, duration_hours if duration_hours is not None else word_hours, channels
+
+
+def clamp(value, limit):
+    """1~limit으로 맞춘 값과, 최대치를 넘어서 줄였으면 원래 값 (아니면 None)"""
+    return max(1, min(value, limit)), value if value > limit else None
+
+
+def clamp_notice(intent):
+    """요청한 기간을 최대치로 줄였으면 사용자에게 알릴 문구, 아니면 None"""
+    if intent.requested is None:
+        return None
+    if intent.kind == 'long_term':
+        return f"ℹ️ 장기 분석은 최대 {MAX_LONG_TERM_DAYS}일까지라 요청한 {intent.requested}일 대신 최근 {intent.days}일만 분석했어요."
+    return (f"ℹ️ 대화 요약은 최대 {MAX_SHORT_TERM_HOURS}시간({MAX_SHORT_TERM_HOURS // 24}일)까지라 "
+            f"요청한 {intent.requested}시간 대신 최근 {intent.hours}시간만 요약했어요. "
+            f"더 긴 기간은 `N일간 채널 분석해줘`로 요청해주세요.")
+
+
+def parse_intent(text, in_thread=False):
+    """멘션 메시지 → Intent"""
+    flags, hours, channels = scan(text)
+
+    if '요약해줘' in flags or '분석해줘' in flags:
+        if ('스레드' in flags or '쓰레드' in flags) and in_thread:
+            return Intent('thread', flags=flags)
+
+        # '분석해줘'도 '분석'을 포함하므로 기존 라우팅과 같이 장기 분석으로 처리
+        if '분석' in flags or '분석해줘' in flags or '일간' in flags or '한달' in flags or (hours and hours >= 24 * 30):
+            days, requested = clamp(math.ceil(hours / 24) if hours else DEFAULT_LONG_TERM_DAYS, MAX_LONG_TERM_DAYS)
+            return Intent('long_term', days=days, flags=flags, requested=requested)
+
+        # '모든 채널'/'전체 채널'을 붙여 썼거나, 채널을 링크하고 '채널 대화/메시지 요약'을 요청한 경우만 여러 채널 요약
+        # (채널 링크가 섞인 일반 텍스트 요약 요청은 그대로 텍스트 요약)
+        all_channels = '모든채널' in flags or '전체채널' in flags
+        short_term = '채널' in flags and ('대화' in flags or '메시지' in flags)
+        if all_channels or (channels and short_term):
+            hours, requested = clamp(hours or DEFAULT_SHORT_TERM_HOURS, MAX_SHORT_TERM_HOURS)
+            return Intent('multi_channel', hours=hours, flags=flags, channels=channels or None, requested=requested)
+
+        if short_term:
+            hours, requested = clamp(hours or DEFAULT_SHORT_TERM_HOURS, MAX_SHORT_TERM_HOURS)
+            return Intent('short_term', hours=hours, flags=flags, requested=requested)
+
+        return Intent('text', flags=flags)
+
+    if '도움말' in flags or '사용법' in flags:
+        return Intent('help', flags=flags)
+
+    return Intent('greeting', flags=flags)
@@ -0,0 +1,136 @@
+import threading
+import queue
+import time
+
+from applog import get_logger
+
+log = get_logger('job_queue')
+
+
+class JobQueue:
+    """요청 처리와 분리된 백그라운드 작업 큐 (고정 크기 워커 풀)"""
+
+    def __init__(self, num_workers=4, max_size=100, name='job'):
+        self.name = name
+        self.num_workers = num_workers
+        self._queue = queue.Queue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._workers = []
+        self._started = False
+        self._closed = False
+
+        # 통계
+        self.in_flight = 0
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait_time = 0.0
+        self.total_run_time = 0.0
+        self.max_run_time = 0.0
+
+    def start(self):
+        """워커 스레드 시작 (이미 시작했으면 무시)"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            for i in range(self.num_workers):
+                worker = threading.Thread(target=self._worker_loop, name=f"{self.name}-worker-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def submit(self, func, *args, **kwargs):
+        """작업 등록. 큐가 가득 찼거나 종료 중이면 False 반환"""
+        if self._closed:
+            self.rejected += 1
+            return False
+
+        self.start()
+
+        try:
+            self._queue.put_nowait((func, args, kwargs, time.time()))
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            log.warning("작업 큐가 가득 참", queue=self.name, depth=self._queue.qsize())
+            return False
+
+        with self._lock:
+            self.submitted += 1
+        return True
+
+    def _worker_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+
+            func, args, kwargs, enqueued_at = item
+            started_at = time.time()
+            with self._lock:
+                self.in_flight += 1
+                self.started += 1
+                self.total_wait_time += started_at - enqueued_at
+
+            try:
+                func(*args, **kwargs)
+                success = True
+            except Exception as e:
+                log.error("백그라운드 작업 오류", queue=self.name, job=getattr(func, '__name__', func), error=e)
+                success = False
+            finally:
+                run_time = time.time() - started_at
+                with self._lock:
+                    self.in_flight -= 1
+                    self.total_run_time += run_time
+                    self.max_run_time = max(self.max_run_time, run_time)
+                    if success:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+                self._queue.task_done()
+
+    def shutdown(self, wait=True, timeout=None):
+        """새 작업을 막고, 대기 중인 작업을 모두 처리한 뒤 워커 종료"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+
+        if workers:
+            log.info("작업 큐 종료 중", queue=self.name, queued=self._queue.qsize(), in_flight=self.in_flight)
+
+        # 대기 중인 작업 뒤에 종료 신호를 넣어서 남은 작업이 먼저 처리되도록 함
+        for _ in workers:
+            self._queue.put(None)
+
+        if wait:
+            deadline = time.time() + timeout if timeout else None
+            for worker in workers:
+                remaining = max(0, deadline - time.time()) if deadline else None
+                worker.join(remaining)
+
+    def pending(self):
+        """대기 중 + 처리 중인 작업 수"""
+        return self._queue.qsize() + self.in_flight
+
+    def stats(self):
+        """큐 상태 및 작업 지연시간 통계"""
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                'workers': self.num_workers,
+                'depth': self._queue.qsize(),
+                'in_flight': self.in_flight,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'avg_wait_seconds': round(self.total_wait_time / self.started, 3) if self.started else 0.0,
+                'avg_run_seconds': round(self.total_run_time / finished, 3) if finished else 0.0,
+                'max_run_seconds': round(self.max_run_time, 3),
+            }
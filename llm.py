@@ -0,0 +1,260 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+
+from applog import get_logger
+from metrics import span
+
+log = get_logger('llm')
+
+
+class LLMBackend:
+    """요약에 쓰는 LLM 백엔드 공통 인터페이스
+
+    하위 클래스는 _complete(prompt)와 _stream(prompt)만 구현하면 되고,
+    스트리밍 누적 / 지연시간 통계는 여기서 처리한다.
+    """
+
+    name = 'base'
+    model_name = None
+
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self.cold_start_seconds = None
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.total_first_chunk_seconds = 0.0
+        self.streamed_calls = 0
+
+    def warm_up(self):
+        """워커 시작 시 미리 초기화할 것이 있으면 처리"""
+
+    def _complete(self, prompt):
+        """전체 응답 텍스트 반환"""
+        raise NotImplementedError
+
+    def _stream(self, prompt):
+        """응답 텍스트 조각을 순서대로 yield"""
+        raise NotImplementedError
+
+    async def _acomplete(self, prompt):
+        """비동기로 전체 응답 텍스트 반환 (기본: 스레드에서 _complete 실행)"""
+        return await asyncio.to_thread(self._complete, prompt)
+
+    async def _astream(self, prompt):
+        """비동기로 응답 텍스트 조각을 yield (기본: 스트리밍 없이 한 번에)"""
+        yield await self._acomplete(prompt)
+
+    def generate(self, prompt, on_text=None):
+        """프롬프트 실행 후 응답 텍스트 반환
+
+        on_text가 있으면 스트리밍으로 받으면서 지금까지의 텍스트를 계속 전달한다.
+        """
+        with span('generate_content'):
+            return self._generate(prompt, on_text)
+
+    def _generate(self, prompt, on_text):
+        started_at = time.time()
+        first_chunk_at = None
+        try:
+            if not on_text:
+                text = self._complete(prompt)
+            else:
+                text = ''
+                for chunk in self._stream(prompt):
+                    if not chunk:
+                        continue
+                    text += chunk
+                    if first_chunk_at is None:
+                        first_chunk_at = time.time()
+                    on_text(text)
+        except Exception:
+            with self._stats_lock:
+                self.errors += 1
+            raise
+        finally:
+            self._record(time.time() - started_at, first_chunk_at and first_chunk_at - started_at)
+        return text
+
+    async def agenerate(self, prompt, on_text=None):
+        """generate()의 asyncio 버전 (on_text는 코루틴 함수)"""
+        with span('generate_content'):
+            started_at = time.time()
+            first_chunk_at = None
+            try:
+                if not on_text:
+                    text = await self._acomplete(prompt)
+                else:
+                    text = ''
+                    async for chunk in self._astream(prompt):
+                        if not chunk:
+                            continue
+                        text += chunk
+                        if first_chunk_at is None:
+                            first_chunk_at = time.time()
+                        await on_text(text)
+            except Exception:
+                with self._stats_lock:
+                    self.errors += 1
+                raise
+            finally:
+                self._record(time.time() - started_at, first_chunk_at and first_chunk_at - started_at)
+            return text
+
+    def _record(self, elapsed, first_chunk):
+        with self._stats_lock:
+            self.calls += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+            if first_chunk is not None:
+                self.streamed_calls += 1
+                self.total_first_chunk_seconds += first_chunk
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'backend': self.name,
+                'model': self.model_name,
+                'cold_start_seconds': round(self.cold_start_seconds, 3) if self.cold_start_seconds is not None else None,
+                'calls': self.calls,
+                'errors': self.errors,
+                'avg_seconds': round(self.total_seconds / self.calls, 3) if self.calls else 0.0,
+                'max_seconds': round(self.max_seconds, 3),
+                'avg_first_chunk_seconds': round(self.total_first_chunk_seconds / self.streamed_calls, 3) if self.streamed_calls else None,
+            }
+
+
+class GeminiBackend(LLMBackend):
+    """Gemini 클라이언트를 워커당 한 번만 초기화해서 재사용
+
+    SDK import / configure / GenerativeModel 생성은 첫 사용 시(또는 gunicorn
+    post_worker_init 훅의 warm_up) 한 번만 하고, 이후 요청은 같은 모델 객체를 쓴다.
+    """
+
+    name = 'gemini'
+
+    def __init__(self, model_name='gemini-1.5-flash', api_key=None):
+        super().__init__()
+        self.model_name = model_name
+        self.api_key = api_key
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        if self._model is not None:
+            return self._model
+
+        with self._lock:
+            if self._model is None:
+                started_at = time.time()
+                import google.generativeai as genai
+
+                genai.configure(api_key=self.api_key or os.environ.get('GOOGLE_API_KEY'))
+                self._model = genai.GenerativeModel(self.model_name)
+                self.cold_start_seconds = time.time() - started_at
+                log.info("Gemini 초기화 완료", model=self.model_name, seconds=round(self.cold_start_seconds, 2))
+        return self._model
+
+    def warm_up(self):
+        """워커 시작 시 미리 초기화 (실패해도 첫 요청에서 다시 시도)"""
+        try:
+            self._get_model()
+        except Exception as e:
+            log.warning("Gemini 초기화 오류", error=e)
+
+    def _complete(self, prompt):
+        return self._get_model().generate_content(prompt).text
+
+    def _stream(self, prompt):
+        for chunk in self._get_model().generate_content(prompt, stream=True):
+            try:
+                yield chunk.text
+            except ValueError:
+                continue  # 안전 필터 등으로 텍스트가 없는 청크
+
+
+    async def _acomplete(self, prompt):
+        response = await self._get_model().generate_content_async(prompt)
+        return response.text
+
+    async def _astream(self, prompt):
+        async for chunk in await self._get_model().generate_content_async(prompt, stream=True):
+            try:
+                yield chunk.text
+            except ValueError:
+                continue
+
+
+class LocalBackend(LLMBackend):
+    """네트워크 없이 동작하는 결정적(deterministic) 로컬 백엔드 (벤치마크/부하 테스트용)
+
+    첫 토큰까지 latency초를 기다린 뒤 초당 tokens_per_second개 속도로
+    output_tokens개의 토큰을 만들어 낸다. 같은 프롬프트에는 항상 같은 응답을 준다.
+    """
+
+    name = 'local'
+
+    def __init__(self, latency=0.5, tokens_per_second=50.0, output_tokens=120, chunk_tokens=8):
+        super().__init__()
+        self.model_name = f"local-{tokens_per_second:g}tps"
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.chunk_tokens = chunk_tokens
+        self.cold_start_seconds = 0.0
+
+    def _tokens(self, prompt):
+        """프롬프트 내용에서 결정적으로 응답 토큰 생성"""
+        digest = hashlib.sha1(prompt.encode('utf-8')).hexdigest()
+        words = [line.strip('-•* ') for line in prompt.splitlines() if line.strip()]
+        words = ' '.join(words).split() or ['요약']
+        tokens = [f"- 요약({digest[:8]}):"]
+        for i in range(self.output_tokens - 1):
+            tokens.append(words[(int(digest[i % 40], 16) + i * 7) % len(words)])
+            if i % 15 == 14:
+                tokens.append(f"\n- 항목 {i // 15 + 2}:")
+        return tokens
+
+    def _complete(self, prompt):
+        tokens = self._tokens(prompt)
+        time.sleep(self.latency + len(tokens) / self.tokens_per_second)
+        return ' '.join(tokens)
+
+    def _stream(self, prompt):
+        tokens = self._tokens(prompt)
+        time.sleep(self.latency)
+        for i in range(0, len(tokens), self.chunk_tokens):
+            chunk = tokens[i:i + self.chunk_tokens]
+            time.sleep(len(chunk) / self.tokens_per_second)
+            yield (' ' if i else '') + ' '.join(chunk)
+
+    async def _acomplete(self, prompt):
+        tokens = self._tokens(prompt)
+        await asyncio.sleep(self.latency + len(tokens) / self.tokens_per_second)
+        return ' '.join(tokens)
+
+    async def _astream(self, prompt):
+        tokens = self._tokens(prompt)
+        await asyncio.sleep(self.latency)
+        for i in range(0, len(tokens), self.chunk_tokens):
+            chunk = tokens[i:i + self.chunk_tokens]
+            await asyncio.sleep(len(chunk) / self.tokens_per_second)
+            yield (' ' if i else '') + ' '.join(chunk)
+
+
+def create_backend(name=None):
+    """환경 변수 설정에 맞는 LLM 백엔드 생성 (LLM_BACKEND=gemini|local)"""
+    name = name or os.environ.get('LLM_BACKEND', 'gemini')
+    if name == 'local':
+        return LocalBackend(
+            latency=float(os.environ.get('LOCAL_LLM_LATENCY', 0.5)),
+            tokens_per_second=float(os.environ.get('LOCAL_LLM_TOKENS_PER_SEC', 50)),
+            output_tokens=int(os.environ.get('LOCAL_LLM_OUTPUT_TOKENS', 120))
+        )
+    if name == 'gemini':
+        return GeminiBackend(os.environ.get('GEMINI_MODEL', 'gemini-1.5-flash'))
+    raise ValueError(f"알 수 없는 LLM_BACKEND: {name}")
@@ -0,0 +1,17 @@
+from datetime import datetime, timedelta
+
+
+def bucket_start(ts, bucket_days):
+    """메시지 ts가 속한 구간의 시작 날짜 (일 단위: 해당 날짜, 주 단위: 그 주 월요일)"""
+    day = datetime.fromtimestamp(float(ts)).date()
+    if bucket_days >= 7:
+        day = day - timedelta(days=day.weekday())
+    return day
+
+
+def bucket_label(start, bucket_days):
+    """구간 표시용 라벨 (예: 06/02 또는 06/02~06/08)"""
+    if bucket_days >= 7:
+        end = start + timedelta(days=6)
+        return f"{start.strftime('%m/%d')}~{end.strftime('%m/%d')}"
+    return start.strftime('%m/%d')
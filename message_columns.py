@@ -0,0 +1,266 @@
+import array
+import time
+from datetime import datetime, timezone
+
+try:
+    import numpy as np
+except ImportError:  # numpy가 없으면 순수 파이썬으로 같은 통계 계산
+    np = None
+
+WEEKDAY_NAMES = ['월', '화', '수', '목', '금', '토', '일']
+
+
+def percentile(sorted_values, q):
+    """정렬된 값의 q분위수 (numpy.percentile 기본값과 같은 선형 보간)"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class MessageColumns:
+    """메시지 메타데이터를 열(column) 단위 배열로 보관
+
+    메시지 dict 대신 ts / 작성자 / 스레드 정보 / 본문 길이만 array에 쌓아두고,
+    통계는 analyze()에서 numpy로 한꺼번에 계산한다 (메시지마다 datetime을 만들지 않음).
+    작성자는 정수 인덱스로 바꿔 저장하고 user_ids로 다시 찾는다.
+    """
+
+    def __init__(self):
+        self.ts = array.array('d')
+        self.user = array.array('q')            # user_ids 인덱스 (-1: 작성자 없음)
+        self.reply_count = array.array('q')
+        self.latest_reply = array.array('d')    # 스레드 마지막 답글 ts (0: 답글 없음)
+        self.text_length = array.array('q')
+        self.user_ids = []
+        self._user_index = {}
+
+    def __len__(self):
+        return len(self.ts)
+
+    def append(self, message, ts):
+        user_id = message.get('user')
+        if user_id is None:
+            index = -1
+        else:
+            index = self._user_index.get(user_id)
+            if index is None:
+                index = self._user_index[user_id] = len(self.user_ids)
+                self.user_ids.append(user_id)
+
+        self.ts.append(ts)
+        self.user.append(index)
+        self.reply_count.append(message.get('reply_count') or 0)
+        try:
+            self.latest_reply.append(float(message.get('latest_reply') or 0))
+        except (TypeError, ValueError):
+            self.latest_reply.append(0.0)
+        self.text_length.append(len(message.get('text') or ''))
+
+    def analyze(self, now=None, top_n=5, max_response_gap=4 * 3600, utc_offset=None):
+        """활동 통계 계산
+
+        - daily / hourly / weekday: 날짜별 / 시간대별 / 요일별 메시지 수 (현지 시간 기준)
+        - periods: 최근 7일 / 1-2주 전 / 그 이전 메시지 수
+        - response_minutes: 다른 사람이 이어서 말하기까지 걸린 시간 분포 (max_response_gap 이내만)
+        - threads: 답글이 달린 메시지 수 / 답글 수 / 스레드 지속 시간
+        """
+        now = now or time.time()
+        if utc_offset is None:
+            utc_offset = time.localtime(now).tm_gmtoff
+        if not len(self.ts):
+            return None
+        if np is not None:
+            return self._analyze_numpy(now, top_n, max_response_gap, utc_offset)
+        return self._analyze_python(now, top_n, max_response_gap, utc_offset)
+
+    def _analyze_numpy(self, now, top_n, max_response_gap, utc_offset):
+        ts = np.frombuffer(self.ts, dtype=np.float64)
+        user = np.frombuffer(self.user, dtype=np.int64)
+        reply_count = np.frombuffer(self.reply_count, dtype=np.int64)
+        latest_reply = np.frombuffer(self.latest_reply, dtype=np.float64)
+        text_length = np.frombuffer(self.text_length, dtype=np.int64)
+
+        local = ts + utc_offset
+        day = np.floor_divide(local, 86400).astype(np.int64)
+        first_day = int(day.min())
+        daily = np.bincount(day - first_day)
+        hourly = np.bincount((np.mod(local, 86400) // 3600).astype(np.int64), minlength=24)
+        weekday = np.bincount((day + 3) % 7, minlength=7)  # 1970-01-01은 목요일
+
+        days_ago = np.floor_divide(now - ts, 86400)
+        recent = int(np.count_nonzero(days_ago <= 7))
+        weekly = int(np.count_nonzero((days_ago > 7) & (days_ago <= 14)))
+
+        has_user = user >= 0
+        user_counts = np.bincount(user[has_user], minlength=len(self.user_ids))
+        top = np.argsort(-user_counts, kind='stable')[:top_n]
+
+        # 시간순으로 정렬해서 작성자가 바뀌는 지점의 간격
+        order = np.argsort(ts, kind='stable')
+        sorted_ts = ts[order]
+        sorted_user = user[order]
+        gaps = np.diff(sorted_ts)
+        switched = (sorted_user[1:] != sorted_user[:-1]) & (gaps <= max_response_gap)
+        response = np.sort(gaps[switched]) / 60
+
+        threaded = reply_count > 0
+        lifetimes = np.sort(latest_reply[threaded] - ts[threaded])
+        lifetimes = lifetimes[lifetimes > 0] / 3600
+
+        return self._report(
+            total=len(ts),
+            first_day=first_day,
+            daily=daily.tolist(),
+            hourly=hourly.tolist(),
+            weekday=weekday.tolist(),
+            periods=(recent, weekly, len(ts) - recent - weekly),
+            top_users=[(self.user_ids[i], int(user_counts[i])) for i in top.tolist() if user_counts[i]],
+            active_users=int(np.count_nonzero(user_counts)),
+            response=response.tolist(),
+            threads=int(np.count_nonzero(threaded)),
+            replies=int(reply_count.sum()),
+            max_replies=int(reply_count.max()),
+            lifetimes=lifetimes.tolist(),
+            text_length=float(text_length.mean())
+        )
+
+    def _analyze_python(self, now, top_n, max_response_gap, utc_offset):
+        total = len(self.ts)
+        days = [int((ts + utc_offset) // 86400) for ts in self.ts]
+        first_day = min(days)
+        daily = [0] * (max(days) - first_day + 1)
+        hourly = [0] * 24
+        weekday = [0] * 7
+        for ts, day in zip(self.ts, days):
+            daily[day - first_day] += 1
+            hourly[int((ts + utc_offset) % 86400 // 3600)] += 1
+            weekday[(day + 3) % 7] += 1
+
+        recent = weekly = 0
+        for ts in self.ts:
+            days_ago = (now - ts) // 86400
+            if days_ago <= 7:
+                recent += 1
+            elif days_ago <= 14:
+                weekly += 1
+
+        user_counts = [0] * len(self.user_ids)
+        for index in self.user:
+            if index >= 0:
+                user_counts[index] += 1
+        top = sorted(range(len(user_counts)), key=lambda i: -user_counts[i])[:top_n]
+
+        ordered = sorted(zip(self.ts, self.user))
+        response = sorted(
+            (ts - previous_ts) / 60
+            for (previous_ts, previous_user), (ts, user) in zip(ordered, ordered[1:])
+            if user != previous_user and ts - previous_ts <= max_response_gap
+        )
+
+        threads = replies = max_replies = 0
+        lifetimes = []
+        for ts, count, latest in zip(self.ts, self.reply_count, self.latest_reply):
+            if count > 0:
+                threads += 1
+                replies += count
+                if latest > ts:
+                    lifetimes.append((latest - ts) / 3600)
+            max_replies = max(max_replies, count)
+
+        return self._report(
+            total=total,
+            first_day=first_day,
+            daily=daily,
+            hourly=hourly,
+            weekday=weekday,
+            periods=(recent, weekly, total - recent - weekly),
+            top_users=[(self.user_ids[i], user_counts[i]) for i in top if user_counts[i]],
+            active_users=sum(1 for count in user_counts if count),
+            response=response,
+            threads=threads,
+            replies=replies,
+            max_replies=max_replies,
+            lifetimes=sorted(lifetimes),
+            text_length=sum(self.text_length) / total
+        )
+
+    def _report(self, total, first_day, daily, hourly, weekday, periods, top_users, active_users,
+                response, threads, replies, max_replies, lifetimes, text_length):
+        """두 계산 경로의 결과를 같은 형태의 dict로 정리"""
+        daily_counts = [
+            (datetime.fromtimestamp((first_day + i) * 86400, timezone.utc).strftime('%Y-%m-%d'), count)
+            for i, count in enumerate(daily) if count
+        ]
+        busiest_day = max(daily_counts, key=lambda item: item[1])
+        peak_hour = max(range(24), key=lambda hour: hourly[hour])
+
+        return {
+            'total': total,
+            'active_users': active_users,
+            'top_users': top_users,
+            'periods': {'recent': periods[0], 'weekly': periods[1], 'monthly': periods[2]},
+            'daily': daily_counts,
+            'hourly': hourly,
+            'weekday': weekday,
+            'busiest_day': busiest_day,
+            'peak_hour': peak_hour,
+            'busiest_weekday': WEEKDAY_NAMES[max(range(7), key=lambda i: weekday[i])],
+            'response_minutes': {
+                'samples': len(response),
+                'p50': round(percentile(response, 50), 1) if response else None,
+                'p90': round(percentile(response, 90), 1) if response else None,
+            },
+            'threads': {
+                'count': threads,
+                'replies': replies,
+                'avg_replies': round(replies / threads, 1) if threads else 0.0,
+                'max_replies': max_replies,
+                'share': round(threads / total * 100, 1),
+                'lifetime_hours_p50': round(percentile(lifetimes, 50), 1) if lifetimes else None,
+            },
+            'avg_text_length': round(text_length, 1),
+        }
+
+
+if __name__ == '__main__':
+    # 60일치 가상 메시지로 numpy / 순수 파이썬 경로 결과 비교 + 기존 방식(메시지마다 datetime)과 속도 비교
+    import random
+
+    now = time.time()
+    columns = MessageColumns()
+    messages = []
+    generator = random.Random(0)
+    for i in range(60 * 2000):
+        ts = now - generator.uniform(0, 60 * 86400)
+        replies = generator.choice([0, 0, 0, 0, 1, 3, 12])
+        message = {'user': f"U{generator.randrange(80)}", 'text': 'x' * generator.randrange(200),
+                   'reply_count': replies, 'latest_reply': f"{ts + replies * 600:.6f}" if replies else None}
+        messages.append((message, ts))
+        columns.append(message, ts)
+
+    started_at = time.perf_counter()
+    baseline_daily = {}
+    baseline_users = {}
+    for message, ts in messages:
+        date_key = datetime.fromtimestamp(ts).strftime('%Y-%m-%d')
+        baseline_daily[date_key] = baseline_daily.get(date_key, 0) + 1
+        baseline_users[message['user']] = baseline_users.get(message['user'], 0) + 1
+    baseline_seconds = time.perf_counter() - started_at
+
+    timings = {}
+    reports = {}
+    for name, analyze in [('numpy', columns._analyze_numpy), ('python', columns._analyze_python)]:
+        if name == 'numpy' and np is None:
+            continue
+        started_at = time.perf_counter()
+        reports[name] = analyze(now, 5, 4 * 3600, time.localtime(now).tm_gmtoff)
+        timings[name] = time.perf_counter() - started_at
+
+    assert dict(reports['python']['daily']) == baseline_daily
+    if 'numpy' in reports:
+        assert reports['numpy'] == reports['python'], "numpy / python 결과가 다릅니다"
+    print(f"{len(columns)}개 메시지: 기존 방식(일별+사용자별만) {baseline_seconds * 1000:.0f}ms, "
+          + ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in timings.items()))
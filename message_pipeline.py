@@ -0,0 +1,105 @@
+import random
+import time
+
+from mapreduce import bucket_start
+from message_columns import MessageColumns
+
+
+def is_real_message(message):
+    """봇/시스템 메시지가 아닌 실제 대화인지"""
+    return not message.get('bot_id') and not message.get('subtype')
+
+
+class ReservoirSampler:
+    """최대 k개만 보관하는 균등 표본 추출 (reservoir sampling)"""
+
+    def __init__(self, k, seed=None):
+        self.k = k
+        self.seen = 0
+        self.items = []
+        self._random = random.Random(seed)
+
+    def add(self, item):
+        self.seen += 1
+        if len(self.items) < self.k:
+            self.items.append(item)
+        else:
+            index = self._random.randrange(self.seen)
+            if index < self.k:
+                self.items[index] = item
+
+
+class ActivityStats:
+    """메시지를 한 번 훑으면서 필터링 + 메타데이터 수집 (메시지 본문은 따로 보관하지 않음)
+
+    통계는 열 단위 배열(MessageColumns)에 모아뒀다가 analyze()에서 한꺼번에 계산한다.
+    """
+
+    def __init__(self, now=None):
+        self.now = now or time.time()
+        self.scanned = 0
+        self.total = 0
+        self.latest_ts = 0.0
+        self.columns = MessageColumns()
+
+    def add(self, message):
+        """메시지 하나 반영. 실제 대화 메시지면 True"""
+        self.scanned += 1
+        if not is_real_message(message):
+            return False
+
+        try:
+            ts = float(message.get('ts', 0))
+        except (TypeError, ValueError):
+            return False
+
+        self.total += 1
+        if ts > self.latest_ts:
+            self.latest_ts = ts
+        self.columns.append(message, ts)
+        return True
+
+    def analyze(self, top_n=5):
+        """일별/시간대별/요일별 분포, 사용자별 메시지 수, 응답 간격, 스레드 통계"""
+        return self.columns.analyze(self.now, top_n)
+
+
+class Bucket:
+    """한 구간의 메시지 수 / 최신 ts / 표본"""
+
+    def __init__(self, start, sample_size):
+        self.start = start
+        self.count = 0
+        self.latest_ts = 0.0
+        self._sampler = ReservoirSampler(sample_size, seed=start.isoformat())
+
+    def add(self, message):
+        self.count += 1
+        ts = float(message['ts'])
+        if ts > self.latest_ts:
+            self.latest_ts = ts
+        self._sampler.add(message)
+
+    def sample(self):
+        """표본 메시지 (시간순)"""
+        return sorted(self._sampler.items, key=lambda msg: float(msg['ts']))
+
+
+class BucketSampler:
+    """메시지를 일/주 구간별로 나누면서 구간마다 제한된 표본만 보관"""
+
+    def __init__(self, bucket_days, sample_size):
+        self.bucket_days = bucket_days
+        self.sample_size = sample_size
+        self._buckets = {}
+
+    def add(self, message):
+        start = bucket_start(message['ts'], self.bucket_days)
+        bucket = self._buckets.get(start)
+        if bucket is None:
+            bucket = self._buckets[start] = Bucket(start, self.sample_size)
+        bucket.add(message)
+
+    def buckets(self):
+        """오래된 구간부터 [(start, Bucket)]"""
+        return [(start, self._buckets[start]) for start in sorted(self._buckets)]
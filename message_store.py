@@ -0,0 +1,166 @@
+import json
+import os
+import sqlite3
+import threading
+
+
+class MessageStore:
+    """채널 메시지 로컬 저장소 (SQLite, 채널 + ts 기준)
+
+    채널별로 동기화된 구간(oldest_ts ~ latest_ts)을 기록해두고,
+    다음 요청에서는 그 이후의 새 메시지만 Slack에서 가져오도록 한다.
+    스레드 요약도 마지막으로 반영한 답글 ts와 함께 저장해서 다음 요약에는 새 답글만 더한다.
+    스케줄러가 미리 만든 채널 다이제스트도 여기 저장해서 모든 워커가 같이 쓴다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._conn()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS messages (
+                channel TEXT NOT NULL,
+                ts TEXT NOT NULL,
+                ts_num REAL NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (channel, ts)
+            );
+            CREATE INDEX IF NOT EXISTS idx_messages_channel_ts ON messages (channel, ts_num);
+            CREATE TABLE IF NOT EXISTS sync_state (
+                channel TEXT PRIMARY KEY,
+                oldest_ts REAL NOT NULL,
+                latest_ts REAL NOT NULL,
+                synced_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS thread_summaries (
+                channel TEXT NOT NULL,
+                thread_ts TEXT NOT NULL,
+                last_reply_ts TEXT NOT NULL,
+                message_count INTEGER NOT NULL,
+                summary TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (channel, thread_ts)
+            );
+            CREATE TABLE IF NOT EXISTS digests (
+                channel TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                period INTEGER NOT NULL,
+                latest_ts REAL NOT NULL,
+                message_count INTEGER NOT NULL,
+                summary TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (channel, kind, period)
+            );
+        """)
+        conn.commit()
+
+    def _conn(self):
+        """스레드별 커넥션 (sqlite 커넥션은 스레드 간 공유하지 않음)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def save_messages(self, channel_id, messages):
+        """메시지 저장 (같은 ts는 덮어씀)"""
+        if not messages:
+            return
+        rows = [
+            (channel_id, msg['ts'], float(msg['ts']), json.dumps(msg, ensure_ascii=False))
+            for msg in messages if msg.get('ts')
+        ]
+        conn = self._conn()
+        conn.executemany(
+            'INSERT OR REPLACE INTO messages (channel, ts, ts_num, data) VALUES (?, ?, ?, ?)',
+            rows
+        )
+        conn.commit()
+
+    def iter_messages(self, channel_id, oldest_ts, latest_ts=None):
+        """저장된 메시지를 하나씩 읽기 (Slack API와 같은 최신순, 전체를 메모리에 올리지 않음)"""
+        query = 'SELECT data FROM messages WHERE channel = ? AND ts_num > ?'
+        params = [channel_id, oldest_ts]
+        if latest_ts is not None:
+            query += ' AND ts_num <= ?'
+            params.append(latest_ts)
+        query += ' ORDER BY ts_num DESC'
+
+        for row in self._conn().execute(query, params):
+            yield json.loads(row[0])
+
+    def get_messages(self, channel_id, oldest_ts, latest_ts=None):
+        """저장된 메시지 조회 (Slack API와 같은 최신순)"""
+        return list(self.iter_messages(channel_id, oldest_ts, latest_ts))
+
+    def get_sync_state(self, channel_id):
+        """채널의 동기화 구간 (oldest_ts, latest_ts). 없으면 None"""
+        row = self._conn().execute(
+            'SELECT oldest_ts, latest_ts FROM sync_state WHERE channel = ?',
+            (channel_id,)
+        ).fetchone()
+        return row if row else None
+
+    def update_sync_state(self, channel_id, oldest_ts, latest_ts, synced_at):
+        conn = self._conn()
+        conn.execute(
+            'INSERT OR REPLACE INTO sync_state (channel, oldest_ts, latest_ts, synced_at) VALUES (?, ?, ?, ?)',
+            (channel_id, oldest_ts, latest_ts, synced_at)
+        )
+        conn.commit()
+
+    def get_thread_summary(self, channel_id, thread_ts):
+        """마지막으로 요약한 스레드 상태 (last_reply_ts, message_count, summary). 없으면 None"""
+        row = self._conn().execute(
+            'SELECT last_reply_ts, message_count, summary FROM thread_summaries WHERE channel = ? AND thread_ts = ?',
+            (channel_id, thread_ts)
+        ).fetchone()
+        return row if row else None
+
+    def save_thread_summary(self, channel_id, thread_ts, last_reply_ts, message_count, summary, updated_at):
+        conn = self._conn()
+        conn.execute(
+            'INSERT OR REPLACE INTO thread_summaries '
+            '(channel, thread_ts, last_reply_ts, message_count, summary, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+            (channel_id, thread_ts, last_reply_ts, message_count, summary, updated_at)
+        )
+        conn.commit()
+
+    def get_digest(self, channel_id, kind, window):
+        """미리 만든 요약 (latest_ts, message_count, summary, created_at). 없으면 None"""
+        row = self._conn().execute(
+            'SELECT latest_ts, message_count, summary, created_at FROM digests WHERE channel = ? AND kind = ? AND period = ?',
+            (channel_id, kind, window)
+        ).fetchone()
+        return row if row else None
+
+    def save_digest(self, channel_id, kind, window, latest_ts, message_count, summary, created_at):
+        conn = self._conn()
+        conn.execute(
+            'INSERT OR REPLACE INTO digests '
+            '(channel, kind, period, latest_ts, message_count, summary, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (channel_id, kind, window, latest_ts, message_count, summary, created_at)
+        )
+        conn.commit()
+
+    def stats(self):
+        """저장소 통계"""
+        conn = self._conn()
+        message_count = conn.execute('SELECT COUNT(*) FROM messages').fetchone()[0]
+        channel_count = conn.execute('SELECT COUNT(*) FROM sync_state').fetchone()[0]
+        thread_count = conn.execute('SELECT COUNT(*) FROM thread_summaries').fetchone()[0]
+        digest_count = conn.execute('SELECT COUNT(*) FROM digests').fetchone()[0]
+        return {
+            'path': self.path,
+            'messages': message_count,
+            'channels': channel_count,
+            'thread_summaries': thread_count,
+            'digests': digest_count,
+        }
@@ -0,0 +1,176 @@
+import bisect
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+
+# 초 단위 히스토그램 기본 구간 (Slack API 수십 ms ~ LLM 수십 초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Prometheus 형식 히스토그램 (라벨 조합별 구간 카운트 / 합계 / 개수)"""
+
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, '') for name in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, [list(counts), total, count]) for key, (counts, total, count) in self._series.items())
+        for key, (counts, total, count) in series:
+            labels = list(zip(self.label_names, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', repr(bound))])} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', '+Inf')])} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {total!r}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class Counter:
+    """Prometheus 형식 카운터"""
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, '') for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.append(f"{self.name}{_format_labels(list(zip(self.label_names, key)))} {_format_value(value)}")
+        return lines
+
+
+class Callback:
+    """수집 시점에 함수를 호출해서 값을 읽는 게이지/카운터 (기존 stats()를 그대로 노출)
+
+    fn은 숫자 하나 또는 [(라벨 dict, 값)] 목록을 반환한다.
+    """
+
+    def __init__(self, name, help_text, fn, kind='gauge'):
+        self.name = name
+        self.help_text = help_text
+        self.fn = fn
+        self.kind = kind
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        try:
+            value = self.fn()
+        except Exception as e:
+            return lines + [f"# 수집 오류: {e}"]
+        samples = value if isinstance(value, list) else [({}, value)]
+        for labels, sample in samples:
+            if sample is not None:
+                lines.append(f"{self.name}{_format_labels(sorted(labels.items()))} {_format_value(sample)}")
+        return lines
+
+
+class Registry:
+    """/metrics 로 내보낼 지표 모음"""
+
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, label_names, buckets))
+
+    def counter(self, name, help_text, label_names=()):
+        return self._register(Counter(name, help_text, label_names))
+
+    def callback(self, name, help_text, fn, kind='gauge'):
+        return self._register(Callback(name, help_text, fn, kind))
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+STAGE_SECONDS = registry.histogram(
+    'flask_bot_stage_seconds', '요청 처리 단계별 소요 시간 (초)', ('stage', 'outcome')
+)
+
+
+@contextmanager
+def span(stage):
+    """with span('stage'): 블록 소요 시간을 단계별 히스토그램에 기록 (예외가 나면 outcome=error)"""
+    started_at = time.perf_counter()
+    outcome = 'ok'
+    try:
+        yield
+    except Exception:
+        outcome = 'error'
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - started_at, stage=stage, outcome=outcome)
+
+
+def timed(stage):
+    """함수 실행 시간을 단계별 히스토그램에 기록하는 데코레이터 (코루틴 함수도 지원)"""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,102 @@
+import threading
+import time
+
+from applog import get_logger
+
+log = get_logger('progressive_message')
+
+
+class ProgressiveMessage:
+    """자리표시 메시지를 먼저 올리고, 생성 중인 내용을 chat.update로 점진적으로 갱신
+
+    갱신은 min_interval 간격으로 합쳐서 보내고(중간 내용은 버림),
+    마지막 finish()는 항상 최종 내용으로 갱신한다.
+    중간 갱신은 update_fn(..., wait=False)로 보내서 rate limit 토큰이 없으면 기다리지 않고 건너뛴다
+    (동시에 여러 요약을 스트리밍해도 생성이 chat.update 한도에 묶이지 않도록).
+    """
+
+    def __init__(self, channel, post_fn, update_fn, min_interval=1.2):
+        self.channel = channel
+        self.post_fn = post_fn
+        self.update_fn = update_fn
+        self.min_interval = min_interval
+        self.ts = None
+        self._lock = threading.Lock()
+        self._last_update_at = 0.0
+        self._last_text = None
+        self.started_at = None
+        self.first_content_at = None
+        self.updates = 0
+        self.skipped = 0
+
+    def start(self, text):
+        """자리표시 메시지 전송. 실패하면 finish()에서 새 메시지로 보냄"""
+        self.started_at = time.time()
+        self.ts = self.post_fn(self.channel, text)
+        self._last_update_at = self.started_at
+        self._last_text = text
+        return self.ts
+
+    def update(self, text):
+        """생성 중인 내용 반영 (너무 잦은 호출은 건너뜀)"""
+        if not self.ts or text == self._last_text:
+            return
+
+        with self._lock:
+            now = time.time()
+            # 첫 내용은 바로 보여주고, 그 다음부터 간격을 둠
+            if self.first_content_at is not None and now - self._last_update_at < self.min_interval:
+                self.skipped += 1
+                return
+            self._last_update_at = now
+            self._last_text = text
+
+        if self.update_fn(self.channel, self.ts, text, wait=False):
+            self.updates += 1
+            if self.first_content_at is None:
+                self.first_content_at = time.time()
+                log.info("첫 내용 표시", channel=self.channel, seconds=round(self.first_content_at - self.started_at, 3))
+
+    def finish(self, text):
+        """최종 내용으로 갱신 (자리표시가 없거나 갱신에 실패하면 새로 전송)"""
+        if self.ts and self.update_fn(self.channel, self.ts, text):
+            self.updates += 1
+            return True
+        return bool(self.post_fn(self.channel, text))
+
+
+class AsyncProgressiveMessage(ProgressiveMessage):
+    """ProgressiveMessage의 asyncio 버전 (post_fn / update_fn은 코루틴 함수)
+
+    한 이벤트 루프 안에서만 쓰므로 잠금 없이 갱신 간격만 확인한다.
+    """
+
+    async def start(self, text):
+        self.started_at = time.time()
+        self.ts = await self.post_fn(self.channel, text)
+        self._last_update_at = self.started_at
+        self._last_text = text
+        return self.ts
+
+    async def update(self, text):
+        if not self.ts or text == self._last_text:
+            return
+
+        now = time.time()
+        if self.first_content_at is not None and now - self._last_update_at < self.min_interval:
+            self.skipped += 1
+            return
+        self._last_update_at = now
+        self._last_text = text
+
+        if await self.update_fn(self.channel, self.ts, text, wait=False):
+            self.updates += 1
+            if self.first_content_at is None:
+                self.first_content_at = time.time()
+                log.info("첫 내용 표시", channel=self.channel, seconds=round(self.first_content_at - self.started_at, 3))
+
+    async def finish(self, text):
+        if self.ts and await self.update_fn(self.channel, self.ts, text):
+            self.updates += 1
+            return True
+        return bool(await self.post_fn(self.channel, text))
@@ -0,0 +1,101 @@
+import math
+
+# 모델별 대화 본문에 쓸 기본 토큰 예산 (PROMPT_TOKEN_BUDGET 환경 변수로 덮어씀)
+MODEL_TOKEN_BUDGETS = {
+    'gemini-1.5-flash': 30000,
+    'gemini-1.5-pro': 60000,
+}
+DEFAULT_TOKEN_BUDGET = 8000
+
+
+def token_budget_for(model_name, override=None):
+    """모델에 맞는 프롬프트 토큰 예산"""
+    if override:
+        return int(override)
+    return MODEL_TOKEN_BUDGETS.get(model_name, DEFAULT_TOKEN_BUDGET)
+
+
+def estimate_tokens(text):
+    """토큰 수 대략 추정 (영문/숫자 약 4자당 1토큰, 한글 등은 약 1.5자당 1토큰)
+
+    UTF-8 바이트 길이 차이로 비ASCII 글자 수를 세서 글자 단위 루프 없이 계산한다.
+    """
+    if not text:
+        return 0
+    extra_bytes = len(text.encode('utf-8')) - len(text)
+    non_ascii = extra_bytes // 2  # 한글은 3바이트 → 글자당 2바이트 추가
+    ascii_chars = max(0, len(text) - non_ascii)
+    return max(1, math.ceil(ascii_chars / 4 + non_ascii / 1.5))
+
+
+def truncate_to_tokens(text, max_tokens):
+    """토큰 예산에 맞게 텍스트 자르기"""
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text, tokens
+    keep = max(1, int(len(text) * max_tokens / tokens))
+    text = text[:keep] + "..."
+    return text, estimate_tokens(text)
+
+
+def signal_score(message, author_counts):
+    """요약에 중요한 메시지일수록 높은 점수
+
+    스레드 시작 메시지 / 답글 수 / 리액션 수 / 길이를 반영하고,
+    말을 적게 한 참여자의 메시지도 빠지지 않도록 가중치를 준다.
+    """
+    score = 1.0
+    reply_count = message.get('reply_count', 0) or 0
+    if reply_count:
+        score += 2.0 + math.log1p(reply_count)
+    reactions = sum(reaction.get('count', 0) for reaction in message.get('reactions', []) or [])
+    if reactions:
+        score += math.log1p(reactions)
+    score += 0.5 * math.log1p(len(message.get('text', '')) / 50)
+    author_count = author_counts.get(message.get('user'), 1)
+    score += 1.0 / author_count
+    return score
+
+
+class PackResult:
+    """프롬프트에 실제로 들어간 양"""
+
+    def __init__(self, included, total, tokens, budget):
+        self.included = included
+        self.total = total
+        self.tokens = tokens
+        self.budget = budget
+
+    def describe(self):
+        ratio = self.included / self.total * 100 if self.total else 100
+        return f"{self.included}/{self.total}개 메시지 반영 ({ratio:.0f}%), 약 {self.tokens:,}/{self.budget:,} 토큰"
+
+
+def pack(entries, budget, max_message_tokens=300):
+    """토큰 예산 안에서 중요한 메시지부터 채우기
+
+    entries: [(message, line)] (시간순)
+    반환: (예산 안에 들어간 line 목록 (시간순), PackResult)
+    """
+    author_counts = {}
+    for message, _ in entries:
+        user_id = message.get('user')
+        author_counts[user_id] = author_counts.get(user_id, 0) + 1
+
+    candidates = []
+    for index, (message, line) in enumerate(entries):
+        line, tokens = truncate_to_tokens(line, max_message_tokens)
+        # 점수가 같으면 최근 메시지 우선
+        candidates.append((signal_score(message, author_counts), index, line, tokens))
+    candidates.sort(key=lambda c: (c[0], c[1]), reverse=True)
+
+    chosen = []
+    used = 0
+    for score, index, line, tokens in candidates:
+        if used + tokens + 1 > budget:
+            continue  # 더 짧은 메시지는 아직 들어갈 수 있음
+        chosen.append((index, line))
+        used += tokens + 1  # 줄바꿈
+
+    chosen.sort()
+    return [line for _, line in chosen], PackResult(len(chosen), len(entries), used, budget)
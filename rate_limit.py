@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """토큰 버킷 (초당 rate개씩 채워지고 최대 capacity개까지 모임)"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def try_acquire(self, cost=1):
+        """토큰이 충분하면 바로 차감하고 True"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= cost:
+                self._tokens -= cost
+                return True
+            return False
+
+    def acquire(self, cost=1):
+        """토큰이 생길 때까지 기다렸다가 차감. 기다린 시간(초) 반환"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return waited
+                wait = (cost - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, cost=1):
+        """acquire()와 같지만 기다리는 동안 이벤트 루프를 막지 않음"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return waited
+                wait = (cost - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def refund(self, cost=1):
+        """차감했던 토큰 되돌리기 (여러 버킷을 함께 잡다가 실패한 경우)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + cost)
+
+    def level(self):
+        """현재 남은 토큰 수"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
@@ -0,0 +1,196 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows 등 (단일 프로세스로 간주)
+    fcntl = None
+
+from applog import get_logger
+
+log = get_logger('scheduler')
+
+WEEKDAYS = {'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6}
+
+
+def parse_times(value):
+    """"06:00,12:30" → [(6, 0), (12, 30)]"""
+    times = []
+    for part in value.split(','):
+        part = part.strip()
+        if part:
+            hour, minute = part.split(':')
+            times.append((int(hour), int(minute)))
+    return times
+
+
+def parse_weekly(value):
+    """"mon 06:30" → (0, 6, 30)"""
+    day, at = value.split()
+    hour, minute = parse_times(at)[0]
+    return WEEKDAYS[day.lower()[:3]], hour, minute
+
+
+class ScheduledJob:
+    """매일(weekday=None) 또는 매주 정해진 시각에 실행할 작업"""
+
+    def __init__(self, name, func, hour, minute, weekday=None):
+        self.name = name
+        self.func = func
+        self.hour = hour
+        self.minute = minute
+        self.weekday = weekday
+        self.next_run = None
+        self.deferred = 0
+        self.runs = 0
+        self.failures = 0
+        self.last_run_at = None
+        self.last_seconds = None
+
+    def next_time(self, now):
+        """now 이후 가장 가까운 실행 시각 (지터 제외)"""
+        candidate = now.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        if self.weekday is not None:
+            candidate += timedelta(days=(self.weekday - candidate.weekday()) % 7)
+            if candidate <= now:
+                candidate += timedelta(days=7)
+        elif candidate <= now:
+            candidate += timedelta(days=1)
+        return candidate
+
+
+class Scheduler:
+    """프로세스 내 cron 형식 스케줄러
+
+    - 실행 시각마다 0~jitter초 임의 지연을 더해서 작업이 한꺼번에 몰리지 않게 한다.
+    - 동시에 실행되는 작업은 max_concurrent개로 제한한다.
+    - busy_fn()이 True면(실시간 요청 처리 중) defer_seconds씩 미루고, max_defers번 넘게 밀리면 그냥 실행한다.
+    - gunicorn 워커가 여러 개여도 파일 잠금을 잡은 워커 하나만 실행한다 (리더가 죽으면 다른 워커가 이어받음).
+    """
+
+    def __init__(self, lock_path, max_concurrent=1, jitter=600, busy_fn=None,
+                 defer_seconds=60, max_defers=10, tick=15, name='scheduler'):
+        self.lock_path = lock_path
+        self.jitter = jitter
+        self.busy_fn = busy_fn
+        self.defer_seconds = defer_seconds
+        self.max_defers = max_defers
+        self.tick = tick
+        self.name = name
+        self.jobs = []
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._lock_file = None
+        self._thread = None
+        self._stop = threading.Event()
+        self.max_concurrent = max_concurrent
+        self.running = 0
+        self.is_leader = False
+
+    def every_day(self, name, hour, minute, func):
+        self._add(ScheduledJob(name, func, hour, minute))
+
+    def every_week(self, name, weekday, hour, minute, func):
+        self._add(ScheduledJob(name, func, hour, minute, weekday))
+
+    def _add(self, job):
+        job.next_run = self._with_jitter(job.next_time(datetime.now()))
+        self.jobs.append(job)
+
+    def _with_jitter(self, when):
+        return when + timedelta(seconds=random.uniform(0, self.jitter))
+
+    def start(self):
+        """스케줄러 스레드 시작 (작업이 없거나 이미 시작했으면 무시)"""
+        if not self.jobs or self._thread:
+            return
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+        log.info("스케줄러 시작", jobs=len(self.jobs), max_concurrent=self.max_concurrent)
+
+    def stop(self):
+        self._stop.set()
+        self._executor.shutdown(wait=False)
+
+    def _acquire_leadership(self):
+        """파일 잠금으로 리더 워커 선출 (잠금은 프로세스가 끝나면 자동으로 풀림)"""
+        if self.is_leader:
+            return True
+        if fcntl is None:
+            self.is_leader = True
+            return True
+
+        directory = os.path.dirname(self.lock_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lock_file = open(self.lock_path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        self._lock_file = lock_file
+        self.is_leader = True
+        log.info("스케줄러 리더 워커", pid=os.getpid())
+        return True
+
+    def _loop(self):
+        while not self._stop.wait(self.tick):
+            if not self._acquire_leadership():
+                continue
+
+            now = datetime.now()
+            for job in self.jobs:
+                if job.next_run > now:
+                    continue
+
+                if self.busy_fn and job.deferred < self.max_defers and self.busy_fn():
+                    job.deferred += 1
+                    job.next_run = now + timedelta(seconds=self.defer_seconds)
+                    continue
+
+                job.deferred = 0
+                job.next_run = self._with_jitter(job.next_time(now))
+                self._executor.submit(self._run, job)
+
+    def _run(self, job):
+        started_at = time.time()
+        with self._lock:
+            self.running += 1
+        try:
+            job.func()
+        except Exception as e:
+            job.failures += 1
+            log.error("예약 작업 오류", job=job.name, error=e)
+        finally:
+            with self._lock:
+                self.running -= 1
+            job.runs += 1
+            job.last_run_at = started_at
+            job.last_seconds = time.time() - started_at
+            log.info("예약 작업 완료", job=job.name, seconds=round(job.last_seconds, 1))
+
+    def stats(self):
+        with self._lock:
+            running = self.running
+        return {
+            'leader': self.is_leader,
+            'running': running,
+            'max_concurrent': self.max_concurrent,
+            'jobs': [
+                {
+                    'name': job.name,
+                    'next_run': job.next_run.isoformat(timespec='seconds') if job.next_run else None,
+                    'runs': job.runs,
+                    'failures': job.failures,
+                    'deferred': job.deferred,
+                    'last_seconds': round(job.last_seconds, 3) if job.last_seconds is not None else None,
+                }
+                for job in self.jobs
+            ],
+        }
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+
+from applog import get_logger
+
+log = get_logger('singleflight')
+
+
+class _Call:
+    """실행 중인 작업 하나 (결과를 기다리는 요청들이 같이 받음)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """같은 키의 작업이 이미 실행 중이면 새로 실행하지 않고 그 결과를 같이 받음
+
+    키는 (kind, 채널, 기간) 형식. 먼저 들어온 요청만 실제로 실행하고,
+    그동안 들어온 같은 키의 요청은 끝날 때까지 기다렸다가 같은 결과(또는 같은 예외)를 받는다.
+    """
+
+    def __init__(self, name='singleflight'):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def do(self, key, func, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            log.info("실행 중인 같은 요청에 합류", flight=self.name, key=key)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'waiting': sum(call.waiters for call in self._calls.values()),
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'failed': self.failed,
+            }
+
+
+class AsyncSingleFlight:
+    """SingleFlight의 asyncio 버전 (한 이벤트 루프 안에서만 사용)
+
+    먼저 들어온 요청의 코루틴만 실행하고, 같은 키로 들어온 요청은 그 Future를 같이 기다린다.
+    """
+
+    def __init__(self, name='singleflight'):
+        self.name = name
+        self._calls = {}  # key -> (Future, 합류한 요청 수)
+        self.executed = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    async def do(self, key, func, *args, **kwargs):
+        call = self._calls.get(key)
+        if call is not None:
+            call[1] += 1
+            self.coalesced += 1
+            log.info("실행 중인 같은 요청에 합류", flight=self.name, key=key)
+            # 기다리던 요청이 취소돼도 실행 중인 작업은 취소하지 않음
+            return await asyncio.shield(call[0])
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = [future, 0]
+        self.executed += 1
+        try:
+            result = await func(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self.failed += 1
+            future.set_exception(e)
+            future.exception()  # 기다리는 요청이 없어도 경고가 남지 않도록 확인 처리
+            raise
+        finally:
+            del self._calls[key]
+
+    def stats(self):
+        return {
+            'in_flight': len(self._calls),
+            'waiting': sum(waiters for _, waiters in self._calls.values()),
+            'executed': self.executed,
+            'coalesced': self.coalesced,
+            'failed': self.failed,
+        }
@@ -0,0 +1,328 @@
+import asyncio
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from applog import get_logger
+from metrics import registry
+from rate_limit import TokenBucket
+
+# Slack Web API 메서드별 rate limit tier (https://api.slack.com/docs/rate-limits)
+METHOD_TIERS = {
+    'conversations.history': 3,
+    'conversations.replies': 3,
+    'conversations.list': 2,
+    'users.conversations': 3,
+    'users.list': 2,
+    'users.info': 4,
+    'chat.postMessage': 'post',
+    'chat.update': 3,
+}
+
+# tier별 분당 허용 호출 수 (chat.postMessage는 채널당 초당 1회 정도)
+TIER_RATES_PER_MINUTE = {1: 1, 2: 20, 3: 50, 4: 100, 'post': 60}
+
+log = get_logger('slack_client')
+
+SLACK_API_SECONDS = registry.histogram(
+    'flask_bot_slack_api_seconds', 'Slack Web API 호출 소요 시간 (초, 재시도는 각각 기록)', ('method', 'outcome')
+)
+
+
+class SlackClient:
+    """Slack Web API 공용 클라이언트
+
+    커넥션 풀(keep-alive)을 하나의 HTTPAdapter로 공유하고, 세션은 스레드마다 따로 둔다.
+    (requests.Session 자체는 스레드 안전하지 않지만 어댑터의 urllib3 풀은 안전함)
+    """
+
+    def __init__(self, token, base_url='https://slack.com/api', connect_timeout=3.05,
+                 read_timeout=30, pool_size=10, max_retries=3):
+        self.token = token
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self._adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._limiters = {}
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            session.headers.update({
+                'Authorization': f'Bearer {self.token}',
+                'Content-Type': 'application/json; charset=utf-8'
+            })
+            self._local.session = session
+        return session
+
+    def get(self, method, params=None):
+        """GET {base_url}/{method}"""
+        return self._request('GET', method, params=params)
+
+    def post(self, method, payload=None, wait=True):
+        """POST {base_url}/{method} (JSON 바디)
+
+        wait=False면 rate limit 토큰이 없을 때 기다리지 않고 None 반환 (건너뛰어도 되는 중간 갱신용)
+        """
+        return self._request('POST', method, wait=wait, json=payload)
+
+    def _limiter(self, method):
+        """메서드 tier에 맞는 토큰 버킷 (짧은 버스트는 허용)"""
+        with self._lock:
+            limiter = self._limiters.get(method)
+            if limiter is None:
+                per_minute = TIER_RATES_PER_MINUTE[METHOD_TIERS.get(method, 3)]
+                limiter = self._limiters[method] = TokenBucket(per_minute / 60.0, max(1, per_minute // 6))
+            return limiter
+
+    def _request(self, http_method, method, wait=True, **kwargs):
+        """tier 속도에 맞춰 호출하고, 429는 Retry-After만큼, 5xx/연결 오류는 백오프 후 재시도"""
+        url = f"{self.base_url}/{method}"
+        limiter = self._limiter(method)
+        attempt = 0
+
+        if not wait and not limiter.try_acquire():
+            return None
+
+        while True:
+            if attempt or wait:
+                limiter.acquire()
+            started_at = time.time()
+            try:
+                response = self._session().request(http_method, url, timeout=self.timeout, **kwargs)
+            except requests.RequestException:
+                self._record(method, time.time() - started_at, error=True)
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self._record_retry(method)
+                time.sleep(self._backoff(attempt))
+                continue
+
+            elapsed = time.time() - started_at
+
+            if response.status_code == 429 and attempt < self.max_retries:
+                retry_after = float(response.headers.get('Retry-After', 1))
+                self._record(method, elapsed, error=True, rate_limited=True)
+                log.warning("Slack rate limit, 재시도 대기", method=method, retry_after=retry_after)
+                attempt += 1
+                self._record_retry(method)
+                time.sleep(retry_after)
+                continue
+
+            if response.status_code >= 500 and attempt < self.max_retries:
+                self._record(method, elapsed, error=True)
+                attempt += 1
+                self._record_retry(method)
+                time.sleep(self._backoff(attempt))
+                continue
+
+            self._record(method, elapsed, error=response.status_code != 200,
+                         rate_limited=response.status_code == 429)
+            return response
+
+    @staticmethod
+    def _backoff(attempt):
+        """지수 백오프 + 지터 (최대 8초)"""
+        return min(8.0, 0.5 * (2 ** (attempt - 1))) * (0.5 + random.random() / 2)
+
+    def _stat(self, method):
+        stat = self._stats.get(method)
+        if stat is None:
+            stat = self._stats[method] = {
+                'calls': 0, 'errors': 0, 'rate_limited': 0, 'retries': 0,
+                'total_seconds': 0.0, 'max_seconds': 0.0
+            }
+        return stat
+
+    def _record(self, method, elapsed, error, rate_limited=False):
+        outcome = 'rate_limited' if rate_limited else 'error' if error else 'ok'
+        SLACK_API_SECONDS.observe(elapsed, method=method, outcome=outcome)
+        with self._lock:
+            stat = self._stat(method)
+            stat['calls'] += 1
+            if error:
+                stat['errors'] += 1
+            if rate_limited:
+                stat['rate_limited'] += 1
+            stat['total_seconds'] += elapsed
+            stat['max_seconds'] = max(stat['max_seconds'], elapsed)
+
+    def _record_retry(self, method):
+        with self._lock:
+            self._stat(method)['retries'] += 1
+
+    def stats(self):
+        """엔드포인트별 호출 수 / 지연시간"""
+        with self._lock:
+            return {
+                method: {
+                    'calls': stat['calls'],
+                    'errors': stat['errors'],
+                    'rate_limited': stat['rate_limited'],
+                    'retries': stat['retries'],
+                    'avg_seconds': round(stat['total_seconds'] / stat['calls'], 3) if stat['calls'] else 0.0,
+                    'max_seconds': round(stat['max_seconds'], 3),
+                }
+                for method, stat in self._stats.items()
+            }
+
+
+class ApiResponse:
+    """AsyncSlackClient 응답 (requests.Response처럼 status_code / headers / json() 제공)"""
+
+    def __init__(self, status_code, headers, data):
+        self.status_code = status_code
+        self.headers = headers
+        self._data = data
+
+    def json(self):
+        if self._data is None:
+            raise ValueError("JSON 응답이 아닙니다")
+        return self._data
+
+
+class AsyncSlackClient:
+    """asyncio용 Slack Web API 클라이언트 (aiohttp)
+
+    tier별 토큰 버킷과 호출 통계는 동기 SlackClient 것을 그대로 같이 써서
+    두 경로를 합쳐도 워크스페이스 rate limit을 넘지 않는다.
+    세션(커넥션 풀)은 이벤트 루프 안에서 처음 호출할 때 만들고 그 루프에서만 쓴다.
+    """
+
+    def __init__(self, client, pool_size=100):
+        self.client = client
+        self.pool_size = pool_size
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None:
+            import aiohttp
+
+            connect_timeout, read_timeout = self.client.timeout
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+                headers={
+                    'Authorization': f'Bearer {self.client.token}',
+                    'Content-Type': 'application/json; charset=utf-8'
+                }
+            )
+        return self._session
+
+    async def get(self, method, params=None):
+        """GET {base_url}/{method}"""
+        # aiohttp는 쿼리 파라미터에 bool을 받지 않으므로 Slack 형식 문자열로 바꿈
+        if params:
+            params = {key: str(value).lower() if isinstance(value, bool) else value for key, value in params.items()}
+        return await self._request('GET', method, params=params)
+
+    async def post(self, method, payload=None, wait=True):
+        """POST {base_url}/{method} (JSON 바디, wait=False면 토큰이 없을 때 None)"""
+        return await self._request('POST', method, wait=wait, json=payload)
+
+    async def _request(self, http_method, method, wait=True, **kwargs):
+        """SlackClient._request와 같은 재시도 규칙 (429는 Retry-After, 5xx/연결 오류는 백오프)"""
+        import aiohttp
+
+        url = f"{self.client.base_url}/{method}"
+        limiter = self.client._limiter(method)
+        attempt = 0
+
+        if not wait and not limiter.try_acquire():
+            return None
+
+        while True:
+            if attempt or wait:
+                await limiter.acquire_async()
+            started_at = time.time()
+            try:
+                async with self._get_session().request(http_method, url, **kwargs) as raw:
+                    try:
+                        data = await raw.json(content_type=None)
+                    except ValueError:
+                        data = None
+                    response = ApiResponse(raw.status, raw.headers, data)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.client._record(method, time.time() - started_at, error=True)
+                if attempt >= self.client.max_retries:
+                    raise
+                attempt += 1
+                self.client._record_retry(method)
+                await asyncio.sleep(self.client._backoff(attempt))
+                continue
+
+            elapsed = time.time() - started_at
+
+            if response.status_code == 429 and attempt < self.client.max_retries:
+                retry_after = float(response.headers.get('Retry-After', 1))
+                self.client._record(method, elapsed, error=True, rate_limited=True)
+                log.warning("Slack rate limit, 재시도 대기", method=method, retry_after=retry_after)
+                attempt += 1
+                self.client._record_retry(method)
+                await asyncio.sleep(retry_after)
+                continue
+
+            if response.status_code >= 500 and attempt < self.client.max_retries:
+                self.client._record(method, elapsed, error=True)
+                attempt += 1
+                self.client._record_retry(method)
+                await asyncio.sleep(self.client._backoff(attempt))
+                continue
+
+            self.client._record(method, elapsed, error=response.status_code != 200,
+                                rate_limited=response.status_code == 429)
+            return response
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def api_data(response):
+    """Slack Web API 응답 JSON (HTTP 오류나 ok가 아니면 RuntimeError)"""
+    if response.status_code != 200:
+        raise RuntimeError(f"HTTP 오류: {response.status_code}")
+    data = response.json()
+    if not data.get('ok'):
+        raise RuntimeError(f"API 오류: {data.get('error')}")
+    return data
+
+
+def paginate(request, params, max_pages, key='messages', cursor=None):
+    """cursor 페이지네이션 단계 생성기 (동기 / 비동기 경로 공용, steps.run_steps 등으로 실행)
+
+    request(params)는 응답을 돌려줄 Call을 만든다. 빈 페이지나 마지막 페이지(has_more가 false이거나
+    next_cursor가 없음)에서 끝낸다. max_pages가 None이면 페이지 수 제한 없음.
+    (항목 목록, 페이지 수, 끝까지 다 받았는지, 이어 받을 cursor) 반환
+    """
+    items = []
+    pages = 0
+
+    while max_pages is None or pages < max_pages:
+        page_params = dict(params, cursor=cursor) if cursor else params
+        data = api_data((yield request(page_params)))
+
+        page = data.get(key, [])
+        if not page:
+            return items, pages, True, None
+
+        items.extend(page)
+        pages += 1
+
+        cursor = data.get('response_metadata', {}).get('next_cursor')
+        if not cursor or data.get('has_more') is False:
+            return items, pages, True, None
+
+    # 최대 페이지 수 도달 (일부만 받음, cursor로 이어 받을 수 있음)
+    return items, pages, False, cursor
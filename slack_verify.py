@@ -0,0 +1,85 @@
+import hashlib
+import hmac
+import threading
+import time
+
+from applog import get_logger
+
+log = get_logger('slack_verify')
+
+
+class SlackVerifier:
+    """Slack 요청 서명(X-Slack-Signature) 검증
+
+    v0:{timestamp}:{raw body}를 signing secret으로 HMAC-SHA256 한 값과 상수 시간 비교한다.
+    JSON 파싱이나 중복 확인보다 먼저 실행해서 위조/재전송 요청은 바로 버린다.
+    signing secret이 없으면 모든 요청을 'missing_secret'으로 거절한다.
+    로컬 개발에서만 required=False로 검증을 끌 수 있다 (시작 시 경고).
+    """
+
+    def __init__(self, signing_secret, max_skew=300, required=True):
+        self.signing_secret = signing_secret.encode('utf-8') if signing_secret else None
+        self.max_skew = max_skew
+        self.required = required
+        self._lock = threading.Lock()
+        self.verified = 0
+        self.rejected = {
+            'missing_headers': 0,
+            'bad_timestamp': 0,
+            'stale_timestamp': 0,
+            'bad_signature': 0,
+            'missing_secret': 0,
+        }
+        if not self.signing_secret:
+            if required:
+                log.error("SLACK_SIGNING_SECRET이 없어 모든 Slack 요청을 거절합니다")
+            else:
+                log.warning("서명 검증이 꺼져 있습니다 (로컬 개발용)")
+
+    @property
+    def enabled(self):
+        return self.signing_secret is not None or self.required
+
+    def verify(self, headers, raw_body, now=None):
+        """서명이 올바르면 None, 아니면 거절 사유 반환"""
+        if not self.signing_secret:
+            return self._reject('missing_secret') if self.required else None
+
+        timestamp = headers.get('X-Slack-Request-Timestamp')
+        signature = headers.get('X-Slack-Signature')
+        if not timestamp or not signature:
+            return self._reject('missing_headers')
+
+        try:
+            request_time = int(timestamp)
+        except ValueError:
+            return self._reject('bad_timestamp')
+
+        # 오래된 요청은 재전송(replay)으로 보고 서명 계산 없이 거절
+        if abs((now or time.time()) - request_time) > self.max_skew:
+            return self._reject('stale_timestamp')
+
+        basestring = b'v0:' + timestamp.encode('utf-8') + b':' + (raw_body or b'')
+        expected = b'v0=' + hmac.new(self.signing_secret, basestring, hashlib.sha256).hexdigest().encode('ascii')
+        # str끼리 비교하면 비ASCII 문자가 섞인 위조 서명에서 TypeError가 나므로 바이트로 비교
+        if not hmac.compare_digest(expected, signature.encode('utf-8', 'surrogateescape')):
+            return self._reject('bad_signature')
+
+        with self._lock:
+            self.verified += 1
+        return None
+
+    def _reject(self, reason):
+        with self._lock:
+            self.rejected[reason] += 1
+        return reason
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'max_skew_seconds': self.max_skew,
+                'verified': self.verified,
+                'rejected': dict(self.rejected),
+                'rejected_total': sum(self.rejected.values()),
+            }
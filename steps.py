@@ -0,0 +1,106 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Call:
+    """단계 생성기가 yield하는 I/O 한 건
+
+    동기 경로는 func(*args)를 바로 호출하고, 비동기 경로는 await afunc(*args)를 쓴다.
+    afunc가 없으면 비동기 경로에서는 asyncio.to_thread로 실행한다 (SQLite 같은 짧은 블로킹 호출).
+    """
+
+    def __init__(self, func, afunc, *args, **kwargs):
+        self.func = func
+        self.afunc = afunc
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        return self.func(*self.args, **self.kwargs)
+
+    async def arun(self):
+        if self.afunc is None:
+            return await asyncio.to_thread(self.func, *self.args, **self.kwargs)
+        return await self.afunc(*self.args, **self.kwargs)
+
+
+def blocking(func, *args, **kwargs):
+    """블로킹 호출 단계 (비동기 경로에서는 스레드에서 실행)"""
+    return Call(func, None, *args, **kwargs)
+
+
+class Steps:
+    """다른 단계 생성기를 Call 하나처럼 실행 (Gather 안에서 생성기 여러 개를 동시에 돌릴 때)"""
+
+    def __init__(self, factory, *args):
+        self.factory = factory
+        self.args = args
+
+    def run(self):
+        return run_steps(self.factory(*self.args))
+
+    async def arun(self):
+        return await run_steps_async(self.factory(*self.args))
+
+
+class Gather:
+    """Call / Steps 여러 개를 최대 limit개씩 동시에 실행하고 입력 순서대로 결과 반환
+
+    동기 경로는 스레드 풀, 비동기 경로는 세마포어로 제한한 asyncio.gather.
+    하나라도 실패하면 모두 끝난 뒤 첫 번째 예외를 다시 던진다.
+    """
+
+    def __init__(self, calls, limit):
+        self.calls = list(calls)
+        self.limit = max(1, limit)
+
+    def run(self):
+        if len(self.calls) <= 1 or self.limit == 1:
+            return [call.run() for call in self.calls]
+        with ThreadPoolExecutor(max_workers=min(self.limit, len(self.calls))) as executor:
+            futures = [executor.submit(call.run) for call in self.calls]
+            return [future.result() for future in futures]
+
+    async def arun(self):
+        semaphore = asyncio.Semaphore(self.limit)
+
+        async def run_one(call):
+            async with semaphore:
+                return await call.arun()
+
+        results = await asyncio.gather(*(run_one(call) for call in self.calls), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+
+def run_steps(steps):
+    """단계 생성기를 동기로 끝까지 실행하고 반환값을 돌려줌
+
+    yield한 Call에서 난 예외는 그 yield 지점에서 생성기 안으로 다시 던진다.
+    """
+    result, error = None, None
+    while True:
+        try:
+            call = steps.throw(error) if error is not None else steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            result, error = call.run(), None
+        except Exception as e:
+            result, error = None, e
+
+
+async def run_steps_async(steps):
+    """run_steps의 asyncio 버전 (Call은 await로 실행)"""
+    result, error = None, None
+    while True:
+        try:
+            call = steps.throw(error) if error is not None else steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            result, error = await call.arun(), None
+        except Exception as e:
+            result, error = None, e
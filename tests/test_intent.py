@@ -0,0 +1,77 @@
+import pytest
+
+from intent import BOT_MENTION, MAX_LONG_TERM_DAYS, MAX_SHORT_TERM_HOURS, clamp_notice, parse_intent
+
+# (메시지, 스레드 안인지, 기대 kind, 기대 기간)
+EXAMPLES = [
+    (f'{BOT_MENTION} 이 스레드 요약해줘', True, 'thread', None),
+    (f'{BOT_MENTION} 이 스레드 요약해줘', False, 'text', None),
+    (f'{BOT_MENTION} 오늘 채널 대화 요약해줘', False, 'short_term', 24),
+    (f'{BOT_MENTION} 최근 12시간 채널 메시지 요약해줘', False, 'short_term', 12),
+    (f'{BOT_MENTION} 최근 1시간 채널 대화 요약해줘', False, 'short_term', 1),
+    (f'{BOT_MENTION} 어제부터 채널 대화 요약해줘', False, 'short_term', 48),
+    (f'{BOT_MENTION} 최근 3일 채널 대화 요약해줘', False, 'short_term', 72),
+    (f'{BOT_MENTION} 채널 대화 요약해줘', False, 'short_term', 24),
+    (f'{BOT_MENTION} 최근 7일간 채널 분석해줘', False, 'long_term', 7),
+    (f'{BOT_MENTION} 최근 5일 채널 분석해줘', False, 'long_term', 5),
+    (f'{BOT_MENTION} 최근 30일간 채널 분석해줘', False, 'long_term', 30),
+    (f'{BOT_MENTION} 한달간 채널 분석해줘', False, 'long_term', 30),
+    (f'{BOT_MENTION} 한 달 채널 분석해줘', False, 'long_term', 30),
+    (f'{BOT_MENTION} 2주간 채널 분석해줘', False, 'long_term', 14),
+    (f'{BOT_MENTION} 3주 채널 분석해줘', False, 'long_term', 21),
+    (f'{BOT_MENTION} 두달간 채널 분석해줘', False, 'long_term', 60),
+    (f'{BOT_MENTION} 2개월 채널 분석해줘', False, 'long_term', 60),
+    (f'{BOT_MENTION} 일주일 채널 분석해줘', False, 'long_term', 7),
+    (f'{BOT_MENTION} 채널 분석해줘', False, 'long_term', 30),
+    (f'{BOT_MENTION} 1년 채널 분석해줘', False, 'long_term', 30),
+    (f'{BOT_MENTION} 500일 채널 분석해줘', False, 'long_term', MAX_LONG_TERM_DAYS),
+    (f'{BOT_MENTION} 10일간 대화 요약해줘', False, 'long_term', 10),
+    (f'{BOT_MENTION} 10일 채널 대화 요약해줘', False, 'short_term', MAX_SHORT_TERM_HOURS),
+    (f'{BOT_MENTION} 오늘 회의에서 배포 일정을 다음 주로 미루기로 했습니다 요약해줘', False, 'text', None),
+    (f'{BOT_MENTION} <#C01ABCDEF|general> <#C02XYZ> 채널 대화 요약해줘', False, 'multi_channel', 24),
+    (f'{BOT_MENTION} <#C01ABCDEF|general> 최근 12시간 채널 메시지 요약해줘', False, 'multi_channel', 12),
+    (f'{BOT_MENTION} 모든 채널 대화 요약해줘', False, 'multi_channel', 24),
+    (f'{BOT_MENTION} 모든채널 요약해줘', False, 'multi_channel', 24),
+    (f'{BOT_MENTION} 전체 채널들 3일 요약해줘', False, 'multi_channel', 72),
+    (f'{BOT_MENTION} <#C01ABCDEF|general> 최근 12시간 요약해줘', False, 'text', None),
+    (f'{BOT_MENTION} <#C0123ABC> 채널 30일간 분석해줘', False, 'long_term', 30),
+    (f'{BOT_MENTION} 전체 회의 내용: 채널 이전 작업은 다음 주로 미루기로 했습니다 요약해줘', False, 'text', None),
+    (f'{BOT_MENTION} 모든 채널 분석해줘', False, 'long_term', 30),
+    (f'{BOT_MENTION} 도움말', False, 'help', None),
+    (f'{BOT_MENTION} 사용법 알려줘', False, 'help', None),
+    (f'{BOT_MENTION} 안녕', False, 'greeting', None),
+]
+
+
+@pytest.mark.parametrize('text, in_thread, kind, window', EXAMPLES)
+def test_parse_intent(text, in_thread, kind, window):
+    intent = parse_intent(text, in_thread)
+    assert intent.kind == kind
+    assert (intent.days if intent.kind == 'long_term' else intent.hours) == window
+
+
+def test_linked_channels_are_collected_once():
+    intent = parse_intent(f'{BOT_MENTION} <#C01ABCDEF|general> <#C02XYZ> <#C01ABCDEF> 채널 대화 요약해줘')
+    assert intent.channels == ['C01ABCDEF', 'C02XYZ']
+
+
+@pytest.mark.parametrize('text, requested', [
+    (f'{BOT_MENTION} 10일 채널 대화 요약해줘', 240),
+    (f'{BOT_MENTION} 모든 채널 2주 요약해줘', 336),
+    (f'{BOT_MENTION} 500일 채널 분석해줘', 500),
+])
+def test_clamped_window_is_reported(text, requested):
+    intent = parse_intent(text)
+    assert intent.requested == requested
+    assert str(requested) in clamp_notice(intent)
+
+
+@pytest.mark.parametrize('text', [
+    f'{BOT_MENTION} 최근 3일 채널 대화 요약해줘',
+    f'{BOT_MENTION} 7일간 채널 분석해줘',
+    f'{BOT_MENTION} 이 스레드 요약해줘',
+])
+def test_window_within_limit_has_no_notice(text):
+    intent = parse_intent(text, in_thread=True)
+    assert intent.requested is None
+    assert clamp_notice(intent) is None
@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import time
+
+from applog import get_logger
+
+log = get_logger('user_directory')
+
+
+def user_display_name(user):
+    """Slack user 객체에서 표시 이름 추출"""
+    profile = user.get('profile', {})
+    return (user.get('real_name') or profile.get('real_name')
+            or user.get('display_name') or profile.get('display_name')
+            or user.get('name', 'Unknown'))
+
+
+class UserDirectory:
+    """워크스페이스 사용자 디렉터리 (users.list 일괄 로드 + 디스크 저장)
+
+    시작 시 디스크에 저장된 목록으로 바로 채우고, TTL이 지나면
+    백그라운드 스레드에서 users.list 로 전체를 다시 불러온다.
+    """
+
+    def __init__(self, client, path, ttl=3600):
+        self.client = client
+        self.path = path
+        self.ttl = ttl
+        self._names = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        self._loaded = threading.Event()
+        self.refresh_count = 0
+        self.refresh_errors = 0
+
+    def get(self, user_id):
+        """사용자 이름 조회 (없으면 None)"""
+        return self._names.get(user_id)
+
+    def wait_loaded(self, timeout=None):
+        """첫 로드가 끝날 때까지 대기 (콜드 스타트 시 개별 조회 폭주 방지)"""
+        if self._thread is None:
+            return False  # 시작하지 않은 디렉터리
+        return self._loaded.wait(timeout)
+
+    def is_stale(self):
+        return time.time() - self._loaded_at > self.ttl
+
+    def start(self):
+        """디스크에서 불러오고 백그라운드 갱신 스레드 시작"""
+        self.load_from_disk()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._refresh_loop, name='user-directory', daemon=True)
+            self._thread.start()
+
+    def load_from_disk(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            with self._lock:
+                self._names = data.get('users', {})
+                self._loaded_at = data.get('loaded_at', 0.0)
+            self._loaded.set()
+            log.info("사용자 디렉터리 로드 (디스크)", users=len(self._names))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            log.warning("사용자 디렉터리 파일 읽기 오류", path=self.path, error=e)
+
+    def _save_to_disk(self, names, loaded_at):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'loaded_at': loaded_at, 'users': names}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def refresh(self):
+        """users.list 페이지네이션으로 전체 사용자 다시 불러오기"""
+        if not self._refresh_lock.acquire(blocking=False):
+            return False  # 다른 스레드에서 이미 갱신 중
+
+        try:
+            names = {}
+            cursor = None
+            while True:
+                params = {'limit': 200}
+                if cursor:
+                    params['cursor'] = cursor
+
+                response = self.client.get('users.list', params)
+                if response.status_code != 200:
+                    raise RuntimeError(f"HTTP 오류: {response.status_code}")
+                data = response.json()
+                if not data.get('ok'):
+                    raise RuntimeError(f"API 오류: {data.get('error')}")
+
+                for user in data.get('members', []):
+                    names[user['id']] = user_display_name(user)
+
+                cursor = data.get('response_metadata', {}).get('next_cursor')
+                if not cursor:
+                    break
+
+            loaded_at = time.time()
+            with self._lock:
+                self._names = names
+                self._loaded_at = loaded_at
+            self.refresh_count += 1
+            self._save_to_disk(names, loaded_at)
+            self._loaded.set()
+            log.info("사용자 디렉터리 갱신", users=len(names))
+            return True
+
+        except Exception as e:
+            self.refresh_errors += 1
+            self._loaded.set()  # 실패해도 대기 중인 요청은 개별 조회로 진행
+            log.warning("사용자 디렉터리 갱신 오류", error=e)
+            return False
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh_loop(self):
+        while True:
+            if self.is_stale():
+                if not self.refresh():
+                    time.sleep(60)  # 실패 시 잠시 후 재시도
+                    continue
+            time.sleep(max(1, self._loaded_at + self.ttl - time.time()))
+
+    def stats(self):
+        return {
+            'users': len(self._names),
+            'age_seconds': round(time.time() - self._loaded_at) if self._loaded_at else None,
+            'refreshes': self.refresh_count,
+            'refresh_errors': self.refresh_errors,
+        }